@@ -21,6 +21,7 @@ Author: Walker M. White (wmw2)
 Date:   November 20, 2019
 """
 from consts import *
+from consts import GAME_WIDTH, GAME_HEIGHT
 from app import *
 
 # Application code
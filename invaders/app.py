@@ -11,8 +11,19 @@ question on Piazza.
 # December 9, 2021
 """
 from consts import *
+from consts import GAME_WIDTH, GAME_HEIGHT
 from game2d import *
 from wave import *
+from profiler import *
+from assets import getAssets
+from audio import Mixer
+from hud import *
+from replay import recordingFromEnvironment
+from snapshot import loadSnapshot, saveSnapshot, snapshotPath
+from simthread import threadedFromEnvironment
+from events import *
+import atexit
+import os
 
 # PRIMARY RULE: Invaders can only access attributes in wave.py via getters/setters
 # Invaders is NOT allowed to access anything in models.py
@@ -61,9 +72,9 @@ class Invaders(GameApp):
     # Invariant: _wave is a Wave object, or None if there is no wave currently
     # active. It is only None if _state is STATE_INACTIVE.
     #
-    # Attribute _text: the currently active message
-    # Invariant: _text is a GLabel object, or None if there is no message to
-    # display. It is onl None if _state is STATE_ACTIVE.
+    # Attribute _hud: the score, lives, logo and messages on screen
+    # Invariant: _hud is a Hud object. It has no message only if _state is
+    # STATE_ACTIVE.
     #
     # You may have new attributes if you wish (you might want an attribute to
     # store any score across multiple waves). But you must document them.
@@ -84,35 +95,31 @@ class Invaders(GameApp):
     # Attribute _win: checks if the winner has won or not
     # Invariant: _win is a Boolean value that checks if the user has won
     #
-    # Attribute _alienblast: The sound when the alien blasts
-    # Invariant: _alienblast is a sound object
+    # Attribute _assets: The shared sounds and fonts, loaded in the background
+    # Invariant: _assets is an AssetManager object
     #
-    # Attribute _shipshoot: The sound when the ship shoots 
-    # Invariant: _shipshoot is a sound object
+    # Attribute _audio: Plays the sound effects of the waves on its own thread
+    # Invariant: _audio is a Mixer object
     #
-    # Attribute _playerlose: The sound when the player loses
-    # Invariant: _playerlose is a sound object
+    # Attribute _sound: The background music
+    # Invariant: _sound is a sound object, or None before the first wave
     #
-    # Attribute _playerWin: The sound when the player wins
-    # Invariant: _playerWin is a sound object
-    #
-    # Attribute sound: The background music
-    # Invariant: sound is a sound object
-    #
-    # Attribute _score: Displays player score
-    # Invariant: _score is a GLabel object
+    # Attribute _blsc: Background of the game
+    # Invariant: _blsc is a GRectangle Object
     #
-    # Attribute _life: Displays the lives the user has left
-    # Invariant: _life is a GLabel Object
+    # Attribute _profiler: Times frames and wave phases (INVADERS_PROFILE)
+    # Invariant: _profiler is a Profiler object, or None if not profiling
     #
-    # Attribute _logo: Displays the logo/title of the game
-    # Invariant: _logo is a GLabel Object
+    # Attribute _recording: Records the game for replay (INVADERS_RECORD)
+    # Invariant: _recording is a Recording object, or None if not recording
     #
-    # Attribute _inst: Displays the instruction to shoot bolts with the ship
-    # Invariant: _inst is a GLabel Object
+    # Attribute _snapshot: The file the game is saved to and resumed from
+    # (INVADERS_SNAPSHOT)
+    # Invariant: _snapshot is a string, or None if not saving
     #
-    # Attribute _blsc: Background of the game
-    # Invariant: _blsc is a GRectangle Object
+    # Attribute _threaded: Whether waves simulate on their own thread
+    # (INVADERS_THREADED)
+    # Invariant: _threaded is a boolean
 
     # DO NOT MAKE A NEW INITIALIZER!
 
@@ -128,8 +135,8 @@ class Invaders(GameApp):
 
         This method should make sure that all of the attributes satisfy the
         given invariants. When done, it sets the _state to STATE_INACTIVE and
-        create a message (in attribute _text) saying that the user should press
-        to play a game.
+        create a message (in the HUD, attribute _hud) saying that the user
+        should press to play a game.
         """
         # IMPLEMENT ME
         # constants and variables
@@ -140,34 +147,29 @@ class Invaders(GameApp):
         self._lives = SHIP_LIVES
         self._game = None
         self._win = False
-        # sounds
-        self._alienblast = Sound('alienblast.wav')
-        self._shipshoot = Sound('shipshoot.wav')
-        self._playerlose = Sound('playerlose.wav')
-        self._playerWin = Sound('win.wav')
-        self._sound = Sound('bkg.wav')
+        self._profiler = profilerFromEnvironment()
+        self._recording = recordingFromEnvironment(self._lives)
+        self._snapshot = snapshotPath()
+        self._threaded = threadedFromEnvironment()
+        # sounds (loaded in the background while the first screen shows)
+        self._assets = getAssets()
+        self._assets.setProfiler(self._profiler)
+        self._assets.start()
+        self._audio = Mixer(self._assets)
+        self._audio.start()
+        self._sound = None
         # screen
         self._blsc = GRectangle(width = GAME_WIDTH, height = GAME_HEIGHT, \
             x=GAME_WIDTH/2, y=GAME_HEIGHT/2, fillcolor='light green')
         # texts
-        self._score = GLabel(text = f"Player's score: 0",font_size=40,\
-             left=5, bottom=5, \
-            x=GAME_WIDTH - 200, y=30, font_name = 'Arcade.ttf')
-        self._life = GLabel(text = f"Lives: {self._lives}",font_size=60,\
-             left=5, bottom=5, \
-            x=120, y=24*GAME_HEIGHT/25, font_name = 'Arcade.ttf')
-        self._logo = GLabel(text = "War Against Humanity",\
-            font_size=60, left=5,\
-             bottom=5, x=GAME_WIDTH/2, y=24*GAME_HEIGHT/25, \
-                 font_name = 'Arcade.ttf')
-        self._inst = None
+        self._hud = Hud(self._lives)
         if self._state == STATE_INACTIVE:
-            self._text = self._text = GLabel(\
-                text = f"Press {self._startkey} to start",font_size=60,\
-                 left=5, bottom=5, x=GAME_WIDTH/2, y=GAME_HEIGHT/2, \
-                     font_name = 'Arcade.ttf')
-        else:
-            self._text = None
+            self._hud.setMessage(f"Press {self._startkey} to start")
+        # snapshots
+        if self._snapshot is not None:
+            if os.path.exists(self._snapshot):
+                self._resume()
+            atexit.register(self._checkpoint)
         
         
     def update(self,dt):
@@ -222,6 +224,8 @@ class Invaders(GameApp):
         Precondition: dt is a number (int or float)
         """
         # IMPLEMENT ME
+        if self._profiler is not None:
+            start = clock()
         if self._state == STATE_INACTIVE:
             self._determineState()
         elif self._state == STATE_NEWWAVE:
@@ -234,6 +238,8 @@ class Invaders(GameApp):
             self.continues()
         elif self._state == STATE_COMPLETE:
             self.complete()
+        if self._profiler is not None:
+            self._profiler.time('frame', clock() - start)
 
 
     def draw(self):
@@ -252,16 +258,7 @@ class Invaders(GameApp):
         """
         # IMPLEMENT ME
         #self._blsc.draw(self.view)
-        if self._text != None:
-            self._text.draw(self.view)
-        if self._logo is not None:
-            self._logo.draw(self.view)
-        if self._life is not None:
-            self._life.draw(self.view)
-        if self._score is not None:
-            self._score.draw(self.view)
-        if self._inst is not None:
-            self._inst.draw(self.view)
+        self._hud.draw(self.view)
         if self._wave is not None:
             self._wave.draw(self.view)
 
@@ -294,61 +291,47 @@ class Invaders(GameApp):
         sets text to None
         """
 
+        assets = self._assets
+        self._sound = assets.getSound('bkg.wav')
         self._sound.play()
-        self._inst = GLabel(text = "Press spacebar to fire",\
-            font_size=30, left=5, bottom=5, \
-                x=GAME_WIDTH/2, y=DEFENSE_LINE+20, font_name = 'Arcade.ttf')
-        self._wave = Wave(self._playerlose, self._alienblast, self._shipshoot)
+        self._hud.showInstructions(True)
+        self._wave = Wave(self._audio, profiler=self._profiler,\
+            recording=self._recording, threaded=self._threaded)
+        self._listen()
         self._state = STATE_ACTIVE
-        self._text = None
+        self._hud.setMessage(None)
     
     
     def active(self, dt):
         """
         Updates the current wave
-        Plays background music when a new wave of aliens start.
-        Creates a new instance of class Wave
-        sets state to STATE_ACTIVE
-        sets text to None
+
+        The state is changed by the events of the wave (see _listen), as
+        they are dispatched during the update.
         """
         self._wave.update(self.input, dt)
-        if self._wave.getShipDies() and self._lives > 1:
-            self._lives-=1
-            self._state = STATE_PAUSED
-        elif self._wave.getPlayerWin():
-            self._win = True
-            self._state = STATE_COMPLETE
-        elif self._wave.alienLine():
-            self._win = False
-            self._state = STATE_COMPLETE
-        elif self._wave.getShipDies() and self._lives == 1:
-            self._win = False
-            self._state = STATE_COMPLETE
-        self._score.text = f"Player's score: {self._wave.getScore()}"
     
     
     def paused(self):
         """
-        Updates the text of self._life
+        Updates the lives shown by self._hud
         calls the function to draw self._wave objects
         Changes state to STATE_CONTINUE if a key press is detected
         """
-        self._life.text = f"lives: {self._lives}"
+        self._hud.setLives(self._lives)
         self._wave.draw(self.view)
-        self._text = GLabel(text = f"Press {self._startkey} to continue",\
-            font_size=60, left=5, bottom=5, x=GAME_WIDTH/2, y=GAME_HEIGHT/2, \
-                font_name = 'Arcade.ttf')
+        self._hud.setMessage(f"Press {self._startkey} to continue")
         if self.input.is_key_down(self._startkey):
             self._state = STATE_CONTINUE
-            self._text = None
+            self._hud.setMessage(None)
         
         
     def continues(self):
         """
-        Creates a new ship object
+        Respawns the ship
         changes state to STATE_ACTIVE
         """
-        self._wave.setShip(Ship(GAME_WIDTH/2, SHIP_BOTTOM+SHIP_HEIGHT/2))
+        self._wave.respawnShip()
         self._wave.setShipDies(False)
         self._wave.setPlayerWin(False)
         self._state = STATE_ACTIVE
@@ -359,24 +342,130 @@ class Invaders(GameApp):
         Final state of the game, where wave is set to None, 
         and music is played if the player wins
         """
-        self._sound.stop()
-        self._life = None
-        self._inst = None
-        self._score = GLabel(text = f"Player's score: {self._wave.getScore()}",\
-            font_size=60, left=5, bottom=5, x=GAME_WIDTH/2, \
-                y=120, font_name = 'Arcade.ttf')
+        if self._sound is not None:
+            self._sound.stop()
+        self._hud.hideLives()
+        self._hud.showInstructions(False)
+        self._hud.showFinalScore(self._wave.getScore())
+        if self._recording is not None:
+            self._recording.finish(self._wave.getScore(), self._win,
+                self._lives)
+        self._wave.close()
         self._wave = None
+        if self._snapshot is not None and os.path.exists(self._snapshot):
+            os.remove(self._snapshot)
         if self._win == False:
-            self._logo.text =  'War Against Humanity'
-            self._text = GLabel(text = "You lost :(",font_size=60, \
-                left=5, bottom=5, x=GAME_WIDTH/2, y=4*GAME_HEIGHT/5, \
-                    font_name="Arcade.ttf")
+            self._hud.setMessage("You lost :(", y=4*GAME_HEIGHT/5)
         elif self._win == True:
             #self._sound = None
-            self._playerWin.play()
-            self._logo = None
+            self._assets.getSound('win.wav').play()
+            self._hud.hideLogo()
             self._lives = None
-            self._text = GLabel(text = "Well done! You have completed the game.",\
-                font_size=60, \
-                left=5, bottom=5, x=GAME_WIDTH/2, y=GAME_HEIGHT/2, font_name='Arcade.ttf')
+            self._hud.setMessage("Well done! You have completed the game.")
         self._state = 6
+
+
+    # HELPER METHODS FOR WAVE EVENTS
+    def _listen(self):
+        """
+        Subscribes to the events of self._wave that change the game state
+        and the score
+        """
+        self._wave.subscribe(ShipDestroyed, self._shipDestroyed)
+        self._wave.subscribe(WaveCleared, self._waveCleared)
+        self._wave.subscribe(LineBreached, self._lineBreached)
+        self._wave.subscribe(AlienKilled, self._scoreChanged)
+        self._wave.subscribe(ShipHit, self._scoreChanged)
+
+
+    def _shipDestroyed(self, events):
+        """
+        Pauses the game after a lost ship, or ends it if it was the last one
+
+        Parameter events: the ship destroyed event
+        Precondition: events is a list of ShipDestroyed events
+        """
+        if self._lives > 1:
+            self._lives-=1
+            self._state = STATE_PAUSED
+            self._checkpoint()
+        else:
+            self._win = False
+            self._state = STATE_COMPLETE
+
+
+    def _waveCleared(self, events):
+        """
+        Ends the game, won
+
+        Parameter events: the wave cleared event
+        Precondition: events is a list of WaveCleared events
+        """
+        self._win = True
+        self._state = STATE_COMPLETE
+
+
+    def _lineBreached(self, events):
+        """
+        Ends the game, lost, unless it was won in the same tick
+
+        WaveCleared is dispatched before LineBreached, so a player who kills
+        the last alien as the aliens reach the line still wins.
+
+        Parameter events: the line breached event
+        Precondition: events is a list of LineBreached events
+        """
+        if self._state == STATE_COMPLETE:
+            return
+        self._win = False
+        self._state = STATE_COMPLETE
+
+
+    def _scoreChanged(self, events):
+        """
+        Shows the new score after aliens were killed or the ship was hit
+
+        Parameter events: the events that changed the score
+        Precondition: events is a list of AlienKilled or ShipHit events
+        """
+        self._hud.setScore(self._wave.getScore())
+
+
+    # HELPER METHODS FOR SNAPSHOTS
+    def _checkpoint(self):
+        """
+        Saves the wave and the game state to the file self._snapshot
+
+        Nothing is saved if there is no file or no wave in play.
+        """
+        if self._snapshot is not None and self._wave is not None:
+            saveSnapshot(self._snapshot, self._wave.getSim(),
+                {'state': self._state, 'lives': self._lives, 'win': self._win})
+
+
+    def _resume(self):
+        """
+        Resumes the game saved in the file self._snapshot
+
+        The wave is made from the snapshot, and the game goes straight to
+        STATE_ACTIVE (or STATE_PAUSED, if the snapshot was taken after a ship
+        was lost). A snapshot of a game that was not in play is ignored. A
+        resumed game is not recorded, since a recording starts with a new
+        wave.
+        """
+        sim, game = loadSnapshot(self._snapshot)
+        if game is None or game['state'] not in (STATE_ACTIVE, STATE_PAUSED):
+            return
+        assets = self._assets
+        self._sound = assets.getSound('bkg.wav')
+        self._sound.play()
+        self._wave = Wave(self._audio, profiler=self._profiler, sim=sim,\
+            threaded=self._threaded)
+        self._listen()
+        self._lives = game['lives']
+        self._win = game['win']
+        self._hud.setLives(self._lives)
+        self._hud.setScore(sim.getScore())
+        self._hud.showInstructions(True)
+        self._hud.setMessage(None)
+        self._state = STATE_PAUSED if sim.getShipDies() else STATE_ACTIVE
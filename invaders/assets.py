@@ -0,0 +1,385 @@
+"""
+Asset module for Alien Invaders
+
+This module loads the assets of the game (images, sounds and fonts) once per
+process and shares them.
+
+getTexture returns the Kivy texture of an image file, loading the file the
+first time it is asked for and returning the same texture after that.
+
+getAtlas returns a sprite atlas: one texture with every sprite of the game
+(ALIEN_IMAGES and the ship strip) packed side by side, and a region of it
+for every sprite. Drawing the whole formation from regions of one texture
+means the GPU binds a single texture for it. The atlas is packed with Pillow
+when it is installed; without it, the atlas hands out the separate cached
+textures instead, which still loads every file only once.
+
+getAssets returns the AssetManager, which loads the sounds (SOUND_FILES),
+finds the fonts (FONT_FILES) and decodes the sprites on a background thread,
+so that the first screen can be shown while they load. Textures must be
+made on the main (OpenGL) thread, so the thread only decodes the images;
+getAtlas turns them into a texture. Asking for an asset that is not loaded
+yet loads it at once, so callers never have to wait for the whole thread.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+import os
+import threading
+import time
+from game2d import Sound
+from kivy.core.image import Image as CoreImage
+from kivy.graphics.texture import Texture
+from kivy.resources import resource_find
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+# the sprites packed in the atlas
+SPRITES = ALIEN_IMAGES + (SHIP_BLOW_UP,)
+
+# the number of empty pixels between two sprites of the atlas
+ATLAS_PADDING = 2
+
+# HIDDEN GLOBALS:
+# Global _textures: the textures loaded so far
+# Invariant: _textures is a dictionary from file names to Kivy textures
+_textures = {}
+
+# Global _decoded: the images decoded so far (only with Pillow)
+# Invariant: _decoded is a dictionary from file names to Pillow images,
+# flipped so that their first row is the bottom one
+_decoded = {}
+
+# Global _atlas: the sprite atlas
+# Invariant: _atlas is a SpriteAtlas, or None if it has not been made yet
+_atlas = None
+
+# Global _manager: the asset manager
+# Invariant: _manager is an AssetManager, or None if it has not been made yet
+_manager = None
+
+
+class SpriteAtlas(object):
+    """
+    A class representing a set of sprites packed in one texture.
+
+    The sprites are packed in a single row, bottom aligned, with
+    ATLAS_PADDING pixels between them.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _texture: the texture of the whole atlas
+    # Invariant: _texture is a Kivy Texture, or None without Pillow
+    #
+    # Attribute _regions: the texture of every sprite
+    # Invariant: _regions is a dictionary from file names to Kivy textures
+    # (regions of _texture, if it is not None)
+
+    def __init__(self, names):
+        """
+        Initializes an atlas of the given image files
+
+        Parameter names: the names of the image files to pack
+        Precondition: names is a sequence of strings naming image files
+        """
+        self._texture = None
+        self._regions = {}
+        if PILImage is None:
+            for name in names:
+                self._regions[name] = getTexture(name)
+            return
+        images = [decodeImage(name) for name in names]
+        width = sum(image.width for image in images) + \
+            ATLAS_PADDING*(len(images)-1)
+        height = max(image.height for image in images)
+        self._texture = Texture.create(size=(width, height), colorfmt='rgba')
+        x = 0
+        for name, image in zip(names, images):
+            self._texture.blit_buffer(image.tobytes(), pos=(x, 0),
+                size=image.size, colorfmt='rgba', bufferfmt='ubyte')
+            self._regions[name] = self._texture.get_region(x, 0, image.width,
+                image.height)
+            x += image.width + ATLAS_PADDING
+
+
+    def getTexture(self):
+        """
+        Returns the texture of the whole atlas, or None if it was not packed
+        """
+        return self._texture
+
+
+    def getRegion(self, name):
+        """
+        Returns the texture (region) of the sprite in the image file name
+
+        Parameter name: the name of an image file in the atlas
+        Precondition: name is a string
+        """
+        return self._regions[name]
+
+
+class AssetManager(object):
+    """
+    A class representing the shared sounds and fonts of the game.
+
+    Method start begins loading every asset on a background thread. The
+    getters return the shared asset, loading it on the spot if the thread
+    has not got to it yet. Every load is timed; the times can be read with
+    getTimings, and are also recorded in a profiler if one is given.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _sounds: the names of the sound files to load
+    # Invariant: _sounds is a tuple of strings
+    #
+    # Attribute _fonts: the names of the font files to find
+    # Invariant: _fonts is a tuple of strings
+    #
+    # Attribute _images: the names of the image files to decode
+    # Invariant: _images is a tuple of strings
+    #
+    # Attribute _loaded: the assets loaded so far
+    # Invariant: _loaded is a dictionary from file names to Sound objects
+    # (for sounds) or paths (for fonts and images)
+    #
+    # Attribute _timings: the seconds it took to load every asset
+    # Invariant: _timings is a dictionary from file names to floats
+    #
+    # Attribute _lock: the lock that makes sure an asset is loaded only once
+    # Invariant: _lock is a threading.Lock
+    #
+    # Attribute _thread: the background thread
+    # Invariant: _thread is a threading.Thread, or None if not started
+    #
+    # Attribute _profiler: the profiler to record load times in
+    # Invariant: _profiler is a Profiler object or None
+
+    def __init__(self, sounds=SOUND_FILES, fonts=FONT_FILES, images=SPRITES,
+            profiler=None):
+        """
+        Initializes a manager with nothing loaded
+
+        Parameter sounds, fonts, images: the names of the files to load
+        Precondition: sounds, fonts and images are tuples of strings
+
+        Parameter profiler: the profiler to record load times in
+        Precondition: profiler is a Profiler object or None
+        """
+        self._sounds = tuple(sounds)
+        self._fonts = tuple(fonts)
+        self._images = tuple(images)
+        self._loaded = {}
+        self._timings = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._profiler = profiler
+
+
+    def setProfiler(self, profiler):
+        """
+        Sets the profiler to record load times in
+
+        Parameter profiler: the profiler
+        Precondition: profiler is a Profiler object or None
+        """
+        self._profiler = profiler
+
+
+    def start(self):
+        """
+        Starts loading every asset on a background (daemon) thread
+
+        Calling this more than once does nothing.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._preload,
+                name='invaders-assets', daemon=True)
+            self._thread.start()
+
+
+    def isReady(self):
+        """
+        Returns True if every asset has been loaded
+        """
+        return len(self._loaded) == len(self._sounds) + len(self._fonts) + \
+            len(self._images)
+
+
+    def wait(self, timeout=None):
+        """
+        Waits for the background thread to finish
+
+        Parameter timeout: the most seconds to wait (forever if None)
+        Precondition: timeout is a number >= 0 or None
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+    def getSound(self, name):
+        """
+        Returns the shared Sound of the sound file name
+
+        Parameter name: the name of a sound file
+        Precondition: name is a string naming a file in the Sounds folder
+        """
+        return self._load(name, Sound)
+
+
+    def getFont(self, name):
+        """
+        Returns the path of the font file name (or name if it is not found)
+
+        Parameter name: the name of a font file
+        Precondition: name is a string naming a file in the Fonts folder
+        """
+        return self._load(name, _findFont)
+
+
+    def getTimings(self):
+        """
+        Returns a dictionary of the seconds it took to load every asset
+        """
+        return dict(self._timings)
+
+
+    def _preload(self):
+        """
+        Loads every asset, sounds first (the body of the background thread)
+        """
+        for name in self._sounds:
+            self._load(name, Sound)
+        for name in self._fonts:
+            self._load(name, _findFont)
+        for name in self._images:
+            self._load(name, _decodeSprite)
+
+
+    def _load(self, name, loader):
+        """
+        Returns the asset name, calling loader(name) if it is not loaded yet
+
+        Parameter name: the name of the asset file
+        Precondition: name is a string
+
+        Parameter loader: the function that loads the asset
+        Precondition: loader is a function of one string
+        """
+        asset = self._loaded.get(name)
+        if asset is not None:
+            return asset
+        with self._lock:
+            asset = self._loaded.get(name)
+            if asset is None:
+                start = time.perf_counter()
+                asset = loader(name)
+                took = time.perf_counter() - start
+                self._timings[name] = took
+                self._loaded[name] = asset
+                if self._profiler is not None:
+                    self._profiler.time('load ' + name, took)
+        return asset
+
+
+def imagePath(name):
+    """
+    Returns the path of the image file name
+
+    The file is looked up with the Kivy resource paths (which game2d sets up
+    for the Images folder), and then in the Images folder next to this file.
+
+    Parameter name: the name of an image file
+    Precondition: name is a string naming a file in the Images folder
+    """
+    path = resource_find(name)
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+            'Images', name)
+    return path
+
+
+def getTexture(name):
+    """
+    Returns the Kivy texture of the image file name, loading it only once
+
+    This must be called on the main thread.
+
+    Parameter name: the name of an image file
+    Precondition: name is a string naming a file in the Images folder
+    """
+    texture = _textures.get(name)
+    if texture is None:
+        texture = _textures[name] = CoreImage(imagePath(name)).texture
+    return texture
+
+
+def decodeImage(name):
+    """
+    Returns the Pillow image of the image file name, decoding it only once
+
+    The image is in RGBA and flipped so that its first row is the bottom
+    one, ready to be copied into a Kivy texture. Pillow must be installed.
+
+    Parameter name: the name of an image file
+    Precondition: name is a string naming a file in the Images folder
+    """
+    image = _decoded.get(name)
+    if image is None:
+        image = PILImage.open(imagePath(name)).convert('RGBA').transpose(
+            PILImage.FLIP_TOP_BOTTOM)
+        _decoded[name] = image
+    return image
+
+
+def getAtlas():
+    """
+    Returns the sprite atlas of SPRITES, packing it the first time
+
+    This must be called on the main thread.
+    """
+    global _atlas
+    if _atlas is None:
+        _atlas = SpriteAtlas(SPRITES)
+    return _atlas
+
+
+def getAssets():
+    """
+    Returns the shared AssetManager, making it the first time
+    """
+    global _manager
+    if _manager is None:
+        _manager = AssetManager()
+    return _manager
+
+
+def _findFont(name):
+    """
+    Returns the path of the font file name (or name if it is not found)
+
+    Reading the file once puts it in the disk cache before a label needs it.
+
+    Parameter name: the name of a font file
+    Precondition: name is a string
+    """
+    path = resource_find(name)
+    if path is None:
+        return name
+    with open(path, 'rb') as file:
+        file.read()
+    return path
+
+
+def _decodeSprite(name):
+    """
+    Decodes the image file name if Pillow is installed, and returns its path
+
+    Parameter name: the name of an image file
+    Precondition: name is a string
+    """
+    if PILImage is not None:
+        decodeImage(name)
+    return imagePath(name)
@@ -0,0 +1,268 @@
+"""
+Audio module for Alien Invaders
+
+This module plays the sound effects of the game (SOUND_EFFECTS) on a thread
+of their own, so that neither the game nor the simulation ever waits on a
+call to Sound.play.
+
+Every effect has a pool of AUDIO_VOICES voices: separately loaded Sound
+objects, used in turn, so that an effect triggered again while it is still
+playing starts on a fresh voice instead of cutting the last one off. The
+voices are loaded by the audio thread when it starts.
+
+A mixer subscribed to the EventBus of a wave (see events.py) plays the
+effect of every bolt of the ship, alien killed and ship hit. Sounds can
+also be triggered by name, a tick (or an update) at a time. The same
+effect triggered twice in one batch plays once, so five aliens killed in one
+tick are one blast, not five. If the audio thread falls behind, the batches
+waiting for it are merged the same way. At most AUDIO_MAX_PLAYING effects
+play at the same time; an effect counts as playing for AUDIO_VOICE_TIME
+seconds after it starts, and effects over the cap are dropped.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+from events import AlienKilled, BoltFired, ShipHit
+import collections
+import queue
+import threading
+import time
+from game2d import Sound
+
+# PRIMARY RULE: This module may only access consts.py, events.py and the
+# assets (through the AssetManager it is given). It must never access the
+# wave or the app.
+
+
+class VoicePool(object):
+    """
+    A class representing the voices of one sound effect.
+
+    The voices are used round robin.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _voices: the voices
+    # Invariant: _voices is a non-empty list of Sound objects
+    #
+    # Attribute _next: the voice to play next
+    # Invariant: _next is an int with 0 <= _next < len(_voices)
+
+    def __init__(self, voices):
+        """
+        Initializes a pool of the given voices
+
+        Parameter voices: the voices of the effect
+        Precondition: voices is a non-empty list of Sound objects
+        """
+        self._voices = list(voices)
+        self._next = 0
+
+
+    def __len__(self):
+        """
+        Returns the number of voices
+        """
+        return len(self._voices)
+
+
+    def play(self):
+        """
+        Plays the effect on the next voice
+        """
+        voice = self._voices[self._next]
+        self._next = (self._next + 1) % len(self._voices)
+        voice.play()
+
+
+class Mixer(object):
+    """
+    A class representing the player of the sound effects of the game.
+
+    Method start starts the audio thread. Method play (and the handlers
+    added by subscribe) can then be called from any thread; they only put
+    the names on a queue.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _assets: the manager the first voice of every effect is from
+    # Invariant: _assets is an AssetManager object
+    #
+    # Attribute _voices: the number of voices of every effect
+    # Invariant: _voices is an int > 0
+    #
+    # Attribute _limit: the most effects that may play at the same time
+    # Invariant: _limit is an int > 0
+    #
+    # Attribute _pools: the voices of every effect
+    # Invariant: _pools is a dictionary from SOUND_EFFECTS names to
+    # VoicePool objects (empty until the thread has loaded them)
+    #
+    # Attribute _playing: the times the effects playing now were started
+    # Invariant: _playing is a collections.deque of floats, oldest first
+    #
+    # Attribute _queue: the batches of names to play
+    # Invariant: _queue is a queue.SimpleQueue of tuples of strings (None to
+    # stop the thread)
+    #
+    # Attribute _dropped: the number of effects dropped by the cap
+    # Invariant: _dropped is an int >= 0
+    #
+    # Attribute _thread: the audio thread
+    # Invariant: _thread is a threading.Thread, or None if not started
+
+    def __init__(self, assets, voices=AUDIO_VOICES, limit=AUDIO_MAX_PLAYING):
+        """
+        Initializes a mixer of the effects in assets
+
+        Parameter assets: the manager to load the effects with
+        Precondition: assets is an AssetManager object
+
+        Parameter voices: the number of voices of every effect
+        Precondition: voices is an int > 0
+
+        Parameter limit: the most effects that may play at the same time
+        Precondition: limit is an int > 0
+        """
+        self._assets = assets
+        self._voices = voices
+        self._limit = limit
+        self._pools = {}
+        self._playing = collections.deque()
+        self._queue = queue.SimpleQueue()
+        self._dropped = 0
+        self._thread = None
+
+
+    def getDropped(self):
+        """
+        Returns the number of effects dropped because too many were playing
+        """
+        return self._dropped
+
+
+    def start(self):
+        """
+        Starts the audio (daemon) thread, which loads the voices first
+
+        Calling this more than once does nothing.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run,
+                name='invaders-audio', daemon=True)
+            self._thread.start()
+
+
+    def stop(self):
+        """
+        Stops the audio thread once it has played what it was given
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+    def play(self, names):
+        """
+        Plays the effects triggered in one tick (or one update)
+
+        A name given more than once plays once. This never waits for the
+        audio thread.
+
+        Parameter names: the names of the effects
+        Precondition: names is a list of SOUND_EFFECTS names
+        """
+        if names:
+            self._queue.put(tuple(names))
+
+
+    def subscribe(self, bus):
+        """
+        Plays the effects of the events of every tick dispatched on bus
+
+        A kind of event plays its effect once per tick, however many events
+        of that kind there were.
+
+        Parameter bus: the bus of a wave
+        Precondition: bus is an EventBus object
+        """
+        bus.subscribe(BoltFired, self._onBoltFired)
+        bus.subscribe(AlienKilled, self._onAlienKilled)
+        bus.subscribe(ShipHit, self._onShipHit)
+
+
+    def _onBoltFired(self, events):
+        """
+        Plays shipshoot if the ship fired one of the bolts
+
+        Parameter events: the bolts fired in a tick
+        Precondition: events is a list of BoltFired events
+        """
+        for event in events:
+            if event.up:
+                self._queue.put(('shipshoot',))
+                return
+
+
+    def _onAlienKilled(self, events):
+        """
+        Plays alienblast once for the aliens killed in a tick
+
+        Parameter events: the aliens killed in a tick
+        Precondition: events is a list of AlienKilled events
+        """
+        self._queue.put(('alienblast',))
+
+
+    def _onShipHit(self, events):
+        """
+        Plays playerlose once for the ship being hit
+
+        Parameter events: the hits in a tick
+        Precondition: events is a list of ShipHit events
+        """
+        self._queue.put(('playerlose',))
+
+
+    def _run(self):
+        """
+        Loads the voices and then plays every batch (the body of the thread)
+        """
+        for name in SOUND_EFFECTS:
+            file = name + '.wav'
+            voices = [self._assets.getSound(file)]
+            voices.extend(Sound(file) for _ in range(self._voices-1))
+            self._pools[name] = VoicePool(voices)
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            names = dict.fromkeys(batch)
+            try:
+                while True:
+                    batch = self._queue.get_nowait()
+                    if batch is None:
+                        self._queue.put(None)
+                        break
+                    names.update(dict.fromkeys(batch))
+            except queue.Empty:
+                pass
+            self._playBatch(names)
+
+
+    def _playBatch(self, names):
+        """
+        Plays every effect in names, as long as the cap allows
+
+        Parameter names: the effects to play, each once
+        Precondition: names is an iterable of SOUND_EFFECTS names
+        """
+        now = time.perf_counter()
+        while self._playing and now - self._playing[0] >= AUDIO_VOICE_TIME:
+            self._playing.popleft()
+        for name in names:
+            if len(self._playing) >= self._limit:
+                self._dropped += 1
+                continue
+            self._pools[name].play()
+            self._playing.append(now)
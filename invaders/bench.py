@@ -0,0 +1,323 @@
+"""
+Benchmark script for Alien Invaders
+
+This script measures how fast a wave can be updated. It drives the wave
+simulation (WaveSim, the rules behind Wave.update) with scripted input for
+a fixed number of frames, in a number of scenarios:
+
+    grid-RxC    a wave of R rows and C aliens per row, from the default 5x12
+                up to stress waves far beyond the limits in consts.py
+    bolts-N     the default wave with N alien bolts kept on screen
+    replay-F    the recorded game in the file F (see replay.py), if given
+                with --replay; a frame is one recorded tick
+    snapshot-F  the wave saved in the snapshot file F (see snapshot.py), if
+                given with --snapshot, played on from where it was saved
+
+For every scenario it reports the mean and 99th percentile time of a frame,
+the frames per second, and the bytes a frame allocates (the most memory it
+has allocated at once, counting what it frees again before it ends). The
+bytes are counted with tracemalloc in a second pass over the same frames,
+which is not timed. Run it from the folder that contains the invaders
+folder with
+
+    python invaders/bench.py [--frames N] [--quick] [--replay FILE ...]
+                             [--snapshot FILE ...] [--out FILE] [--compare FILE]
+
+The results can be saved as JSON with --out, and compared to an earlier
+file with --compare, so that a change to wave.py, sim.py or formation.py
+can be measured on the same machine before and after.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+from consts import *
+from display import setHeadless
+from sim import WaveSim
+from driver import Game
+from replay import Replayer, loadRecording
+from snapshot import loadSnapshot
+
+# the (rows, aliens per row) of the grid scenarios
+GRIDS = ((5, 12), (10, 15), (20, 30), (40, 60), (80, 120))
+
+# the number of alien bolts kept on screen in the bolt scenarios
+BOLT_LOADS = (50, 200, 500)
+
+# the number of frames of every scenario
+FRAMES = 3000
+
+# the length of a frame in seconds
+FRAME = 1/60
+
+
+def scenarios(quick=False):
+    """
+    Returns the list of scenarios as (name, rows, cols, bolts) tuples
+
+    Parameter quick: whether to skip the largest grid and bolt load
+    Precondition: quick is a boolean
+    """
+    grids = GRIDS[:-1] if quick else GRIDS
+    loads = BOLT_LOADS[:-1] if quick else BOLT_LOADS
+    result = [(f'grid-{r}x{c}', r, c, 0) for r, c in grids]
+    result += [(f'bolts-{n}', ALIEN_ROWS, ALIENS_IN_ROW, n) for n in loads]
+    return result
+
+
+def makeWave(rows, cols, seed=None):
+    """
+    Returns a new WaveSim of rows x cols aliens on a screen they fit in
+
+    Parameter rows: the number of rows of aliens
+    Precondition: rows is an int > 0
+
+    Parameter cols: the number of aliens per row
+    Precondition: cols is an int > 0
+
+    Parameter seed: the seed of the random number generator of the wave
+    Precondition: seed is an int >= 0 or None
+    """
+    width = max(HEADLESS_WIDTH, (cols+4)*(ALIEN_WIDTH+ALIEN_H_SEP))
+    height = max(HEADLESS_HEIGHT, ALIEN_CEILING + DEFENSE_LINE + 200 +
+        rows*(ALIEN_HEIGHT+ALIEN_V_SEP))
+    return WaveSim(rows=rows, cols=cols, width=width, height=height,
+        seed=seed)
+
+
+def run(rows, cols, bolts, frames=FRAMES, seed=0, wave=None):
+    """
+    Runs one scenario and returns a dictionary of its results
+
+    The ship sweeps left and right and fires whenever it can, in a game with
+    SHIP_LIVES lives (see Game in driver.py). When the game is over, the
+    frames go on with a new game of a copy of the wave as it was at the
+    start. In the bolt scenarios, alien bolts are added away from the ship
+    until there are that many bolts on screen.
+
+    Parameter rows, cols: the size of the wave
+    Precondition: rows, cols are ints > 0 (ignored if wave is given)
+
+    Parameter bolts: the number of alien bolts to keep on screen
+    Precondition: bolts is an int >= 0
+
+    Parameter frames: the number of frames to run
+    Precondition: frames is an int > 0
+
+    Parameter seed: the seed of the random number generator
+    Precondition: seed is an int
+
+    Parameter wave: the wave to run (a new rows x cols wave if None)
+    Precondition: wave is a WaveSim object or None
+    """
+    if wave is None:
+        wave = makeWave(rows, cols, seed)
+    times, games = play(wave, bolts, frames, seed, timeFrame)
+    tracemalloc.start()
+    sizes = play(wave, bolts, frames, seed, traceFrame)[0]
+    tracemalloc.stop()
+    result = summarize(times, sizes)
+    result['games'] = games
+    return result
+
+
+def play(first, bolts, frames, seed, measure):
+    """
+    Returns a tuple (values, games) from playing frames frames of run
+
+    values is the list of what measure returned for every frame, and games
+    is the number of games played. first is not changed: every game is
+    played on a fork of it.
+
+    Parameter first: the wave at the start
+    Precondition: first is a WaveSim object that was never updated
+
+    Parameter bolts, frames, seed: the scenario (see run)
+    Precondition: see run
+
+    Parameter measure: the function that plays a frame (see timeFrame)
+    Precondition: measure is timeFrame or traceFrame
+    """
+    rng = random.Random(seed)
+    width = first.getWidth()
+    height = first.getHeight()
+    game = Game(first.fork())
+    games = 1
+    values = []
+    for frame in range(frames):
+        if game.isOver():
+            game = Game(first.fork())
+            games += 1
+        wave = game.getSim()
+        while len(wave.getBolts()) < bolts:
+            # a lane away from the ship, so that the ship survives
+            x = rng.uniform(width/2 + 2*SHIP_WIDTH, width - BOLT_WIDTH)
+            wave.addBolt(False, x, rng.uniform(DEFENSE_LINE, height))
+        left = frame % 240 < 120
+        values.append(measure(game.update, FRAME, left, not left, True))
+    return (values, games)
+
+
+def timeFrame(update, *args):
+    """
+    Calls update(*args) and returns the seconds it took
+
+    Parameter update: the function that plays a frame
+    Precondition: update is a function of args
+    """
+    start = time.perf_counter()
+    update(*args)
+    return time.perf_counter() - start
+
+
+def traceFrame(update, *args):
+    """
+    Calls update(*args) and returns the most bytes it had allocated at once
+
+    tracemalloc must be tracing. Its traces are cleared first, so memory
+    allocated before the call (and freed during it) is not counted.
+
+    Parameter update: the function that plays a frame
+    Precondition: update is a function of args
+    """
+    tracemalloc.clear_traces()
+    update(*args)
+    return tracemalloc.get_traced_memory()[1]
+
+
+def summarize(times, sizes):
+    """
+    Returns the results of a scenario from the times and sizes of its frames
+
+    Parameter times: the seconds every frame took
+    Precondition: times is a non-empty list of numbers
+
+    Parameter sizes: the bytes every frame allocated (see traceFrame)
+    Precondition: sizes is a list of ints as long as times
+    """
+    frames = len(times)
+    times = sorted(times)
+    mean = sum(times)/frames
+    return {'frames': frames, 'mean_ms': mean*1000,
+        'p99_ms': times[min(frames-1, int(0.99*frames))]*1000,
+        'fps': 1/mean if mean > 0 else float('inf'),
+        'bytes_per_frame': sum(sizes)/frames}
+
+
+def runReplay(path):
+    """
+    Replays the recording in the file path and returns its results (see run)
+
+    A recording with no ticks to play has no results, and None is returned.
+
+    Parameter path: the name of a recording file
+    Precondition: path is a string
+    """
+    recording = loadRecording(path)
+    passes = []
+    for measure in (timeFrame, traceFrame):
+        if measure is traceFrame:
+            tracemalloc.start()
+        replayer = Replayer(recording)
+        values = []
+        while not replayer.isDone():
+            values.append(measure(replayer.step))
+        passes.append(values)
+    tracemalloc.stop()
+    if not passes[0]:
+        return None
+    return summarize(*passes)
+
+
+def commit():
+    """
+    Returns the short hash of the current git commit, or None
+    """
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def report(results, baseline=None):
+    """
+    Prints a table of results, with the change from baseline if given
+
+    Parameter results: the results, keyed by scenario name
+    Precondition: results is a dictionary of dictionaries (see run)
+
+    Parameter baseline: earlier results to compare to
+    Precondition: baseline is a dictionary like results, or None
+    """
+    header = f"{'scenario':<16}{'mean ms':>10}{'p99 ms':>10}{'fps':>10}" + \
+        f"{'bytes/f':>10}"
+    if baseline is not None:
+        header += f"{'vs base':>10}"
+    print(header)
+    for name, result in results.items():
+        line = f"{name:<16}{result['mean_ms']:>10.4f}" + \
+            f"{result['p99_ms']:>10.4f}{result['fps']:>10.0f}" + \
+            f"{result['bytes_per_frame']:>10.0f}"
+        if baseline is not None and name in baseline:
+            ratio = result['mean_ms']/baseline[name]['mean_ms']
+            line += f'{ratio:>9.2f}x'
+        print(line)
+
+
+def main(argv=None):
+    """
+    Runs the benchmark from the command line arguments argv
+
+    Parameter argv: the command line arguments (sys.argv[1:] if None)
+    Precondition: argv is a list of strings or None
+    """
+    parser = argparse.ArgumentParser(description='Benchmark Wave updates.')
+    parser.add_argument('--frames', type=int, default=FRAMES)
+    parser.add_argument('--quick', action='store_true',
+        help='skip the largest grid and bolt load')
+    parser.add_argument('--replay', nargs='+', default=[],
+        help='also time these recorded games')
+    parser.add_argument('--snapshot', nargs='+', default=[],
+        help='also time the waves saved in these snapshots')
+    parser.add_argument('--out', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='compare to this JSON file')
+    args = parser.parse_args(argv)
+    setHeadless()
+    results = {}
+    for name, rows, cols, bolts in scenarios(args.quick):
+        results[name] = run(rows, cols, bolts, args.frames)
+    for path in args.replay:
+        name = 'replay-' + os.path.splitext(os.path.basename(path))[0]
+        result = runReplay(path)
+        if result is None:
+            print(f'{path}: no ticks to replay, skipped')
+        else:
+            results[name] = result
+    for path in args.snapshot:
+        name = 'snapshot-' + os.path.splitext(os.path.basename(path))[0]
+        wave = loadSnapshot(path)[0]
+        results[name] = run(0, 0, 0, args.frames, wave=wave)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+    report(results, baseline)
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump({'commit': commit(), 'python': platform.python_version(),
+                'machine': platform.machine(), 'frames': args.frames,
+                'results': results}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Bolt storage module for Alien Invaders
+
+This module contains the records for the laser bolts of the simulation and
+the pool that stores them. The pool allocates its records up front and
+reuses them, so firing a bolt does not create any new objects once the pool
+is warm. Removing a bolt swaps the last live bolt into its place, which is
+O(1) and never skips a bolt when the pool is walked with an index.
+
+Every record has a fixed key, which the view (Wave) uses to give every
+record its own reusable Bolt view.
+
+A pool can be forked for lookahead search. The fork copies only the live
+records, and allocates more (with keys never used by the pool it came
+from) if it needs them.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+
+
+class SimBolt(object):
+    """
+    A class representing a laser bolt in the simulation.
+
+    Attribute x: the x-coordinate of the center of the bolt
+    Invariant: x is an int or float
+
+    Attribute y: the y-coordinate of the center of the bolt
+    Invariant: y is an int or float
+
+    Attribute py: the y-coordinate of the bolt before the last tick
+    Invariant: py is an int or float
+
+    Attribute velocity: the velocity in y direction, in pixels per update
+    at BASE_RATE updates per second
+    Invariant: velocity is BOLT_SPEED (player) or -BOLT_SPEED (alien)
+
+    Attribute key: the fixed index of this record in its pool
+    Invariant: key is an int >= 0
+    """
+    __slots__ = ('x', 'y', 'py', 'velocity', 'key')
+
+    def __init__(self, up, x, y, key=0):
+        """
+        Initializes a bolt centered at (x, y)
+
+        Parameter up: whether the bolt moves up (was fired by the ship)
+        Precondition: up is a boolean
+
+        Parameter x: the x-coordinate of the center of the bolt
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the bolt
+        Precondition: y is an int or float
+
+        Parameter key: the fixed index of this record in its pool
+        Precondition: key is an int >= 0
+        """
+        self.key = key
+        self.reset(up, x, y)
+
+
+    def reset(self, up, x, y):
+        """
+        Reuses this record for a new bolt centered at (x, y)
+
+        Parameter up: whether the bolt moves up (was fired by the ship)
+        Precondition: up is a boolean
+
+        Parameter x: the x-coordinate of the center of the bolt
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the bolt
+        Precondition: y is an int or float
+        """
+        self.x = x
+        self.y = y
+        self.py = y
+        if up:
+            self.velocity = BOLT_SPEED
+        else:
+            self.velocity = -BOLT_SPEED
+
+
+    def copy(self):
+        """
+        Returns a new record with the same position, velocity and key
+        """
+        bolt = SimBolt.__new__(SimBolt)
+        bolt.x = self.x
+        bolt.y = self.y
+        bolt.py = self.py
+        bolt.velocity = self.velocity
+        bolt.key = self.key
+        return bolt
+
+
+    def isPlayerBolt(self):
+        """
+        Returns True if the bolt was shot by the ship, false otherwise.
+        """
+        return self.velocity > 0
+
+
+class BoltPool(object):
+    """
+    A class representing a pool of bolt records.
+
+    The live bolts are the first len(pool) records. They can be read with
+    get (by position) or by iterating over the pool, but the pool must not
+    be changed while it is being iterated over.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _records: every record of the pool, live ones first
+    # Invariant: _records is a list of SimBolt objects with distinct keys
+    #
+    # Attribute _count: the number of live bolts
+    # Invariant: _count is an int with 0 <= _count <= len(_records)
+    #
+    # Attribute _nextKey: the key of the next record to allocate
+    # Invariant: _nextKey is an int greater than every key in _records
+    #
+    # Attribute _players: the number of live bolts fired by the player
+    # Invariant: _players is an int with 0 <= _players <= _count
+
+    def __init__(self, capacity=BOLT_POOL):
+        """
+        Initializes an empty pool with room for capacity bolts
+
+        The pool doubles in size if more bolts than that are fired.
+
+        Parameter capacity: the number of records to allocate
+        Precondition: capacity is an int > 0
+        """
+        self._records = [SimBolt(True, 0, 0, key) for key in range(capacity)]
+        self._count = 0
+        self._nextKey = capacity
+        self._players = 0
+
+
+    def __len__(self):
+        """
+        Returns the number of live bolts
+        """
+        return self._count
+
+
+    def __iter__(self):
+        """
+        Returns an iterator over the live bolts
+        """
+        records = self._records
+        for i in range(self._count):
+            yield records[i]
+
+
+    def capacity(self):
+        """
+        Returns the number of records allocated by the pool
+        """
+        return len(self._records)
+
+
+    def get(self, i):
+        """
+        Returns the live bolt at position i
+
+        Parameter i: the position of the bolt
+        Precondition: i is an int with 0 <= i < len(self)
+        """
+        return self._records[i]
+
+
+    def hasPlayerBolt(self):
+        """
+        Returns True if a bolt fired by the player is live
+        """
+        return self._players > 0
+
+
+    def fire(self, up, x, y):
+        """
+        Makes a new live bolt centered at (x, y) and returns it
+
+        Parameter up: whether the bolt moves up (was fired by the ship)
+        Precondition: up is a boolean
+
+        Parameter x: the x-coordinate of the center of the bolt
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the bolt
+        Precondition: y is an int or float
+        """
+        if self._count == len(self._records):
+            size = max(len(self._records), 1)
+            key = self._nextKey
+            self._records.extend(SimBolt(True, 0, 0, k)
+                for k in range(key, key+size))
+            self._nextKey = key+size
+        bolt = self._records[self._count]
+        bolt.reset(up, x, y)
+        self._count += 1
+        if up:
+            self._players += 1
+        return bolt
+
+
+    def remove(self, i):
+        """
+        Removes the live bolt at position i
+
+        The last live bolt is moved to position i, so a loop over the
+        positions should look at position i again after a removal.
+
+        Parameter i: the position of the bolt
+        Precondition: i is an int with 0 <= i < len(self)
+        """
+        records = self._records
+        bolt = records[i]
+        if bolt.isPlayerBolt():
+            self._players -= 1
+        self._count -= 1
+        last = self._count
+        records[i] = records[last]
+        records[last] = bolt
+
+
+    def clear(self):
+        """
+        Removes every live bolt
+        """
+        self._count = 0
+        self._players = 0
+
+
+    def fork(self):
+        """
+        Returns a new pool with copies of the live bolts of this one
+
+        The fork has no spare records; it allocates them when it fires.
+        """
+        pool = BoltPool.__new__(BoltPool)
+        pool._records = [bolt.copy() for bolt in self._records[:self._count]]
+        pool._count = self._count
+        pool._players = self._players
+        pool._nextKey = self._nextKey
+        return pool
@@ -0,0 +1,298 @@
+"""
+Broad phase collision module for Alien Invaders
+
+This module contains the class SpatialHash, a uniform grid that buckets
+collidable objects by the cells their bounding boxes overlap. Objects are
+registered (with move) every tick, and then only the objects that share a
+cell are handed to the (exact, but slower) narrow phase collides methods.
+
+With n objects spread over the screen, this keeps the cost of finding the
+colliding pairs close to linear in n, instead of testing every object
+against every other one. The hash does not know anything about ships,
+aliens or bolts, so new kinds of collidable models (bunkers, power-ups) can
+be registered in it too.
+
+Filling the grid from scratch every tick costs more than it saves when
+there are only a few objects, so the hash is incremental:
+
+    move        an object is only taken out of its cells and put in new
+                ones when its box moves into a different set of cells; a
+                bolt crosses a cell every few ticks
+    scan        while there are at most COLLISION_SCAN objects, nothing is
+                bucketed at all, and every object is a candidate; the
+                cells are built once there are more
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+
+# PRIMARY RULE: This module may only access consts.py. It must never import
+# game2d, kivy or any other module that needs a display.
+
+
+class SpatialHash(object):
+    """
+    A class representing a uniform spatial hash of bounding boxes.
+
+    Boxes are given by their center and size, like a GObject. An object is
+    registered the first time it is moved, and stays registered (at the box
+    it was last moved to) until it is removed.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _cell: the width and height of a cell
+    # Invariant: _cell is a number > 0
+    #
+    # Attribute _scan: the most objects for which nothing is bucketed
+    # Invariant: _scan is an int >= 0
+    #
+    # Attribute _entries: the box of every registered object, as a list
+    # [order, x, y, width, height, span], where order is the number of the
+    # object in registration order and span is the (left, right, bottom,
+    # top) cells of the box (None while nothing is bucketed)
+    # Invariant: _entries is a dictionary of registered objects to lists,
+    # in registration order
+    #
+    # Attribute _cells: the objects in each cell
+    # Invariant: _cells is None while there are at most _scan objects, or a
+    # dictionary whose keys are (i, j) tuples of ints and whose values are
+    # non-empty dictionaries of the objects in that cell (to None)
+    #
+    # Attribute _next: the order of the next object registered
+    # Invariant: _next is an int >= 0
+
+    def __init__(self, cell=COLLISION_CELL, scan=COLLISION_SCAN):
+        """
+        Initializes an empty spatial hash
+
+        Parameter cell: the width and height of a cell
+        Precondition: cell is a number > 0
+
+        Parameter scan: the most objects for which nothing is bucketed
+        Precondition: scan is an int >= 0
+        """
+        self._cell = cell
+        self._scan = scan
+        self._entries = {}
+        self._cells = None
+        self._next = 0
+
+
+    def __len__(self):
+        """
+        Returns the number of registered objects
+        """
+        return len(self._entries)
+
+
+    def __contains__(self, obj):
+        """
+        Returns True if obj is registered
+
+        Parameter obj: the object to look for
+        Precondition: obj is hashable
+        """
+        return obj in self._entries
+
+
+    def clear(self):
+        """
+        Removes every object from the hash
+        """
+        self._entries.clear()
+        self._cells = None
+        self._next = 0
+
+
+    def move(self, obj, x, y, width, height):
+        """
+        Registers obj with the box centered at (x, y) of the given size
+
+        If obj is already registered, its box is replaced, and it keeps its
+        place in the registration order.
+
+        Parameter obj: the object to register
+        Precondition: obj is hashable
+
+        Parameter x: the x-coordinate of the center of the box
+        Precondition: x is a number
+
+        Parameter y: the y-coordinate of the center of the box
+        Precondition: y is a number
+
+        Parameter width: the width of the box
+        Precondition: width is a number >= 0
+
+        Parameter height: the height of the box
+        Precondition: height is a number >= 0
+        """
+        entry = self._entries.get(obj)
+        if entry is None:
+            entry = [self._next, x, y, width, height, None]
+            self._next += 1
+            self._entries[obj] = entry
+            if self._cells is not None:
+                self._place(obj, entry)
+            elif len(self._entries) > self._scan:
+                self._build()
+            return
+        entry[1] = x
+        entry[2] = y
+        entry[3] = width
+        entry[4] = height
+        if self._cells is None:
+            return
+        # the same cells as _span, inlined since it runs for every object
+        cell = self._cell
+        span = (int((x - width/2)//cell), int((x + width/2)//cell),
+            int((y - height/2)//cell), int((y + height/2)//cell))
+        if span != entry[5]:
+            self._unplace(obj, entry)
+            entry[5] = span
+            self._place(obj, entry)
+
+
+    def remove(self, obj):
+        """
+        Removes obj from the hash, if it is registered
+
+        Parameter obj: the object to remove
+        Precondition: obj is hashable
+        """
+        entry = self._entries.pop(obj, None)
+        if entry is None or self._cells is None:
+            return
+        if len(self._entries) <= self._scan//2:
+            self._cells = None
+        else:
+            self._unplace(obj, entry)
+
+
+    def query(self, x, y, width, height):
+        """
+        Returns the registered objects that may overlap the given box
+
+        Every object whose box overlaps the given box is in the result, but
+        the result may contain objects that do not overlap it (while nothing
+        is bucketed, it is every object). The result has no repeats and is
+        in registration order.
+
+        Parameter x: the x-coordinate of the center of the box
+        Precondition: x is a number
+
+        Parameter y: the y-coordinate of the center of the box
+        Precondition: y is a number
+
+        Parameter width: the width of the box
+        Precondition: width is a number >= 0
+
+        Parameter height: the height of the box
+        Precondition: height is a number >= 0
+        """
+        if self._cells is None:
+            return list(self._entries)
+        cells = self._cells
+        left, right, bottom, top = self._span(x, y, width, height)
+        found = {}
+        for i in range(left, right+1):
+            for j in range(bottom, top+1):
+                bucket = cells.get((i, j))
+                if bucket is not None:
+                    found.update(bucket)
+        entries = self._entries
+        return sorted(found, key=lambda obj: entries[obj][0])
+
+
+    def pairs(self):
+        """
+        Returns the pairs of registered objects that may overlap
+
+        Each pair (a, b) appears once, with a registered before b, and the
+        pairs are in registration order. These are the candidate pairs for
+        a narrow phase test: every pair of objects that share a cell (or,
+        while nothing is bucketed, every pair of objects).
+        """
+        objects = list(self._entries)
+        if self._cells is None:
+            return [(objects[i], objects[j]) for i in range(len(objects))
+                for j in range(i+1, len(objects))]
+        entries = self._entries
+        found = set()
+        for bucket in self._cells.values():
+            if len(bucket) < 2:
+                continue
+            orders = sorted(entries[obj][0] for obj in bucket)
+            for i in range(len(orders)):
+                for j in range(i+1, len(orders)):
+                    found.add((orders[i], orders[j]))
+        byOrder = {entries[obj][0]: obj for obj in objects}
+        return [(byOrder[i], byOrder[j]) for i, j in sorted(found)]
+
+
+    # HELPER METHODS
+    def _span(self, x, y, width, height):
+        """
+        Returns the cells (left, right, bottom, top) overlapped by the box
+
+        Parameter x, y: the center of the box
+        Precondition: x, y are numbers
+
+        Parameter width, height: the size of the box
+        Precondition: width, height are numbers >= 0
+        """
+        cell = self._cell
+        return (int((x - width/2)//cell), int((x + width/2)//cell),
+            int((y - height/2)//cell), int((y + height/2)//cell))
+
+
+    def _place(self, obj, entry):
+        """
+        Puts obj in the cells of its box, and records them in entry
+
+        Parameter obj: a registered object
+        Precondition: obj is in no cell
+
+        Parameter entry: the entry of obj
+        Precondition: entry is obj's list in _entries
+        """
+        if entry[5] is None:
+            entry[5] = self._span(entry[1], entry[2], entry[3], entry[4])
+        left, right, bottom, top = entry[5]
+        cells = self._cells
+        for i in range(left, right+1):
+            for j in range(bottom, top+1):
+                bucket = cells.get((i, j))
+                if bucket is None:
+                    cells[(i, j)] = {obj: None}
+                else:
+                    bucket[obj] = None
+
+
+    def _unplace(self, obj, entry):
+        """
+        Takes obj out of the cells recorded in entry
+
+        Parameter obj: a registered object
+        Precondition: obj is in the cells of entry
+
+        Parameter entry: the entry of obj
+        Precondition: entry is obj's list in _entries, with its span set
+        """
+        left, right, bottom, top = entry[5]
+        cells = self._cells
+        for i in range(left, right+1):
+            for j in range(bottom, top+1):
+                bucket = cells[(i, j)]
+                del bucket[obj]
+                if not bucket:
+                    del cells[(i, j)]
+
+
+    def _build(self):
+        """
+        Buckets every registered object, once there are more than _scan
+        """
+        self._cells = {}
+        for obj, entry in self._entries.items():
+            entry[5] = None
+            self._place(obj, entry)
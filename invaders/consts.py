@@ -9,18 +9,20 @@ allows all modules to access them.
 # Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
 # December 9, 2021
 """
-import introcs
 import sys
-from tkinter import *
-from tkinter.ttk import *
 
 ### WINDOW CONSTANTS (all coordinates are in pixels) ###
 
-#: the width of the game display
-root = Tk()
-GAME_WIDTH  = root.winfo_screenwidth()
-#: the height of the game display
-GAME_HEIGHT = root.winfo_screenheight() - 56
+# GAME_WIDTH and GAME_HEIGHT, the size of the game display, are resolved
+# lazily by display.py the first time they are used. They are not copied by
+# "from consts import *"; import them by name instead.
+
+# the width of the display when there is no screen to measure
+HEADLESS_WIDTH  = 1280
+# the height of the display when there is no screen to measure
+HEADLESS_HEIGHT = 800
+# the height of the screen (task bars, title bar) not given to the display
+DISPLAY_MARGIN = 56
 
 
 ### SHIP CONSTANTS ###
@@ -80,6 +82,8 @@ BOLT_HEIGHT = 16
 BOLT_SPEED  = 8
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE = 6
+# the number of bolt records the bolt pool allocates up front
+BOLT_POOL = 32
 
 ### GAME CONSTANTS ###
 
@@ -129,3 +133,77 @@ except:
     pass # Use original value
 
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
+
+### TIMESTEP CONSTANTS ###
+
+# the number of updates per second that SHIP_MOVEMENT and BOLT_SPEED are for
+BASE_RATE = 60
+# the number of fixed simulation ticks per second (independent of the fps)
+SIM_TICK_RATE = 60
+# the most simulation ticks to run in one frame; time beyond that is dropped
+SIM_MAX_TICKS = 8
+
+### STARTUP CONSTANTS ###
+
+# the most seconds "python invaders" may take to import the game (see
+# startup.py)
+STARTUP_BUDGET = 1.0
+# the most seconds it may take to import the headless simulation
+HEADLESS_STARTUP_BUDGET = 0.3
+
+### PROFILING CONSTANTS ###
+
+# the number of latest samples the profiler keeps for every metric
+PROFILE_WINDOW = 1024
+
+### COLLISION CONSTANTS ###
+
+# the width and height (in pixels) of a cell of the collision spatial hash
+COLLISION_CELL = 64
+
+# the most objects in the collision spatial hash for which it does not bucket
+# them (every object is a candidate for the narrow phase)
+COLLISION_SCAN = 64
+
+### SCHEDULER CONSTANTS ###
+
+# the number of slots (a power of 2) of every level of the timer wheel
+SCHEDULER_SLOTS = 64
+# the number of levels of the timer wheel; timers further away than
+# SCHEDULER_SLOTS**SCHEDULER_LEVELS ticks wait in an overflow list
+SCHEDULER_LEVELS = 4
+
+### ASSET CONSTANTS ###
+
+# the sound files of the game, preloaded on a background thread
+SOUND_FILES = ('alienblast.wav', 'shipshoot.wav', 'playerlose.wav', 'win.wav',
+    'bkg.wav')
+# the font of every label of the game
+HUD_FONT = 'Arcade.ttf'
+# the font files of the game, preloaded on a background thread
+FONT_FILES = (HUD_FONT,)
+
+### AUDIO CONSTANTS ###
+
+# the sound effects the simulation triggers, by name (the file adds .wav)
+SOUND_EFFECTS = ('alienblast', 'shipshoot', 'playerlose')
+# the number of voices (separately loaded copies) of every sound effect
+AUDIO_VOICES = 3
+# the most sound effects that may play at the same time
+AUDIO_MAX_PLAYING = 6
+# the seconds a sound effect is counted as playing after it starts
+AUDIO_VOICE_TIME = 0.4
+
+
+def __getattr__(name):
+    """
+    Returns GAME_WIDTH or GAME_HEIGHT, resolving the display size if needed
+
+    Parameter name: the name of the missing module attribute
+    Precondition: name is a string
+    """
+    if name in ('GAME_WIDTH', 'GAME_HEIGHT'):
+        from display import getDisplaySize
+        width, height = getDisplaySize()
+        return width if name == 'GAME_WIDTH' else height
+    raise AttributeError(f"module 'consts' has no attribute {name!r}")
@@ -0,0 +1,104 @@
+"""
+Display metrics module for Alien Invaders
+
+This module decides the size of the game display. The size used to be read
+from a Tk root created when consts.py was imported, which meant that every
+module paid for importing tkinter and starting a Tk interpreter (even on a
+machine with no display). Now the size is only resolved the first time it
+is asked for, in this order:
+
+    1. a size given to setDisplaySize (or setHeadless), if any
+    2. the environment variable INVADERS_DISPLAY, either WIDTHxHEIGHT (for
+       example 1280x800) or the word headless
+    3. the size of the screen, read from a temporary Tk root
+    4. HEADLESS_WIDTH x HEADLESS_HEIGHT, if there is no screen to read
+
+tkinter is only imported in step 3.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+import os
+
+# HIDDEN GLOBALS:
+# Global _size: the resolved size of the display
+# Invariant: _size is a (width, height) tuple of ints, or None if the size
+# has not been resolved yet
+_size = None
+
+
+def setDisplaySize(width, height):
+    """
+    Fixes the size of the display to width x height
+
+    This must be called before the size is first used (that is, before app.py
+    or wave.py are imported, or a WaveSim is made without a size).
+
+    Parameter width: the width of the display
+    Precondition: width is an int > 0
+
+    Parameter height: the height of the display
+    Precondition: height is an int > 0
+    """
+    global _size
+    _size = (width, height)
+
+
+def setHeadless():
+    """
+    Fixes the size of the display to HEADLESS_WIDTH x HEADLESS_HEIGHT
+
+    The screen is never queried after this call.
+    """
+    setDisplaySize(HEADLESS_WIDTH, HEADLESS_HEIGHT)
+
+
+def getDisplaySize():
+    """
+    Returns the size of the display as a (width, height) tuple of ints
+
+    The size is resolved the first time this function is called.
+    """
+    global _size
+    if _size is None:
+        _size = _envSize()
+    if _size is None:
+        _size = _screenSize()
+    return _size
+
+
+def _envSize():
+    """
+    Returns the size given by INVADERS_DISPLAY, or None if it is not set
+    """
+    value = os.environ.get('INVADERS_DISPLAY', '').strip().lower()
+    if value == '':
+        return None
+    if value == 'headless':
+        return (HEADLESS_WIDTH, HEADLESS_HEIGHT)
+    try:
+        width, height = value.split('x')
+        return (int(width), int(height))
+    except ValueError:
+        return None # Ignore a malformed value
+
+
+def _screenSize():
+    """
+    Returns the size of the screen, less DISPLAY_MARGIN pixels of height
+
+    The Tk root used to read the screen is destroyed right away. If tkinter
+    is missing or there is no screen, this returns the headless size.
+    """
+    try:
+        import tkinter
+        root = tkinter.Tk()
+    except Exception:
+        # ImportError without tkinter, tkinter.TclError without a display
+        return (HEADLESS_WIDTH, HEADLESS_HEIGHT)
+    try:
+        return (root.winfo_screenwidth(),
+            root.winfo_screenheight() - DISPLAY_MARGIN)
+    finally:
+        root.destroy()
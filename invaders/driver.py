@@ -0,0 +1,158 @@
+"""
+Game driver module for Alien Invaders
+
+This module contains Game, the rules of a whole game of Invaders (lives,
+respawning the ship, winning and losing) played on a headless WaveSim. The
+bot environment (env.py), the parameter sweep (sweep.py), the benchmark
+(bench.py) and the replay of recordings (replay.py) all play their games
+with it, so that they end games the same way, and the same way Invaders
+does in app.py:
+
+    ship lost   if lives are left, a life is lost and the ship is respawned
+                (at once, or when respawn is called); otherwise the game
+                is lost
+    wave won    the game is won, even if the aliens reached the defense line
+                in the same tick
+    line        the game is lost once an alien reaches the defense line,
+                even if the wave starts there
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+
+# PRIMARY RULE: This module may only access consts.py and (through the
+# WaveSim it is given) sim.py. It must never import game2d, kivy or any
+# other module that needs a display.
+
+
+class Game(object):
+    """
+    A class representing a game of Invaders played on a WaveSim.
+
+    Method update plays one tick of the wave and then applies the rules of
+    the game. It may not be called once the game is over.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _sim: the wave being played
+    # Invariant: _sim is a WaveSim object
+    #
+    # Attribute _lives: the lives left
+    # Invariant: _lives is an int > 0
+    #
+    # Attribute _respawn: whether a lost ship is respawned at once
+    # Invariant: _respawn is a boolean
+    #
+    # Attribute _ticks: the ticks played
+    # Invariant: _ticks is an int >= 0
+    #
+    # Attribute _won: whether the player won
+    # Invariant: _won is a boolean
+    #
+    # Attribute _over: whether the game is over
+    # Invariant: _over is a boolean
+
+    def __init__(self, sim, lives=SHIP_LIVES, respawn=True):
+        """
+        Initializes a game of sim with the given lives
+
+        The game is over at once if the aliens start at the defense line.
+
+        Parameter sim: the wave to play
+        Precondition: sim is a WaveSim object that is not over
+
+        Parameter lives: the lives at the start of the game
+        Precondition: lives is an int > 0
+
+        Parameter respawn: whether a lost ship is respawned at once (if
+        False, respawn must be called before the next update)
+        Precondition: respawn is a boolean
+        """
+        self._sim = sim
+        self._lives = lives
+        self._respawn = respawn
+        self._ticks = 0
+        self._won = False
+        self._over = sim.alienLine()
+
+
+    def getSim(self):
+        """
+        Returns the wave being played
+        """
+        return self._sim
+
+
+    def getLives(self):
+        """
+        Returns the lives left
+        """
+        return self._lives
+
+
+    def getTicks(self):
+        """
+        Returns the number of ticks played
+        """
+        return self._ticks
+
+
+    def isWon(self):
+        """
+        Returns True if the player won
+        """
+        return self._won
+
+
+    def isOver(self):
+        """
+        Returns True if the game is over (won or lost)
+        """
+        return self._over
+
+
+    def fork(self):
+        """
+        Returns a copy of this game that plays on independently
+
+        The wave is forked (see WaveSim.fork).
+        """
+        clone = Game.__new__(Game)
+        clone.__dict__.update(self.__dict__)
+        clone._sim = self._sim.fork()
+        return clone
+
+
+    def respawn(self):
+        """
+        Respawns the ship after a ship was lost, as Invaders does when the
+        player continues
+        """
+        self._sim.spawnShip()
+        self._sim.setShipDies(False)
+        self._sim.setPlayerWin(False)
+
+
+    def update(self, dt, left=False, right=False, fire=False):
+        """
+        Plays one tick of dt seconds and applies the rules of the game
+
+        Parameter dt: the length of the tick in seconds
+        Precondition: dt is a number > 0
+
+        Parameter left, right, fire: the keys held down
+        Precondition: left, right, fire are booleans, the game is not over
+        and no lost ship is waiting to be respawned
+        """
+        sim = self._sim
+        sim.update(dt, left, right, fire)
+        self._ticks += 1
+        if sim.getShipDies() and self._lives > 1:
+            self._lives -= 1
+            if self._respawn:
+                self.respawn()
+        elif sim.getPlayerWin():
+            self._won = True
+            self._over = True
+        elif sim.alienLine() or sim.getShipDies():
+            self._over = True
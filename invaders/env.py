@@ -0,0 +1,408 @@
+"""
+Environment module for Alien Invaders
+
+This module contains an environment API for training bots against the game,
+without a window. WaveEnv plays one game on a WaveSim:
+
+    observation = env.reset(seed)
+    observation, reward, done, info = env.step(action)
+
+An action is an int made of the bits ACTION_LEFT, ACTION_RIGHT and
+ACTION_FIRE (so 0 to 7), held for one tick (or for repeat ticks, if the
+environment was made with repeat > 1). The reward is the change in score.
+The game follows the rules of Invaders (see Game in driver.py): a lost ship
+costs a life and is respawned at once, and the game is done when the wave
+is won, the line is breached, the last life is lost, or after maxTicks
+ticks.
+
+An observation is a dictionary of NumPy arrays with fixed shapes:
+
+    'ship'      the x-coordinate of the ship (-1 once the last ship has blown
+                up; a ship that is blowing up still has its x), shape ()
+    'origin'    the center (x, y) of the bottom left alien slot, shape (2,)
+    'alive'     the alive mask of the aliens (row 0 at the bottom),
+                shape (rows, cols)
+    'bolts'     the x, y and direction (1 up, -1 down) of up to maxBolts
+                bolts, zero past 'boltCount', shape (maxBolts, 3)
+    'boltCount' the number of bolts in 'bolts', shape ()
+
+VectorWaveEnv plays n games in lockstep and returns the same observations
+stacked (with a first axis of size n), plus arrays of n rewards and n done
+flags. A game that is done is reset at once with its next seed, so the
+batch always has n games in play (a game that is over as soon as it is
+reset is done at the next step without being played). Run this module to
+measure how many ticks per second it plays:
+
+    python invaders/env.py [--envs N] [--steps N]
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+import argparse
+import time
+import numpy as np
+from sim import WaveSim
+from driver import Game
+
+# PRIMARY RULE: This module may only access consts.py, sim.py and driver.py.
+# It must never import game2d, kivy or any other module that needs a display.
+
+# the bits of an action
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_FIRE = 4
+
+# the number of actions
+ACTIONS = 8
+
+# the most bolts in an observation
+MAX_BOLTS = 32
+
+# the longest game in ticks (ten minutes of game time)
+MAX_TICKS = 10*60*SIM_TICK_RATE
+
+
+class WaveEnv(object):
+    """
+    A class representing one game that a bot can play tick by tick.
+
+    The observation arrays are reused: every call to reset or step writes
+    into the same arrays (or into the arrays given to observe), so copy them
+    if they must be kept.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _settings: the keyword arguments for every new WaveSim
+    # Invariant: _settings is a dictionary
+    #
+    # Attribute _lives: the lives at the start of a game
+    # Invariant: _lives is an int > 0
+    #
+    # Attribute _repeat: the ticks that every action is held for
+    # Invariant: _repeat is an int > 0
+    #
+    # Attribute _maxBolts: the most bolts in an observation
+    # Invariant: _maxBolts is an int > 0
+    #
+    # Attribute _maxTicks: the most ticks in a game
+    # Invariant: _maxTicks is an int > 0
+    #
+    # Attribute _game: the game being played
+    # Invariant: _game is a Game object, or None before the first reset
+    #
+    # Attribute _done: whether the game is over, or has run maxTicks ticks
+    # Invariant: _done is a boolean
+    #
+    # Attribute _obs: the observation arrays
+    # Invariant: _obs is a dictionary of arrays (see the module docstring)
+
+    def __init__(self, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW, speed=ALIEN_SPEED,
+            lives=SHIP_LIVES, repeat=1, maxBolts=MAX_BOLTS, maxTicks=MAX_TICKS,
+            rules=None):
+        """
+        Initializes an environment; reset must be called before step
+
+        Parameter rows, cols: the size of the wave
+        Precondition: rows, cols are ints > 0
+
+        Parameter speed: the seconds between alien steps
+        Precondition: speed is a float > 0
+
+        Parameter lives: the lives at the start of a game
+        Precondition: lives is an int > 0
+
+        Parameter repeat: the ticks that every action is held for
+        Precondition: repeat is an int > 0
+
+        Parameter maxBolts: the most bolts in an observation
+        Precondition: maxBolts is an int > 0
+
+        Parameter maxTicks: the most ticks in a game
+        Precondition: maxTicks is an int > 0
+
+        Parameter rules: the tuning values to change (see RULES in sim.py)
+        Precondition: rules is a dictionary or None
+        """
+        self._settings = {'rows': rows, 'cols': cols, 'speed': speed,
+            'width': HEADLESS_WIDTH, 'height': HEADLESS_HEIGHT, 'rules': rules}
+        self._lives = lives
+        self._repeat = repeat
+        self._maxBolts = maxBolts
+        self._maxTicks = maxTicks
+        self._game = None
+        self._done = True
+        self._obs = makeObservation(rows, cols, maxBolts)
+
+
+    def getSim(self):
+        """
+        Returns the wave being played (None before the first reset)
+        """
+        return None if self._game is None else self._game.getSim()
+
+
+    def isDone(self):
+        """
+        Returns True if the game is over
+        """
+        return self._done
+
+
+    def getInfo(self):
+        """
+        Returns a dictionary with the score, lives, ticks and win of the game
+        """
+        game = self._game
+        return {'score': game.getSim().getScore(), 'lives': game.getLives(),
+            'ticks': game.getTicks(), 'won': game.isWon()}
+
+
+    def fork(self):
+        """
+        Returns a copy of this environment that plays on independently
+
+        The wave is forked (see WaveSim.fork), so this is cheap enough to
+        look ahead at many futures from every state. The copy has its own
+        observation arrays.
+        """
+        clone = WaveEnv.__new__(WaveEnv)
+        clone.__dict__.update(self.__dict__)
+        clone._game = self._game.fork()
+        clone._obs = makeObservation(self._settings['rows'],
+            self._settings['cols'], self._maxBolts)
+        return clone
+
+
+    def reset(self, seed=None):
+        """
+        Starts a new game and returns its first observation
+
+        Parameter seed: the seed of the wave (random if None)
+        Precondition: seed is an int >= 0 or None
+        """
+        self._game = Game(WaveSim(seed=seed, **self._settings), self._lives)
+        self._done = self._game.isOver()
+        return self.observe()
+
+
+    def step(self, action):
+        """
+        Plays action and returns a tuple (observation, reward, done, info)
+
+        Parameter action: the keys held down, as bits
+        Precondition: action is an int with 0 <= action < ACTIONS, and the
+        game is not done
+        """
+        reward = self.advance(action)
+        return (self.observe(), reward, self._done, self.getInfo())
+
+
+    def advance(self, action):
+        """
+        Plays action without making an observation and returns the reward
+
+        Parameter action: the keys held down, as bits
+        Precondition: action is an int with 0 <= action < ACTIONS, and the
+        game is not done
+        """
+        game = self._game
+        sim = game.getSim()
+        left = bool(action & ACTION_LEFT)
+        right = bool(action & ACTION_RIGHT)
+        fire = bool(action & ACTION_FIRE)
+        tick = 1/SIM_TICK_RATE
+        before = sim.getScore()
+        for _ in range(self._repeat):
+            game.update(tick, left, right, fire)
+            if game.isOver() or game.getTicks() >= self._maxTicks:
+                self._done = True
+                break
+        return sim.getScore() - before
+
+
+    def observe(self, out=None, i=None):
+        """
+        Writes the observation of the game and returns it
+
+        Parameter out: the arrays to write to (this environment's own if None)
+        Precondition: out is a dictionary made by makeObservation, or None
+
+        Parameter i: the index in out to write to (out has no batch axis if
+        None)
+        Precondition: i is an int >= 0 or None
+        """
+        if out is None:
+            out = self._obs
+        index = () if i is None else (i,)
+        sim = self._game.getSim()
+        ship = sim.getShip()
+        formation = sim.getFormation()
+        out['ship'][index] = -1 if ship is None else ship.x
+        out['origin'][index] = formation.getOrigin()
+        out['alive'][index] = formation.getAlive()
+        bolts = out['bolts'][index]
+        count = 0
+        for bolt in sim.getBolts():
+            if count == self._maxBolts:
+                break
+            bolts[count] = (bolt.x, bolt.y, 1 if bolt.isPlayerBolt() else -1)
+            count += 1
+        bolts[count:] = 0
+        out['boltCount'][index] = count
+        return out
+
+
+class VectorWaveEnv(object):
+    """
+    A class representing n games played in lockstep.
+
+    Game k is first played with seed seed+k, and every time it is reset
+    after that with its seed plus n. The observation arrays are reused, like
+    those of WaveEnv.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _envs: the games
+    # Invariant: _envs is a list of n WaveEnv objects
+    #
+    # Attribute _seeds: the seed of the current game of every environment
+    # Invariant: _seeds is a list of n ints
+    #
+    # Attribute _obs: the stacked observation arrays
+    # Invariant: _obs is a dictionary of arrays with a first axis of size n
+    #
+    # Attribute _rewards: the rewards of the last step
+    # Invariant: _rewards is a float32 array of shape (n,)
+    #
+    # Attribute _dones: the done flags of the last step
+    # Invariant: _dones is a bool array of shape (n,)
+
+    def __init__(self, n, **settings):
+        """
+        Initializes n environments; reset must be called before step
+
+        Parameter n: the number of games
+        Precondition: n is an int > 0
+
+        Parameter settings: the keyword arguments of every WaveEnv
+        Precondition: settings are valid keyword arguments of WaveEnv
+        """
+        self._envs = [WaveEnv(**settings) for _ in range(n)]
+        self._seeds = list(range(n))
+        rows = settings.get('rows', ALIEN_ROWS)
+        cols = settings.get('cols', ALIENS_IN_ROW)
+        self._obs = makeObservation(rows, cols,
+            settings.get('maxBolts', MAX_BOLTS), n)
+        self._rewards = np.zeros(n, dtype=np.float32)
+        self._dones = np.zeros(n, dtype=bool)
+
+
+    def __len__(self):
+        """
+        Returns the number of games
+        """
+        return len(self._envs)
+
+
+    def getEnv(self, k):
+        """
+        Returns the environment of game k
+
+        Parameter k: the index of the game
+        Precondition: k is an int with 0 <= k < n
+        """
+        return self._envs[k]
+
+
+    def reset(self, seed=0):
+        """
+        Starts n new games and returns their stacked observations
+
+        Parameter seed: the seed of game 0 (game k gets seed+k)
+        Precondition: seed is an int >= 0
+        """
+        for k, env in enumerate(self._envs):
+            self._seeds[k] = seed + k
+            env.reset(seed + k)
+            env.observe(self._obs, k)
+        return self._obs
+
+
+    def step(self, actions):
+        """
+        Plays one action in every game and returns (obs, rewards, dones)
+
+        A game that is done is reset, and its observation is the first one
+        of the new game. Its reward and done flag are those of the step that
+        ended the old game. A game that is over as soon as it is reset (the
+        aliens start at the defense line) is not played: its reward is 0,
+        it is done, and it is reset again with its next seed.
+
+        Parameter actions: the action of every game
+        Precondition: actions is a sequence of n ints with 0 <= action <
+        ACTIONS
+        """
+        n = len(self._envs)
+        for k, env in enumerate(self._envs):
+            if env.isDone():
+                self._rewards[k] = 0
+                done = True
+            else:
+                self._rewards[k] = env.advance(int(actions[k]))
+                done = env.isDone()
+            self._dones[k] = done
+            if done:
+                self._seeds[k] += n
+                env.reset(self._seeds[k])
+            env.observe(self._obs, k)
+        return (self._obs, self._rewards, self._dones)
+
+
+def makeObservation(rows, cols, maxBolts, n=None):
+    """
+    Returns a dictionary of zeroed observation arrays
+
+    Parameter rows, cols: the size of the wave
+    Precondition: rows, cols are ints > 0
+
+    Parameter maxBolts: the most bolts in an observation
+    Precondition: maxBolts is an int > 0
+
+    Parameter n: the size of the batch axis (no batch axis if None)
+    Precondition: n is an int > 0 or None
+    """
+    batch = () if n is None else (n,)
+    return {'ship': np.zeros(batch, dtype=np.float32),
+        'origin': np.zeros(batch + (2,), dtype=np.float32),
+        'alive': np.zeros(batch + (rows, cols), dtype=bool),
+        'bolts': np.zeros(batch + (maxBolts, 3), dtype=np.float32),
+        'boltCount': np.zeros(batch, dtype=np.int32)}
+
+
+def main(argv=None):
+    """
+    Measures the ticks per second of a VectorWaveEnv with random actions
+
+    Parameter argv: the command line arguments (sys.argv[1:] if None)
+    Precondition: argv is a list of strings or None
+    """
+    parser = argparse.ArgumentParser(description='Measure env throughput.')
+    parser.add_argument('--envs', type=int, default=64)
+    parser.add_argument('--steps', type=int, default=1000)
+    args = parser.parse_args(argv)
+    envs = VectorWaveEnv(args.envs)
+    envs.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, ACTIONS, size=(args.steps, args.envs))
+    episodes = 0
+    start = time.perf_counter()
+    for step in range(args.steps):
+        obs, rewards, dones = envs.step(actions[step])
+        episodes += int(dones.sum())
+    took = time.perf_counter() - start
+    ticks = args.steps*args.envs
+    print(f'{ticks} ticks in {took:.2f} s: {ticks/took:.0f} ticks/s '
+        f'({ticks/took/SIM_TICK_RATE:.0f}x real time), {episodes} games done')
+
+
+if __name__ == '__main__':
+    main()
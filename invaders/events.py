@@ -0,0 +1,242 @@
+"""
+Event module for Alien Invaders
+
+This module contains the events of a wave and the bus they are sent on.
+
+The simulation (WaveSim) does not play sounds, move views or change the
+HUD. Instead, every tick it collects an event for everything that happened
+in that tick:
+
+    BoltFired       a bolt was fired (by the ship or by an alien)
+    AlienKilled     a bolt of the ship killed an alien
+    ShipHit         an alien bolt hit the ship (it starts blowing up)
+    ShipDestroyed   the ship finished blowing up, and is gone
+    WaveCleared     the last alien was killed
+    LineBreached    the aliens reached the defense line (or started there)
+
+An EventBus takes the events of a tick and hands them to its subscribers
+in one batch: a subscriber to a kind of event is called once per dispatch,
+with the list of the events of that kind, in the order they happened. So
+the audio, the HUD, telemetry and Invaders each run once per tick at most,
+and only in the ticks that have something for them.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+# PRIMARY RULE: This module may not access any other module of the game. It
+# must never import game2d, kivy or any other module that needs a display.
+
+
+class Event(object):
+    """
+    A class representing something that happened in a simulation tick.
+
+    Events never change after they are made.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        """
+        Returns the event as a string, like AlienKilled(row=0, col=3)
+        """
+        fields = ', '.join(f'{name}={getattr(self, name)!r}'
+            for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class BoltFired(Event):
+    """
+    A class representing a bolt that was fired.
+
+    Attribute up: whether the bolt was fired by the ship (and moves up)
+    Invariant: up is a boolean
+
+    Attribute x, y: the center of the bolt when it was fired
+    Invariant: x, y are floats
+    """
+    __slots__ = ('up', 'x', 'y')
+
+    def __init__(self, up, x, y):
+        """
+        Initializes the event of a bolt fired from (x, y)
+
+        Parameter up: whether the bolt was fired by the ship
+        Precondition: up is a boolean
+
+        Parameter x, y: the center of the bolt
+        Precondition: x, y are numbers
+        """
+        self.up = up
+        self.x = x
+        self.y = y
+
+
+class AlienKilled(Event):
+    """
+    A class representing an alien killed by a bolt of the ship.
+
+    Attribute row, col: the slot of the alien (row 0 is the bottom row)
+    Invariant: row, col are ints >= 0
+    """
+    __slots__ = ('row', 'col')
+
+    def __init__(self, row, col):
+        """
+        Initializes the event of the alien in the slot (row, col) dying
+
+        Parameter row, col: the slot of the alien
+        Precondition: row, col are ints >= 0
+        """
+        self.row = row
+        self.col = col
+
+
+class ShipHit(Event):
+    """
+    A class representing the ship being hit by an alien bolt.
+
+    Attribute x: the x-coordinate of the ship when it was hit
+    Invariant: x is a float
+    """
+    __slots__ = ('x',)
+
+    def __init__(self, x):
+        """
+        Initializes the event of the ship being hit at x
+
+        Parameter x: the x-coordinate of the ship
+        Precondition: x is a number
+        """
+        self.x = x
+
+
+class ShipDestroyed(Event):
+    """
+    A class representing the ship finishing its blow up animation.
+    """
+    __slots__ = ()
+
+
+class WaveCleared(Event):
+    """
+    A class representing the last alien of the wave being killed.
+
+    Attribute score: the score when the wave was cleared
+    Invariant: score is an int
+    """
+    __slots__ = ('score',)
+
+    def __init__(self, score):
+        """
+        Initializes the event of the wave being cleared with score
+
+        Parameter score: the score
+        Precondition: score is an int
+        """
+        self.score = score
+
+
+class LineBreached(Event):
+    """
+    A class representing the aliens reaching the defense line.
+    """
+    __slots__ = ()
+
+
+# every kind of event, in the order a tick dispatches them
+EVENTS = (BoltFired, AlienKilled, ShipHit, ShipDestroyed, WaveCleared,
+    LineBreached)
+
+
+class EventBus(object):
+    """
+    A class representing the dispatch of the events of a wave.
+
+    Events are posted with post (or postAll), and kept until dispatch hands
+    them to the subscribers, a batch per kind of event.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _handlers: the subscribers of every kind of event
+    # Invariant: _handlers is a dictionary from Event subclasses to lists of
+    # functions of one list
+    #
+    # Attribute _pending: the events posted since the last dispatch
+    # Invariant: _pending is a list of Event objects
+
+    def __init__(self):
+        """
+        Initializes a bus with no subscribers and no events
+        """
+        self._handlers = {}
+        self._pending = []
+
+
+    def subscribe(self, kind, handler):
+        """
+        Calls handler(events) with the events of kind in every dispatch
+
+        The handler is only called if there is at least one such event.
+        Handlers of the same kind are called in the order they subscribed.
+
+        Parameter kind: the kind of event
+        Precondition: kind is one of EVENTS
+
+        Parameter handler: the subscriber
+        Precondition: handler is a function of one list of events
+        """
+        self._handlers.setdefault(kind, []).append(handler)
+
+
+    def unsubscribe(self, kind, handler):
+        """
+        Stops calling handler with the events of kind
+
+        Parameter kind: the kind of event
+        Precondition: kind is one of EVENTS
+
+        Parameter handler: a subscriber of kind
+        Precondition: handler was subscribed to kind
+        """
+        self._handlers[kind].remove(handler)
+
+
+    def post(self, event):
+        """
+        Keeps event until the next dispatch
+
+        Parameter event: the event
+        Precondition: event is an Event object
+        """
+        self._pending.append(event)
+
+
+    def postAll(self, events):
+        """
+        Keeps every event in events until the next dispatch
+
+        Parameter events: the events, in the order they happened
+        Precondition: events is a list of Event objects
+        """
+        self._pending.extend(events)
+
+
+    def dispatch(self):
+        """
+        Hands the events posted since the last dispatch to the subscribers
+
+        The events are grouped by kind (in the order of EVENTS), and every
+        subscriber of a kind is called once with its group. Events posted by
+        a subscriber wait for the next dispatch.
+        """
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        batches = {}
+        for event in pending:
+            batches.setdefault(type(event), []).append(event)
+        for kind in EVENTS:
+            events = batches.get(kind)
+            if events is not None:
+                for handler in self._handlers.get(kind, ()):
+                    handler(events)
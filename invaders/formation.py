@@ -0,0 +1,410 @@
+"""
+Formation module for Alien Invaders
+
+This module contains the class Formation, which stores the aliens of a wave
+as a struct of NumPy arrays instead of a 2d list of alien objects. The alive
+mask, the image and the offset of every alien are each one array of shape
+(rows, cols), with row 0 being the bottom row.
+
+All the aliens move in lockstep, so the formation is a rigid body: one
+origin (the center of the bottom left slot) plus a fixed offset for every
+slot. A march step, an edge bounce and a descent only move the origin, so
+they cost the same for any number of aliens. The position of an alien is
+worked out from the origin when it is needed, for collisions and drawing.
+
+Next to the alive mask, the formation keeps a bitboard index: one int per
+column whose bit r is set when the alien in row r is alive. It also keeps
+the list of non-empty columns. Choosing the alien that fires, checking if a
+column is empty and counting the aliens are then all O(1), and the index is
+only updated when an alien is killed.
+
+The formation also keeps its bounding box up to date: the leftmost and
+rightmost non-empty columns and the lowest non-empty row. Since every alien
+in a column has the same x (and every alien in a row the same y), the edges
+of the formation are the origin plus one offset, so the checks made on every
+step and every frame do not grow with the size of the grid.
+
+A formation can be forked for lookahead search. The offsets and images
+never change, so a fork shares them. The alive mask is shared too, until
+the fork or the formation it came from kills an alien (copy on write).
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+import numpy as np
+
+# PRIMARY RULE: This module may only access consts.py. Like sim.py, it must
+# never import game2d, kivy or any other module that needs a display.
+
+
+class Formation(object):
+    """
+    A class to represent the formation of aliens in a wave.
+
+    The slot in row r and column c is the alien in the r-th row from the
+    bottom and the c-th column from the left. A slot keeps its position
+    after the alien in it is killed; the alive mask says which slots are
+    still occupied.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _rows: the number of rows of aliens
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cols: the number of aliens per row
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _ox: the x-coordinate of the center of the slot (0, 0)
+    # Invariant: _ox is a float
+    #
+    # Attribute _oy: the y-coordinate of the center of the slot (0, 0)
+    # Invariant: _oy is a float
+    #
+    # Attribute _colX: the x offset of every column from the origin
+    # Invariant: _colX is a tuple of _cols floats, never changed
+    #
+    # Attribute _rowY: the y offset of every row from the origin
+    # Invariant: _rowY is a tuple of _rows floats, never changed
+    #
+    # Attribute _alive: which aliens are still alive
+    # Invariant: _alive is a bool array of shape (_rows, _cols)
+    #
+    # Attribute _ownsAlive: whether _alive belongs to this formation only
+    # Invariant: _ownsAlive is a boolean; if False, _alive may be shared with
+    # forks and must be copied before it is changed
+    #
+    # Attribute _image: the image of each alien, as an index in ALIEN_IMAGES
+    # Invariant: _image is an int array of shape (_rows, _cols)
+    #
+    # Attribute _colBits: the alive bitmask of each column
+    # Invariant: _colBits is a list of _cols ints; bit r of _colBits[c] is
+    # set if and only if _alive[r, c] is True
+    #
+    # Attribute _columns: the non-empty columns, in no particular order
+    # Invariant: _columns is a list of the c with _colBits[c] != 0
+    #
+    # Attribute _colIndex: the position of each column in _columns
+    # Invariant: _colIndex is a list of _cols ints; _columns[_colIndex[c]]
+    # is c for every non-empty column c
+    #
+    # Attribute _count: the number of aliens still alive
+    # Invariant: _count is the number of set bits in _colBits
+    #
+    # Attribute _rowCount: the number of live aliens in each row
+    # Invariant: _rowCount is a list of _rows ints >= 0
+    #
+    # Attribute _left: the leftmost non-empty column
+    # Invariant: _left is an int; _colBits[_left] != 0 if _count > 0
+    #
+    # Attribute _right: the rightmost non-empty column
+    # Invariant: _right is an int; _colBits[_right] != 0 if _count > 0
+    #
+    # Attribute _bottom: the lowest non-empty row
+    # Invariant: _bottom is an int; _rowCount[_bottom] > 0 if _count > 0
+
+    # GETTERS
+    def getRows(self):
+        """
+        Returns the number of rows of aliens
+        """
+        return self._rows
+
+
+    def getCols(self):
+        """
+        Returns the number of aliens per row
+        """
+        return self._cols
+
+
+    def getOrigin(self):
+        """
+        Returns the center (x, y) of the slot (0, 0) as a tuple of floats
+        """
+        return (self._ox, self._oy)
+
+
+    def getAlive(self):
+        """
+        Returns the alive mask of the aliens (do not modify it)
+        """
+        return self._alive
+
+
+    def getImage(self):
+        """
+        Returns the array of image indices in ALIEN_IMAGES (do not modify it)
+        """
+        return self._image
+
+
+    def getColumns(self):
+        """
+        Returns a new list of the non-empty columns, in the order that
+        shooter picks from
+        """
+        return list(self._columns)
+
+
+    # INITIALIZER
+    def __init__(self, rows, cols, height):
+        """
+        Initializes a full formation of rows x cols aliens
+
+        The top row is ALIEN_CEILING pixels below the top of the display and
+        the leftmost column is ALIEN_H_SEP pixels from the left edge. Rows
+        are given the images of ALIEN_IMAGES two at a time, from the bottom.
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens per row
+        Precondition: cols is an int > 0
+
+        Parameter height: the height of the game display
+        Precondition: height is an int > 0
+        """
+        self._rows = rows
+        self._cols = cols
+        r = np.arange(rows).reshape(rows, 1)
+        self._ox = ALIEN_H_SEP + ALIEN_WIDTH/2
+        self._oy = height - ALIEN_CEILING - \
+            (rows-1)*(ALIEN_HEIGHT + ALIEN_V_SEP) - ALIEN_HEIGHT/2
+        self._colX = tuple(float(col*(ALIEN_WIDTH + ALIEN_H_SEP))
+            for col in range(cols))
+        self._rowY = tuple(float(row*(ALIEN_HEIGHT + ALIEN_V_SEP))
+            for row in range(rows))
+        self._alive = np.ones((rows, cols), dtype=bool)
+        self._ownsAlive = True
+        self._image = np.repeat((r//2) % len(ALIEN_IMAGES), cols, axis=1)
+        self._colBits = [(1 << rows) - 1]*cols
+        self._columns = list(range(cols))
+        self._colIndex = list(range(cols))
+        self._count = rows*cols
+        self._rowCount = [cols]*rows
+        self._left = 0
+        self._right = cols-1
+        self._bottom = 0
+
+
+    # QUERIES
+    def count(self):
+        """
+        Returns the number of aliens still alive
+        """
+        return self._count
+
+
+    def isAlive(self, row, col):
+        """
+        Returns True if the alien in the given slot is alive
+
+        Parameter row: the row of the slot (0 is the bottom row)
+        Precondition: row is an int with 0 <= row < rows
+
+        Parameter col: the column of the slot
+        Precondition: col is an int with 0 <= col < cols
+        """
+        return bool(self._colBits[col] >> row & 1)
+
+
+    def position(self, row, col):
+        """
+        Returns the center (x, y) of the given slot as a tuple of floats
+
+        Parameter row: the row of the slot (0 is the bottom row)
+        Precondition: row is an int with 0 <= row < rows
+
+        Parameter col: the column of the slot
+        Precondition: col is an int with 0 <= col < cols
+        """
+        return (self._ox + self._colX[col], self._oy + self._rowY[row])
+
+
+    def bottomRow(self, col):
+        """
+        Returns the row of the lowest live alien in the column
+
+        This is the lowest set bit of the column bitmask.
+
+        Parameter col: the index of a column that is not empty
+        Precondition: col is an int with 0 <= col < cols
+        """
+        bits = self._colBits[col]
+        return (bits & -bits).bit_length() - 1
+
+
+    def shooter(self, rng):
+        """
+        Returns the (row, col) of the alien that fires next
+
+        The column is picked at random among the non-empty columns, and the
+        alien is the lowest live alien in it. There must be a live alien.
+
+        Parameter rng: the random number generator to use
+        Precondition: rng is the module random or a random.Random object
+        """
+        col = self._columns[rng.randrange(len(self._columns))]
+        return (self.bottomRow(col), col)
+
+
+    def extrema(self):
+        """
+        Returns a tuple (min, max) of the x-coordinates of the live aliens
+
+        This method should only be called when there are live aliens.
+        """
+        return (self._ox + self._colX[self._left],
+            self._ox + self._colX[self._right])
+
+
+    def belowLine(self, line):
+        """
+        Returns True if the bottom of a live alien is at or below line
+
+        Like Wave.alienLine, this uses ALIEN_WIDTH/2 for half the height.
+
+        Parameter line: the y-coordinate of the line
+        Precondition: line is a number
+        """
+        if self._count == 0:
+            return False
+        return self._oy + self._rowY[self._bottom] - ALIEN_WIDTH/2 <= line
+
+
+    def hit(self, points):
+        """
+        Returns the (row, col) of the first live alien containing a point
+
+        The slots are checked in row order, bottom row first. The test is the
+        same one as GObject.contains. If no live alien contains any of the
+        points, this method returns None.
+
+        The formation is a regular lattice, so a point can only be inside
+        the one slot whose row and column are nearest to it. That slot is
+        found arithmetically, and only its alive bit is checked.
+
+        Parameter points: the points to test
+        Precondition: points is a list of (x, y) tuples
+        """
+        x0 = self._ox
+        y0 = self._oy
+        best = None
+        for px, py in points:
+            col = round((px - x0)/(ALIEN_WIDTH + ALIEN_H_SEP))
+            row = round((py - y0)/(ALIEN_HEIGHT + ALIEN_V_SEP))
+            if not (0 <= row < self._rows and 0 <= col < self._cols):
+                continue
+            if not self._colBits[col] >> row & 1:
+                continue
+            if abs(px - x0 - col*(ALIEN_WIDTH + ALIEN_H_SEP)) < ALIEN_WIDTH/2 \
+                    and abs(py - y0 - row*(ALIEN_HEIGHT + ALIEN_V_SEP)) < \
+                    ALIEN_HEIGHT/2:
+                if best is None or (row, col) < best:
+                    best = (row, col)
+        return best
+
+
+    def fork(self):
+        """
+        Returns a copy of this formation that can change on its own
+
+        The offsets and images are shared. The alive mask is shared until
+        one of the two formations kills an alien.
+        """
+        clone = Formation.__new__(Formation)
+        clone.__dict__.update(self.__dict__)
+        clone._colBits = self._colBits[:]
+        clone._columns = self._columns[:]
+        clone._colIndex = self._colIndex[:]
+        clone._rowCount = self._rowCount[:]
+        clone._ownsAlive = False
+        self._ownsAlive = False
+        return clone
+
+
+    # MUTATORS
+    def march(self, dx, dy):
+        """
+        Moves every alien by (dx, dy)
+
+        Only the origin moves; the offsets of the slots never change.
+
+        Parameter dx: the horizontal distance to move
+        Precondition: dx is a number
+
+        Parameter dy: the vertical distance to move
+        Precondition: dy is a number
+        """
+        self._ox += dx
+        self._oy += dy
+
+
+    def kill(self, row, col):
+        """
+        Kills the alien in the given slot
+
+        Parameter row: the row of the slot (0 is the bottom row)
+        Precondition: row is an int with 0 <= row < rows
+
+        Parameter col: the column of the slot
+        Precondition: col is an int with 0 <= col < cols
+        """
+        if not self._colBits[col] >> row & 1:
+            return
+        if not self._ownsAlive:
+            self._alive = self._alive.copy()
+            self._ownsAlive = True
+        self._alive[row, col] = False
+        self._colBits[col] &= ~(1 << row)
+        self._count -= 1
+        self._rowCount[row] -= 1
+        if self._count > 0:
+            # the edges only move inwards, so this is O(1) amortized
+            while self._rowCount[self._bottom] == 0:
+                self._bottom += 1
+            while self._colBits[self._left] == 0:
+                self._left += 1
+            while self._colBits[self._right] == 0:
+                self._right -= 1
+        if self._colBits[col] == 0:
+            # swap-remove the column from the list of non-empty columns
+            i = self._colIndex[col]
+            last = self._columns.pop()
+            if last != col:
+                self._columns[i] = last
+                self._colIndex[last] = i
+
+
+    def restore(self, origin, alive, columns):
+        """
+        Sets the origin and the live aliens, as saved by a snapshot
+
+        The bitboard index, the counts and the edges are rebuilt from alive.
+        The order of columns matters: it decides which alien shooter picks.
+
+        Parameter origin: the center (x, y) of the slot (0, 0)
+        Precondition: origin is a tuple of two numbers
+
+        Parameter alive: the alive mask
+        Precondition: alive is a bool array of shape (rows, cols)
+
+        Parameter columns: the non-empty columns, in the order of getColumns
+        Precondition: columns is a list of the columns with a live alien
+        """
+        self._ox, self._oy = float(origin[0]), float(origin[1])
+        self._alive = np.array(alive, dtype=bool).reshape(self._rows,
+            self._cols)
+        self._ownsAlive = True
+        weights = 1 << np.arange(self._rows, dtype=object).reshape(-1, 1)
+        self._colBits = [int(bits) for bits in (self._alive*weights).sum(0)]
+        self._columns = [int(col) for col in columns]
+        for i, col in enumerate(self._columns):
+            self._colIndex[col] = i
+        self._rowCount = self._alive.sum(1).tolist()
+        self._count = sum(self._rowCount)
+        if self._count > 0:
+            cols = np.flatnonzero(self._alive.any(0))
+            self._left = int(cols[0])
+            self._right = int(cols[-1])
+            self._bottom = int(np.flatnonzero(self._alive.any(1))[0])
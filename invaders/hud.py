@@ -0,0 +1,231 @@
+"""
+HUD module for Alien Invaders
+
+This module contains the class Hud, the text drawn on top of the game: the
+score, the lives, the logo, the firing instructions and the message in the
+middle of the screen (like "Press enter to start").
+
+Changing the text of a GLabel makes Kivy render its texture again, and
+making a new GLabel renders a new one. So the Hud only changes the score
+and lives labels when their values change, and every other label comes
+from a LabelCache, which makes one GLabel per (text, size, position) and
+reuses it. When nothing changes, a frame renders no text at all.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+from consts import GAME_WIDTH, GAME_HEIGHT
+from game2d import *
+
+# PRIMARY RULE: Hud can only be accessed by Invaders via its methods
+
+
+class LabelCache(object):
+    """
+    A class representing the labels made so far, shared by text and place.
+
+    A label from the cache must not have its text changed, as other callers
+    may be drawing it.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _labels: the labels made so far
+    # Invariant: _labels is a dictionary from (text, size, x, y) tuples to
+    # GLabel objects with that text, font size and position, in HUD_FONT
+
+    def __init__(self):
+        """
+        Initializes an empty cache
+        """
+        self._labels = {}
+
+
+    def __len__(self):
+        """
+        Returns the number of labels made so far
+        """
+        return len(self._labels)
+
+
+    def get(self, text, size, x, y):
+        """
+        Returns the label with the given text, font size and position
+
+        Parameter text: the text of the label
+        Precondition: text is a string
+
+        Parameter size: the font size
+        Precondition: size is an int > 0
+
+        Parameter x, y: the center of the label
+        Precondition: x, y are numbers (int or float)
+        """
+        key = (text, size, x, y)
+        label = self._labels.get(key)
+        if label is None:
+            label = GLabel(text=text, font_size=size, left=5, bottom=5, x=x,
+                y=y, font_name=HUD_FONT)
+            self._labels[key] = label
+        return label
+
+
+class Hud(object):
+    """
+    A class representing the text on top of the game.
+
+    The score and lives are set every frame with setScore and setLives, but
+    their labels only change when the values do. The message, logo and
+    instructions are shown and hidden with the other setters.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _cache: the labels that do not change
+    # Invariant: _cache is a LabelCache
+    #
+    # Attribute _score: the score label
+    # Invariant: _score is a GLabel object
+    #
+    # Attribute _scoreValue: the score shown by _score
+    # Invariant: _scoreValue is an int, or None once the final score is shown
+    #
+    # Attribute _life: the lives label
+    # Invariant: _life is a GLabel object, or None if hidden
+    #
+    # Attribute _lives: the lives shown by _life
+    # Invariant: _lives is an int >= 0
+    #
+    # Attribute _logo: the logo label
+    # Invariant: _logo is a GLabel object, or None if hidden
+    #
+    # Attribute _inst: the firing instructions
+    # Invariant: _inst is a GLabel object, or None if hidden
+    #
+    # Attribute _text: the message in the middle of the screen
+    # Invariant: _text is a GLabel object, or None if there is no message
+
+    def __init__(self, lives):
+        """
+        Initializes the HUD with a score of 0 and the given lives
+
+        Parameter lives: the lives of the player
+        Precondition: lives is an int >= 0
+        """
+        self._cache = LabelCache()
+        self._scoreValue = 0
+        self._score = GLabel(text="Player's score: 0", font_size=40, left=5,
+            bottom=5, x=GAME_WIDTH - 200, y=30, font_name=HUD_FONT)
+        self._lives = lives
+        self._life = GLabel(text=f"Lives: {lives}", font_size=60, left=5,
+            bottom=5, x=120, y=24*GAME_HEIGHT/25, font_name=HUD_FONT)
+        self._logo = self._cache.get("War Against Humanity", 60, GAME_WIDTH/2,
+            24*GAME_HEIGHT/25)
+        self._inst = None
+        self._text = None
+
+
+    def setScore(self, score):
+        """
+        Shows score in the score label, if it is not shown already
+
+        Parameter score: the score of the player
+        Precondition: score is an int (it is negative once the ships lost
+        cost more than the aliens killed earned)
+        """
+        if self._scoreValue is not None and score != self._scoreValue:
+            self._scoreValue = score
+            self._score.text = f"Player's score: {score}"
+
+
+    def setLives(self, lives):
+        """
+        Shows lives in the lives label, if it is not shown already
+
+        Parameter lives: the lives of the player
+        Precondition: lives is an int >= 0
+        """
+        if lives != self._lives and self._life is not None:
+            self._lives = lives
+            self._life.text = f"lives: {lives}"
+
+
+    def setMessage(self, text, size=60, y=None):
+        """
+        Shows text in the middle of the screen (or nothing if text is None)
+
+        Parameter text: the message
+        Precondition: text is a string or None
+
+        Parameter size: the font size
+        Precondition: size is an int > 0
+
+        Parameter y: the vertical center of the message (GAME_HEIGHT/2 if None)
+        Precondition: y is a number or None
+        """
+        if text is None:
+            self._text = None
+        else:
+            y = GAME_HEIGHT/2 if y is None else y
+            self._text = self._cache.get(text, size, GAME_WIDTH/2, y)
+
+
+    def hasMessage(self):
+        """
+        Returns True if a message is shown
+        """
+        return self._text is not None
+
+
+    def showInstructions(self, show):
+        """
+        Shows or hides the firing instructions
+
+        Parameter show: whether to show them
+        Precondition: show is a boolean
+        """
+        self._inst = None
+        if show:
+            self._inst = self._cache.get("Press spacebar to fire", 30,
+                GAME_WIDTH/2, DEFENSE_LINE+20)
+
+
+    def hideLives(self):
+        """
+        Hides the lives label
+        """
+        self._life = None
+
+
+    def hideLogo(self):
+        """
+        Hides the logo
+        """
+        self._logo = None
+
+
+    def showFinalScore(self, score):
+        """
+        Shows score in large text near the bottom of the screen
+
+        Parameter score: the final score of the player
+        Precondition: score is an int (it may be negative, see setScore)
+        """
+        self._scoreValue = None
+        self._score = self._cache.get(f"Player's score: {score}", 60,
+            GAME_WIDTH/2, 120)
+
+
+    def draw(self, view):
+        """
+        Draws the HUD to view
+
+        Parameter view: the game view, used in drawing
+        Precondition: view is an instance of GView
+        """
+        if self._text is not None:
+            self._text.draw(view)
+        if self._logo is not None:
+            self._logo.draw(view)
+        if self._life is not None:
+            self._life.draw(view)
+        self._score.draw(view)
+        if self._inst is not None:
+            self._inst.draw(view)
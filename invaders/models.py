@@ -28,9 +28,6 @@ about whether to make a new class or not, please ask on Piazza.
 from consts import *
 from game2d import *
 import random
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from introcs.geom import Point2, Matrix
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other
 # than consts.py.  If you need extra information from Gameplay, then it should
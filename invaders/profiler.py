@@ -0,0 +1,230 @@
+"""
+Frame profiler module for Alien Invaders
+
+This module contains an opt-in profiler for the game loop. It keeps the last
+PROFILE_WINDOW samples of every metric in a ring buffer: the time spent in
+each phase of a wave update (moving the ship, marching and firing, firing
+the ship bolt, moving the bolts), the time spent drawing, the time of a whole
+frame, and the number of aliens and bolts on screen. From these it reports
+the mean and the 50th, 90th and 99th percentiles.
+
+Profiling is turned on by setting the environment variable INVADERS_PROFILE
+to a file name ending in .csv or .json. The summary is written to that file
+when the game exits. When the variable is not set, no profiler is made, and
+the only cost left in the game loop is a check that the profiler is None.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+import atexit
+import json
+import os
+import time
+
+# the clock used for every timer
+clock = time.perf_counter
+
+
+class RingBuffer(object):
+    """
+    A class representing a fixed-size buffer of the latest samples.
+
+    Once the buffer is full, every new sample replaces the oldest one.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _data: the samples (in no particular order)
+    # Invariant: _data is a list of numbers with len(_data) <= _size
+    #
+    # Attribute _size: the most samples to keep
+    # Invariant: _size is an int > 0
+    #
+    # Attribute _next: the position of the next sample once the buffer is full
+    # Invariant: _next is an int with 0 <= _next < _size
+    #
+    # Attribute _total: the number of samples ever added
+    # Invariant: _total is an int >= 0
+
+    def __init__(self, size):
+        """
+        Initializes an empty buffer for up to size samples
+
+        Parameter size: the most samples to keep
+        Precondition: size is an int > 0
+        """
+        self._data = []
+        self._size = size
+        self._next = 0
+        self._total = 0
+
+
+    def __len__(self):
+        """
+        Returns the number of samples in the buffer
+        """
+        return len(self._data)
+
+
+    def total(self):
+        """
+        Returns the number of samples ever added (including dropped ones)
+        """
+        return self._total
+
+
+    def add(self, value):
+        """
+        Adds a sample, dropping the oldest one if the buffer is full
+
+        Parameter value: the sample
+        Precondition: value is a number
+        """
+        self._total += 1
+        if len(self._data) < self._size:
+            self._data.append(value)
+        else:
+            self._data[self._next] = value
+            self._next = (self._next + 1) % self._size
+
+
+    def summary(self):
+        """
+        Returns a dictionary with the statistics of the samples
+
+        The keys are 'samples', 'mean', 'p50', 'p90', 'p99' and 'max'. The
+        buffer must not be empty.
+        """
+        data = sorted(self._data)
+        n = len(data)
+        def percentile(p):
+            return data[min(n-1, int(p*n/100))]
+        return {'samples': self._total, 'mean': sum(data)/n,
+            'p50': percentile(50), 'p90': percentile(90),
+            'p99': percentile(99), 'max': data[-1]}
+
+
+class Profiler(object):
+    """
+    A class representing a profiler of named timers and counters.
+
+    Timers are recorded in seconds and reported in milliseconds. Counters
+    (like the number of aliens) are reported as they are.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _window: the number of samples kept per metric
+    # Invariant: _window is an int > 0
+    #
+    # Attribute _timers: the samples of every timer
+    # Invariant: _timers is a dictionary from strings to RingBuffers
+    #
+    # Attribute _counters: the samples of every counter
+    # Invariant: _counters is a dictionary from strings to RingBuffers
+
+    def __init__(self, window=PROFILE_WINDOW):
+        """
+        Initializes a profiler with no metrics
+
+        Parameter window: the number of samples kept per metric
+        Precondition: window is an int > 0
+        """
+        self._window = window
+        self._timers = {}
+        self._counters = {}
+
+
+    def time(self, name, seconds):
+        """
+        Records a sample of the timer name
+
+        Parameter name: the name of the timer
+        Precondition: name is a string
+
+        Parameter seconds: the time measured
+        Precondition: seconds is a number >= 0
+        """
+        buffer = self._timers.get(name)
+        if buffer is None:
+            buffer = self._timers[name] = RingBuffer(self._window)
+        buffer.add(seconds)
+
+
+    def count(self, name, value):
+        """
+        Records a sample of the counter name
+
+        Parameter name: the name of the counter
+        Precondition: name is a string
+
+        Parameter value: the value counted
+        Precondition: value is a number
+        """
+        buffer = self._counters.get(name)
+        if buffer is None:
+            buffer = self._counters[name] = RingBuffer(self._window)
+        buffer.add(value)
+
+
+    def summary(self):
+        """
+        Returns a list of dictionaries, one per metric
+
+        Every dictionary has the keys of RingBuffer.summary, plus 'metric'
+        (the name) and 'unit' ('ms' for timers, 'count' for counters).
+        """
+        rows = []
+        for name in sorted(self._timers):
+            row = {'metric': name, 'unit': 'ms'}
+            for key, value in self._timers[name].summary().items():
+                row[key] = value if key == 'samples' else value*1000
+            rows.append(row)
+        for name in sorted(self._counters):
+            row = {'metric': name, 'unit': 'count'}
+            row.update(self._counters[name].summary())
+            rows.append(row)
+        return rows
+
+
+    def export(self, path):
+        """
+        Writes the summary to path, as JSON if path ends in .json, else CSV
+
+        Parameter path: the name of the file to write
+        Precondition: path is a string
+        """
+        rows = self.summary()
+        with open(path, 'w') as file:
+            if path.lower().endswith('.json'):
+                json.dump(rows, file, indent=2)
+                return
+            keys = ('metric', 'unit', 'samples', 'mean', 'p50', 'p90', 'p99',
+                'max')
+            file.write(','.join(keys) + '\n')
+            for row in rows:
+                file.write(','.join(_format(row[key]) for key in keys) + '\n')
+
+
+def profilerFromEnvironment():
+    """
+    Returns a new Profiler if INVADERS_PROFILE is set, and None otherwise
+
+    The profiler is exported to the file named by INVADERS_PROFILE when the
+    program exits.
+    """
+    path = os.environ.get('INVADERS_PROFILE', '').strip()
+    if path == '':
+        return None
+    profiler = Profiler()
+    atexit.register(profiler.export, path)
+    return profiler
+
+
+def _format(value):
+    """
+    Returns value as a string for a CSV cell
+
+    Parameter value: the value to format
+    Precondition: value is a string or a number
+    """
+    if isinstance(value, float):
+        return f'{value:.4f}'
+    return str(value)
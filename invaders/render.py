@@ -0,0 +1,128 @@
+"""
+Retained rendering module for Alien Invaders
+
+This module contains the class FormationBatch, which draws the whole alien
+formation as one retained Kivy InstructionGroup. The group holds one
+textured Rectangle per alien, all under a single shared Translate:
+
+    PushMatrix
+    Translate(dx, dy)           how far the formation has marched
+    Rectangle, Rectangle, ...   one per live alien, at its starting place
+    PopMatrix
+
+The group is built once per wave. A march step only changes the Translate,
+and a kill removes one Rectangle, so drawing the formation is one call to
+GView.draw no matter how many aliens there are. Without it, every alien
+was a GImage that had to be moved and drawn on its own every frame.
+
+The rectangles are textured with regions of the sprite atlas (assets.py),
+so the whole formation is drawn from a single texture.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+from assets import getAtlas
+from kivy.graphics import Color, InstructionGroup, PopMatrix, PushMatrix
+from kivy.graphics import Rectangle, Translate
+
+
+class FormationBatch(object):
+    """
+    A class representing the retained drawing of a formation of aliens.
+
+    The batch is a view of a Formation (see formation.py). It must be told
+    about every kill, with kill, and synced with sync before it is drawn.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _group: the retained instructions of the formation
+    # Invariant: _group is a Kivy InstructionGroup
+    #
+    # Attribute _shift: the translation shared by every alien
+    # Invariant: _shift is a Kivy Translate
+    #
+    # Attribute _rects: the rectangle of every slot
+    # Invariant: _rects is a rectangular 2d list of Kivy Rectangles (bottom
+    # row first), with None for the slots that were removed
+    #
+    # Attribute _start: the center of the slot (0, 0) when the batch was made
+    # Invariant: _start is a (x, y) tuple of floats
+
+    def __init__(self, formation):
+        """
+        Initializes the batch from the current state of formation
+
+        Parameter formation: the formation to draw
+        Precondition: formation is a Formation object
+        """
+        atlas = getAtlas()
+        textures = [atlas.getRegion(name) for name in ALIEN_IMAGES]
+        images = formation.getImage()
+        self._start = formation.getOrigin()
+        self._group = InstructionGroup()
+        self._group.add(PushMatrix())
+        self._shift = Translate(0, 0)
+        self._group.add(self._shift)
+        self._group.add(Color(1, 1, 1, 1))
+        self._rects = []
+        for row in range(formation.getRows()):
+            rects = []
+            for col in range(formation.getCols()):
+                rect = None
+                if formation.isAlive(row, col):
+                    x, y = formation.position(row, col)
+                    rect = Rectangle(texture=textures[images[row, col]],
+                        pos=(x - ALIEN_WIDTH/2, y - ALIEN_HEIGHT/2),
+                        size=(ALIEN_WIDTH, ALIEN_HEIGHT))
+                    self._group.add(rect)
+                rects.append(rect)
+            self._rects.append(rects)
+        self._group.add(PopMatrix())
+
+
+    def kill(self, row, col):
+        """
+        Removes the alien in the given slot from the drawing
+
+        Parameter row: the row of the slot (0 is the bottom row)
+        Precondition: row is an int with 0 <= row < rows
+
+        Parameter col: the column of the slot
+        Precondition: col is an int with 0 <= col < cols
+        """
+        rect = self._rects[row][col]
+        if rect is not None:
+            self._group.remove(rect)
+            self._rects[row][col] = None
+
+
+    def sync(self, formation):
+        """
+        Moves the shared translation to where the formation is now
+
+        Parameter formation: the formation this batch was made from
+        Precondition: formation is a Formation object
+        """
+        self.moveTo(formation.getOrigin())
+
+
+    def moveTo(self, origin):
+        """
+        Moves the shared translation so that the slot (0, 0) is at origin
+
+        Parameter origin: the center of the slot (0, 0)
+        Precondition: origin is a (x, y) tuple of numbers
+        """
+        x, y = origin
+        self._shift.xy = (x - self._start[0], y - self._start[1])
+
+
+    def draw(self, view):
+        """
+        Draws the formation to view
+
+        Parameter view: the game view, used in drawing
+        Precondition: view is an instance of GView
+        """
+        view.draw(self._group)
+
@@ -0,0 +1,483 @@
+"""
+Recording and replay module for Alien Invaders
+
+This module records a game so that it can be played again exactly, and
+replays recordings headlessly, as fast as the simulation can run.
+
+A wave only depends on its random seed, its size, the size of the screen
+and the input of every tick (see WaveSim). A Recording keeps these, plus
+the lives of the player and the outcome of the game (score, win or loss,
+lives left). Every tick of input is one byte:
+
+    bit 0   left is held down
+    bit 1   right is held down
+    bit 2   spacebar is held down
+    bit 3   enter was pressed to continue after losing a ship
+
+Recording is turned on by setting the environment variable INVADERS_RECORD
+to a file name; the recording is written to that file when the game exits.
+The variable INVADERS_SEED may be set to play a wave with a given seed.
+
+The file is a fixed header (HEADER and OUTCOME below) followed by the
+input bytes compressed with zlib. Held keys repeat for many ticks, so a
+minute of play takes a few hundred bytes. To replay recordings, and check
+that they end with the recorded outcome, run (from the folder that
+contains the invaders folder)
+
+    python invaders/replay.py FILE [FILE ...]
+
+The script exits with status 1 if any replay does not match.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+import argparse
+import atexit
+import os
+import struct
+import sys
+import time
+import zlib
+from sim import WaveSim
+from driver import Game
+
+# PRIMARY RULE: This module may only access consts.py, sim.py and driver.py.
+# It must never import game2d, kivy or any other module that needs a display.
+
+# the bits of an input byte
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
+INPUT_ENTER = 8
+
+# the first bytes of a recording file
+MAGIC = b'INVR'
+
+# the version of the file format
+VERSION = 1
+
+# magic, version, seed, rows, cols, speed, tick rate, width, height, lives
+HEADER = struct.Struct('<4sBQHHdHHHB')
+
+# has an outcome, score, ticks, won, lives left
+OUTCOME = struct.Struct('<BiIBB')
+
+
+class Recording(object):
+    """
+    A class representing the seed, settings and input of a recorded game.
+
+    A recording is made in three steps: begin (when the wave is made),
+    record (every tick) and finish (when the game is over). A recording of
+    a game that was quit early has no outcome.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _seed: the seed of the wave
+    # Invariant: _seed is an int >= 0, or None before begin if no seed was
+    # asked for
+    #
+    # Attribute _rows, _cols: the size of the wave
+    # Invariant: _rows, _cols are ints >= 0 (0 before begin)
+    #
+    # Attribute _speed: the seconds between alien steps at the start
+    # Invariant: _speed is a float >= 0 (0 before begin)
+    #
+    # Attribute _rate: the simulation ticks per second
+    # Invariant: _rate is an int > 0
+    #
+    # Attribute _width, _height: the size of the screen
+    # Invariant: _width, _height are ints >= 0 (0 before begin)
+    #
+    # Attribute _lives: the lives of the player at the start
+    # Invariant: _lives is an int > 0
+    #
+    # Attribute _inputs: the input of every tick, one byte per tick
+    # Invariant: _inputs is a bytearray
+    #
+    # Attribute _outcome: how the game ended
+    # Invariant: _outcome is a dictionary (see Replayer.outcome), or None if
+    # the game is not over
+
+    def __init__(self, lives=SHIP_LIVES, seed=None):
+        """
+        Initializes an empty recording
+
+        Parameter lives: the lives of the player at the start
+        Precondition: lives is an int > 0
+
+        Parameter seed: the seed to play the wave with (random if None)
+        Precondition: seed is an int >= 0 or None
+        """
+        self._seed = seed
+        self._rows = 0
+        self._cols = 0
+        self._speed = 0.0
+        self._rate = SIM_TICK_RATE
+        self._width = 0
+        self._height = 0
+        self._lives = lives
+        self._inputs = bytearray()
+        self._outcome = None
+
+
+    @classmethod
+    def fromFields(cls, seed, rows, cols, speed, rate, width, height, lives,
+            inputs, outcome=None):
+        """
+        Returns a recording with the given settings, input and outcome, as
+        read from a file
+
+        Parameter seed: the seed of the wave
+        Precondition: seed is an int >= 0
+
+        Parameter rows, cols: the size of the wave
+        Precondition: rows, cols are ints >= 0
+
+        Parameter speed: the seconds between alien steps at the start
+        Precondition: speed is a float >= 0
+
+        Parameter rate: the simulation ticks per second
+        Precondition: rate is an int > 0
+
+        Parameter width, height: the size of the screen
+        Precondition: width, height are ints >= 0
+
+        Parameter lives: the lives of the player at the start
+        Precondition: lives is an int > 0
+
+        Parameter inputs: the input of every tick, one byte per tick
+        Precondition: inputs is a bytes-like object
+
+        Parameter outcome: how the game ended (see Replayer.outcome)
+        Precondition: outcome is a dictionary with the keys 'score',
+        'ticks', 'won' and 'lives', or None if the game is not over
+        """
+        recording = cls(lives, seed)
+        recording._rows = rows
+        recording._cols = cols
+        recording._speed = speed
+        recording._rate = rate
+        recording._width = width
+        recording._height = height
+        recording._inputs = bytearray(inputs)
+        recording._outcome = None if outcome is None else dict(outcome)
+        return recording
+
+
+    def getSeed(self):
+        """
+        Returns the seed of the wave (None before begin if no seed was set)
+        """
+        return self._seed
+
+
+    def getLives(self):
+        """
+        Returns the lives of the player at the start
+        """
+        return self._lives
+
+
+    def getRate(self):
+        """
+        Returns the simulation ticks per second
+        """
+        return self._rate
+
+
+    def getInputs(self):
+        """
+        Returns the input of every tick as bytes
+        """
+        return bytes(self._inputs)
+
+
+    def getOutcome(self):
+        """
+        Returns the recorded outcome, or None if the game was not finished
+        """
+        return None if self._outcome is None else dict(self._outcome)
+
+
+    def begin(self, sim, rate):
+        """
+        Records the settings of a new wave
+
+        Parameter sim: the wave, before its first tick
+        Precondition: sim is a WaveSim object
+
+        Parameter rate: the simulation ticks per second
+        Precondition: rate is an int > 0
+        """
+        self._seed = sim.getSeed()
+        formation = sim.getFormation()
+        self._rows = formation.getRows()
+        self._cols = formation.getCols()
+        self._speed = sim.getSpeed()
+        self._rate = int(rate)
+        self._width = int(sim.getWidth())
+        self._height = int(sim.getHeight())
+        self._inputs = bytearray()
+        self._outcome = None
+
+
+    def record(self, left, right, fire, enter=False):
+        """
+        Records the input of one tick
+
+        Parameter left, right, fire: the keys held down
+        Precondition: left, right, fire are booleans
+
+        Parameter enter: whether enter was pressed to continue before the tick
+        Precondition: enter is a boolean
+        """
+        self._inputs.append(left*INPUT_LEFT | right*INPUT_RIGHT |
+            fire*INPUT_FIRE | enter*INPUT_ENTER)
+
+
+    def finish(self, score, won, lives):
+        """
+        Records the outcome of the game
+
+        Parameter score: the final score
+        Precondition: score is an int
+
+        Parameter won: whether the player won
+        Precondition: won is a boolean
+
+        Parameter lives: the lives left
+        Precondition: lives is an int >= 0
+        """
+        self._outcome = {'score': score, 'ticks': len(self._inputs),
+            'won': bool(won), 'lives': lives}
+
+
+    def makeSim(self):
+        """
+        Returns a new WaveSim with the settings of this recording
+        """
+        return WaveSim(rows=self._rows, cols=self._cols, speed=self._speed,
+            width=self._width, height=self._height, seed=self._seed)
+
+
+    def toBytes(self):
+        """
+        Returns this recording in the file format
+        """
+        header = HEADER.pack(MAGIC, VERSION, self._seed, self._rows,
+            self._cols, self._speed, self._rate, self._width, self._height,
+            self._lives)
+        if self._outcome is None:
+            outcome = OUTCOME.pack(0, 0, 0, 0, 0)
+        else:
+            outcome = OUTCOME.pack(1, self._outcome['score'],
+                self._outcome['ticks'], self._outcome['won'],
+                self._outcome['lives'])
+        return header + outcome + zlib.compress(bytes(self._inputs), 9)
+
+
+    def save(self, path):
+        """
+        Writes this recording to the file path
+
+        Nothing is written if the wave never started.
+
+        Parameter path: the name of the file
+        Precondition: path is a string
+        """
+        if self._rows == 0:
+            return
+        with open(path, 'wb') as file:
+            file.write(self.toBytes())
+
+
+class Replayer(object):
+    """
+    A class representing a recording being played back headlessly.
+
+    Every call to step plays one recorded tick, following the rules of
+    Invaders (see Game in driver.py): a lost ship costs a life, the next
+    tick respawns it (the recorded enter), and the game is over when the
+    wave is won, the line is breached, or the last life is lost.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _inputs: the recorded input
+    # Invariant: _inputs is a bytes object
+    #
+    # Attribute _game: the game being played
+    # Invariant: _game is a Game object that respawns only on a recorded
+    # enter, with at most len(_inputs) ticks played
+    #
+    # Attribute _tick: the length of a tick in seconds
+    # Invariant: _tick is a float > 0
+
+    def __init__(self, recording):
+        """
+        Initializes a replay of recording from its first tick
+
+        Parameter recording: the recording to play
+        Precondition: recording is a Recording that was begun
+        """
+        self._inputs = recording.getInputs()
+        self._game = Game(recording.makeSim(), recording.getLives(),
+            respawn=False)
+        self._tick = 1/recording.getRate()
+
+
+    def getSim(self):
+        """
+        Returns the wave being played
+        """
+        return self._game.getSim()
+
+
+    def isDone(self):
+        """
+        Returns True if the game is over or every recorded tick was played
+        """
+        game = self._game
+        return game.isOver() or game.getTicks() == len(self._inputs)
+
+
+    def step(self):
+        """
+        Plays the next recorded tick, and returns False if there was none
+        """
+        if self.isDone():
+            return False
+        game = self._game
+        code = self._inputs[game.getTicks()]
+        if code & INPUT_ENTER and game.getSim().getShipDies():
+            game.respawn()
+        game.update(self._tick, bool(code & INPUT_LEFT),
+            bool(code & INPUT_RIGHT), bool(code & INPUT_FIRE))
+        return True
+
+
+    def outcome(self):
+        """
+        Returns a dictionary of how the game went so far
+
+        The keys are 'score', 'ticks', 'won' and 'lives'.
+        """
+        game = self._game
+        return {'score': game.getSim().getScore(), 'ticks': game.getTicks(),
+            'won': game.isWon(), 'lives': game.getLives()}
+
+
+def readRecording(data):
+    """
+    Returns the Recording stored in data
+
+    Parameter data: a recording in the file format
+    Precondition: data is a bytes object
+    """
+    fields = HEADER.unpack_from(data)
+    if fields[0] != MAGIC:
+        raise ValueError('not an Alien Invaders recording')
+    if fields[1] != VERSION:
+        raise ValueError(f'unsupported recording version {fields[1]}')
+    seed, rows, cols, speed, rate, width, height, lives = fields[2:]
+    has, score, ticks, won, left = OUTCOME.unpack_from(data, HEADER.size)
+    inputs = zlib.decompress(data[HEADER.size + OUTCOME.size:])
+    outcome = None
+    if has:
+        outcome = {'score': score, 'ticks': ticks, 'won': bool(won),
+            'lives': left}
+    return Recording.fromFields(seed, rows, cols, speed, rate, width, height,
+        lives, inputs, outcome)
+
+
+def loadRecording(path):
+    """
+    Returns the Recording in the file path
+
+    Parameter path: the name of a recording file
+    Precondition: path is a string
+    """
+    with open(path, 'rb') as file:
+        return readRecording(file.read())
+
+
+def replay(recording):
+    """
+    Plays recording to the end and returns its outcome (see Replayer)
+
+    Parameter recording: the recording to play
+    Precondition: recording is a Recording that was begun
+    """
+    replayer = Replayer(recording)
+    while replayer.step():
+        pass
+    return replayer.outcome()
+
+
+def verify(recording):
+    """
+    Plays recording and returns its outcome, if it matches the recorded one
+
+    This raises an AssertionError if the recording has an outcome and the
+    replay does not end with exactly that outcome.
+
+    Parameter recording: the recording to play
+    Precondition: recording is a Recording that was begun
+    """
+    outcome = replay(recording)
+    expected = recording.getOutcome()
+    if expected is not None and outcome != expected:
+        raise AssertionError(f'replay ended with {outcome}, '
+            f'but the recording ended with {expected}')
+    return outcome
+
+
+def recordingFromEnvironment(lives=SHIP_LIVES):
+    """
+    Returns a new Recording if INVADERS_RECORD is set, and None otherwise
+
+    The recording is saved to the file named by INVADERS_RECORD when the
+    program exits. If INVADERS_SEED is set, it is the seed of the wave.
+
+    Parameter lives: the lives of the player at the start
+    Precondition: lives is an int > 0
+    """
+    path = os.environ.get('INVADERS_RECORD', '').strip()
+    if path == '':
+        return None
+    seed = os.environ.get('INVADERS_SEED', '').strip()
+    recording = Recording(lives, int(seed) if seed else None)
+    atexit.register(recording.save, path)
+    return recording
+
+
+def main(argv=None):
+    """
+    Replays the recordings named in argv and returns the exit status
+
+    Parameter argv: the command line arguments (sys.argv[1:] if None)
+    Precondition: argv is a list of strings or None
+    """
+    parser = argparse.ArgumentParser(description='Replay recorded games.')
+    parser.add_argument('files', nargs='+', help='recording files')
+    args = parser.parse_args(argv)
+    status = 0
+    for path in args.files:
+        recording = loadRecording(path)
+        start = time.perf_counter()
+        try:
+            outcome = verify(recording)
+            verdict = 'ok' if recording.getOutcome() else 'no outcome'
+        except AssertionError as e:
+            outcome = replay(recording)
+            verdict = f'MISMATCH ({e})'
+            status = 1
+        took = time.perf_counter() - start
+        speed = outcome['ticks']/took if took > 0 else float('inf')
+        print(f"{path}: score {outcome['score']}, {outcome['ticks']} ticks, "
+            f"{'won' if outcome['won'] else 'lost'}, {outcome['lives']} lives"
+            f"  ({speed:.0f} ticks/s)  {verdict}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
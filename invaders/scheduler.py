@@ -0,0 +1,357 @@
+"""
+Scheduler module for Alien Invaders
+
+This module contains Scheduler, a hierarchical timer wheel that runs timed
+behaviors (the alien steps and bolts of a WaveSim, the ship animation, and
+anything added later, like per-alien fire timers or power-up expiries) on
+simulation ticks.
+
+Time is counted in whole ticks. A timer is due a number of ticks from now,
+and is kept in one of SCHEDULER_LEVELS wheels of SCHEDULER_SLOTS slots:
+
+    level 0     the timers due in the next SCHEDULER_SLOTS ticks, one slot
+                per tick
+    level 1     the timers due in the next SCHEDULER_SLOTS**2 ticks, one
+                slot per SCHEDULER_SLOTS ticks
+    ...         and so on; timers further away wait in an overflow list
+
+Every SCHEDULER_SLOTS ticks, the next slot of level 1 is moved down into
+level 0 (and so on up the levels). A tick only runs the one slot of level 0
+that is due, so it costs as much as the timers that are due, not as much as
+all of the timers there are.
+
+There are three kinds of timers: one-shot (after), repeating (every) and
+coroutine tasks (spawn). A task is a generator that yields the number of
+ticks to wait (or None for one tick), and is sent the time that passed
+while it waited, like the animate coroutine of Ship.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+
+# PRIMARY RULE: This module may only access consts.py. It must never import
+# game2d, kivy or any other module that needs a display.
+
+# the bits of a tick that index the slots of one level
+_BITS = SCHEDULER_SLOTS.bit_length() - 1
+_MASK = SCHEDULER_SLOTS - 1
+
+
+def _order(timer):
+    """
+    Returns the order of timer, the key that sorts a slot
+
+    Parameter timer: the timer
+    Precondition: timer is a Timer object
+    """
+    return timer.order
+
+
+class Timer(object):
+    """
+    A class representing a callback (or a task) waiting in a Scheduler.
+
+    Attribute due: the tick the timer runs at next
+    Invariant: due is an int >= 0
+
+    Attribute period: the ticks between two runs, or None if it runs once
+    Invariant: period is an int > 0 or None
+
+    Attribute callback: the function to call, or None for a task
+    Invariant: callback is a function or None
+
+    Attribute args: the arguments of callback
+    Invariant: args is a tuple
+
+    Attribute task: the coroutine to resume, or None for a callback
+    Invariant: task is a generator or None
+
+    Attribute waited: the ticks a task was asked to wait
+    Invariant: waited is an int > 0
+
+    Attribute active: whether the timer will still run
+    Invariant: active is a boolean
+
+    Attribute order: the number of the timer in the order it was added
+    Invariant: order is an int >= 0
+    """
+    __slots__ = ('due', 'period', 'callback', 'args', 'task', 'waited',
+        'active', 'order')
+
+    def __init__(self, due, period=None, callback=None, args=(), task=None):
+        """
+        Initializes an active timer due at the given tick
+
+        Parameter due: the tick the timer runs at
+        Precondition: due is an int >= 0
+
+        Parameter period: the ticks between two runs (None to run once)
+        Precondition: period is an int > 0 or None
+
+        Parameter callback: the function to call
+        Precondition: callback is a function or None (for a task)
+
+        Parameter args: the arguments of callback
+        Precondition: args is a tuple
+
+        Parameter task: the coroutine to resume
+        Precondition: task is a generator or None (for a callback)
+        """
+        self.due = due
+        self.period = period
+        self.callback = callback
+        self.args = args
+        self.task = task
+        self.waited = 1
+        self.active = True
+        self.order = 0
+
+
+class Scheduler(object):
+    """
+    A class representing a hierarchical timer wheel.
+
+    Method advance moves the wheel on by one tick, and runs every timer that
+    is due at that tick, in the order they were added.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _tick: the last tick that was run
+    # Invariant: _tick is an int >= 0
+    #
+    # Attribute _length: the time a tick stands for, sent to tasks
+    # Invariant: _length is a number > 0
+    #
+    # Attribute _wheels: the slots of every level
+    # Invariant: _wheels is a list of SCHEDULER_LEVELS dictionaries from slot
+    # numbers to lists of Timer objects (empty slots are left out)
+    #
+    # Attribute _overflow: the timers too far away for the top level
+    # Invariant: _overflow is a list of Timer objects
+    #
+    # Attribute _count: the number of active timers
+    # Invariant: _count is an int >= 0
+    #
+    # Attribute _added: the number of timers ever added
+    # Invariant: _added is an int >= 0
+
+    def __init__(self, length=1, tick=0):
+        """
+        Initializes an empty scheduler at the given tick
+
+        Parameter length: the time a tick stands for (sent to tasks)
+        Precondition: length is a number > 0
+
+        Parameter tick: the tick to start at
+        Precondition: tick is an int >= 0
+        """
+        self._tick = tick
+        self._length = length
+        self._wheels = [{} for _ in range(SCHEDULER_LEVELS)]
+        self._overflow = []
+        self._count = 0
+        self._added = 0
+
+
+    def __len__(self):
+        """
+        Returns the number of active timers
+        """
+        return self._count
+
+
+    def getTick(self):
+        """
+        Returns the last tick that was run
+        """
+        return self._tick
+
+
+    def at(self, due, callback, *args):
+        """
+        Calls callback(*args) once at the tick due, and returns its Timer
+
+        Parameter due: the tick to call it at
+        Precondition: due is an int > getTick()
+
+        Parameter callback: the function to call
+        Precondition: callback is a function of args
+        """
+        return self._insert(Timer(due, callback=callback, args=args))
+
+
+    def after(self, ticks, callback, *args):
+        """
+        Calls callback(*args) once, ticks ticks from now, and returns its Timer
+
+        Parameter ticks: the ticks to wait
+        Precondition: ticks is an int > 0
+
+        Parameter callback: the function to call
+        Precondition: callback is a function of args
+        """
+        return self.at(self._tick + ticks, callback, *args)
+
+
+    def every(self, ticks, callback, *args):
+        """
+        Calls callback(*args) every ticks ticks from now on, and returns its
+        Timer
+
+        Parameter ticks: the ticks between two calls
+        Precondition: ticks is an int > 0
+
+        Parameter callback: the function to call
+        Precondition: callback is a function of args
+        """
+        return self._insert(Timer(self._tick + ticks, ticks, callback, args))
+
+
+    def spawn(self, task):
+        """
+        Starts the coroutine task, and returns its Timer
+
+        The task runs at once up to its first yield. After that, it is
+        resumed when the ticks it yielded (one for None) have passed, and is
+        sent the time they stand for. The timer is inactive once the task
+        has finished.
+
+        Parameter task: the coroutine
+        Precondition: task is a generator that yields ints > 0 or None
+        """
+        timer = Timer(self._tick, task=task)
+        timer.order = self._added
+        self._added += 1
+        self._count += 1
+        self._resume(timer, None)
+        return timer
+
+
+    def cancel(self, timer):
+        """
+        Stops timer from running again (a task is closed)
+
+        Parameter timer: a timer of this scheduler
+        Precondition: timer is a Timer object
+        """
+        if timer.active:
+            timer.active = False
+            self._count -= 1
+            if timer.task is not None:
+                timer.task.close()
+
+
+    def advance(self):
+        """
+        Moves on to the next tick, and runs the timers due at it
+        """
+        self._tick += 1
+        tick = self._tick
+        if not tick & _MASK:
+            self._cascade(tick)
+        slot = self._wheels[0].pop(tick & _MASK, None)
+        if slot is None:
+            return
+        if len(slot) > 1:
+            # a timer moved down from a higher level is appended after the
+            # timers put straight into the slot, even if it was added first
+            slot.sort(key=_order)
+        for timer in slot:
+            if not timer.active:
+                continue
+            if timer.task is not None:
+                self._resume(timer, timer.waited*self._length)
+            elif timer.period is None:
+                timer.active = False
+                self._count -= 1
+                timer.callback(*timer.args)
+            else:
+                timer.callback(*timer.args)
+                if timer.active:
+                    timer.due += timer.period
+                    self._place(timer)
+
+
+    # HELPER METHODS
+    def _insert(self, timer):
+        """
+        Adds a new active timer to the wheels, and returns it
+
+        Parameter timer: the timer
+        Precondition: timer is a Timer object with due > getTick()
+        """
+        timer.order = self._added
+        self._added += 1
+        self._count += 1
+        self._place(timer)
+        return timer
+
+
+    def _place(self, timer):
+        """
+        Puts timer in the slot of the lowest level that reaches its due tick
+
+        Parameter timer: the timer
+        Precondition: timer is a Timer object with due > getTick()
+        """
+        delta = timer.due - self._tick
+        shift = 0
+        for wheel in self._wheels:
+            if delta < SCHEDULER_SLOTS << shift:
+                slot = (timer.due >> shift) & _MASK
+                timers = wheel.get(slot)
+                if timers is None:
+                    wheel[slot] = [timer]
+                else:
+                    timers.append(timer)
+                return
+            shift += _BITS
+        self._overflow.append(timer)
+
+
+    def _cascade(self, tick):
+        """
+        Moves the timers of the next slot of every level that turned over
+        down to the levels below
+
+        Parameter tick: the tick just reached
+        Precondition: tick is an int > 0 and a multiple of SCHEDULER_SLOTS
+        """
+        level = 1
+        while level < SCHEDULER_LEVELS and not (tick >> _BITS*level) & _MASK:
+            level += 1
+        if level == SCHEDULER_LEVELS:
+            timers = self._overflow
+            self._overflow = []
+            for timer in timers:
+                if timer.active:
+                    self._place(timer)
+            level -= 1
+        for level in range(level, 0, -1):
+            slot = (tick >> _BITS*level) & _MASK
+            for timer in self._wheels[level].pop(slot, ()):
+                if timer.active:
+                    self._place(timer)
+
+
+    def _resume(self, timer, sent):
+        """
+        Runs the task of timer up to its next yield, and puts it back
+
+        Parameter timer: the timer of a task
+        Precondition: timer is an active Timer object with a task
+
+        Parameter sent: the value to send to the task
+        Precondition: sent is a number, or None to start the task
+        """
+        try:
+            ticks = timer.task.send(sent)
+        except StopIteration:
+            timer.active = False
+            self._count -= 1
+            return
+        if not timer.active:
+            return
+        timer.waited = 1 if ticks is None else ticks
+        timer.due = self._tick + timer.waited
+        self._place(timer)
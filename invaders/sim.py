@@ -0,0 +1,1080 @@
+"""
+Headless simulation module for Alien Invaders
+
+This module contains the simulation core for a single wave of Alien Invaders.
+It has exactly the same rules as the subcontroller Wave (the march of the
+aliens, alien and ship firing, bolt movement, collisions, scoring and the
+win/lose flags), but it does not touch game2d, Kivy or any window. That
+means a wave can be stepped thousands of times per second in a test or a
+batch job on a machine with no display.
+
+The class Wave in wave.py is now only a view adapter: it owns a WaveSim and
+mirrors its state onto game2d objects when the game is drawn.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+from display import getDisplaySize
+from formation import *
+from broadphase import *
+from bolts import *
+from events import *
+from scheduler import Scheduler
+import bisect
+import random
+import time
+
+# PRIMARY RULE: This module may only access consts.py, display.py,
+# formation.py, broadphase.py, bolts.py, events.py and scheduler.py. It must
+# never import game2d, kivy or any other module that needs a display.
+
+# the tuning values of a wave, which the rules of a WaveSim can override:
+# the most alien steps between alien bolts (BOLT_RATE), the points lost with
+# a ship (SHIP_BURSTS), the points of the first kills, the points added to a
+# kill once enough aliens are dead, and that number of aliens as a fraction
+# (1/n) of the wave
+RULES = {'boltRate': BOLT_RATE, 'shipBursts': SHIP_BURSTS, 'alienPoints': 30,
+    'pointsIncrease': 2, 'killsDivisor': 5}
+
+
+class SimShip(object):
+    """
+    A class to represent the player ship in the simulation.
+
+    The ship only needs its position; its size is fixed by the constants
+    SHIP_WIDTH and SHIP_HEIGHT.
+
+    Attribute x: the x-coordinate of the center of the ship
+    Invariant: x is an int or float
+
+    Attribute px: the x-coordinate of the ship before the last tick
+    Invariant: px is an int or float
+
+    Attribute y: the y-coordinate of the center of the ship
+    Invariant: y is an int or float
+    """
+
+    def __init__(self, x, y):
+        """
+        Initializes a ship centered at (x, y)
+
+        Parameter x: the x-coordinate of the center of the ship
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the ship
+        Precondition: y is an int or float
+        """
+        self.x = x
+        self.px = x
+        self.y = y
+
+
+    def move(self, right = True, dt = 1/BASE_RATE):
+        """
+        moves the ship based on the direction
+
+        The ship moves SHIP_MOVEMENT pixels per 1/BASE_RATE seconds.
+
+        Parameter right: direction of the movement of ship
+        Precondition: right is a boolean value
+
+        Parameter dt: the length of the tick in seconds
+        Precondition: dt is a number > 0
+        """
+        if right:
+            self.x+=SHIP_MOVEMENT*BASE_RATE*dt
+        else:
+            self.x-=SHIP_MOVEMENT*BASE_RATE*dt
+
+
+    def collides(self, bolt):
+        """
+        Returns True if the alien bolt collides with this ship
+
+        This method returns False if bolt was fired by the player. It tests
+        the two bottom corners of the bolt.
+
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class SimBolt
+        """
+        if bolt.isPlayerBolt():
+            return False
+        bottom = bolt.y - BOLT_HEIGHT/2
+        return _contains(self.x, self.y, SHIP_WIDTH, SHIP_HEIGHT,
+                bolt.x + BOLT_WIDTH/2, bottom) or \
+            _contains(self.x, self.y, SHIP_WIDTH, SHIP_HEIGHT,
+                bolt.x - BOLT_WIDTH/2, bottom)
+
+
+class WaveSim(object):
+    """
+    This class simulates a single wave of Alien Invaders without a display.
+
+    It follows the rules of Wave.update exactly. Input is passed to update
+    as three booleans (left, right and fire) rather than as a GInput, and
+    nothing is played or drawn. Instead, the events of every update (see
+    events.py) are collected, and can be read with getEvents. Scoring is
+    done at the end of the update, from its events, rather than in the
+    collision loop.
+
+    Every update is one simulation tick. All motion is scaled by dt, so the
+    game runs at the same speed at any tick rate. The positions of the ship
+    and the bolts before the last tick are kept (in px and py) so that a
+    view can interpolate between ticks.
+
+    The size of the wave and the size of the screen can be changed with the
+    initializer, which makes it easy to run stress waves that are larger
+    than the limits allowed in consts.py.
+
+    All randomness comes from the wave's own random number generator, made
+    from the seed given to the initializer (or a random one, see getSeed).
+    Two waves with the same seed, size and input play exactly the same.
+
+    The alien steps and the alien bolts are timers of a Scheduler (see
+    scheduler.py) that moves on one tick per update, except while the ship
+    is blowing up, so a tick with nothing due does no timing work. Time is
+    counted in ticks of the length of the first update. The aliens step at
+    the first tick where the time since the last step is more than _speed,
+    with that time added up tick by tick as an accumulator of dt would add
+    it (the sums are kept in a table, so finding the tick is a lookup). The
+    aliens shoot at the step that makes _step reach _boltRate. Both timers
+    are scheduled again when the speed changes.
+
+    A wave can be forked (see fork) to look ahead at many futures. A fork
+    shares everything that does not change with the wave it came from, and
+    shares the rest until one of them changes it.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _width: the width of the game display
+    # Invariant: _width is an int > 0
+    #
+    # Attribute _height: the height of the game display
+    # Invariant: _height is an int > 0
+    #
+    # Attribute _rows: the number of rows of aliens
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cols: the number of aliens per row
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _ship: the player ship
+    # Invariant: _ship is a SimShip object or None
+    #
+    # Attribute _formation: the aliens in the wave
+    # Invariant: _formation is a Formation object
+    #
+    # Attribute _bolts: the laser bolts currently on screen
+    # Invariant: _bolts is a BoltPool, possibly empty
+    #
+    # Attribute _grid: the broad phase for collisions, with the ship and the
+    # bolts registered where they were at the end of the last update
+    # Invariant: _grid is a SpatialHash; every object in it is the ship or a
+    # live bolt (bolts not moved yet, like new ones, may be missing)
+    #
+    # Attribute _time: the amount of time since the last Alien "step", while
+    # it is not counted in ticks (_stepped is None)
+    # Invariant: _time is a float >= 0s
+    #
+    # Attribute _scheduler: the timers of the wave
+    # Invariant: _scheduler is a Scheduler object
+    #
+    # Attribute _dt: the length of the ticks of _scheduler
+    # Invariant: _dt is a number, or None before the first update
+    #
+    # Attribute _zero: the time since an alien step after k ticks, at
+    # position k, added up as an accumulator of _dt would (extended as
+    # needed, and shared with forks)
+    # Invariant: _zero is a non-empty list of numbers that starts with 0
+    #
+    # Attribute _sums: the time since the last alien step after k ticks
+    # since _stepped, like _zero, but starting with the time at _stepped
+    # Invariant: _sums is _zero, or (if the length of a tick changed or the
+    # state was set since the last step) a non-empty list of numbers
+    #
+    # Attribute _stepped: the tick of _scheduler of the last alien step (or
+    # of the last change of _dt, if that was later)
+    # Invariant: _stepped is an int <= the tick of _scheduler, or None
+    # before the first update (the time since the step is then in _time)
+    #
+    # Attribute _stepTimer: the timer of the next alien step
+    # Invariant: _stepTimer is a Timer of _scheduler, or None if the aliens
+    # do not step
+    #
+    # Attribute _boltTimer: the timer of the next alien bolt, due at a step
+    # Invariant: _boltTimer is a Timer of _scheduler, or None if the aliens
+    # do not step
+    #
+    # Attribute _speed: the number of seconds between alien steps
+    # Invariant: _speed is a float > 0
+    #
+    # Attribute _dying: the time since the ship was hit
+    # Invariant: _dying is a float >= 0s, or None if the ship is not dying
+    #
+    # Attribute _boltRate: the number of ALIEN STEPS (not frames) between bolts
+    # Invariant: _boltRate is an integer greater than 0
+    #
+    # Attribute _step: number of steps taken by aliens
+    # Invariant: _step is an integer greater than or equal to zero
+    #
+    # Attribute _shipDies: A boolean to determine if ship died by collision
+    # Invariant: _shipDies is True (ship died), False (ship hasn't died yet)
+    #
+    # Attribute _playerWins: A boolean to determine if the player won
+    # by killing all aliens
+    # Invariant: _playerWins is True (player won/ all aliens killed) or False
+    #
+    # Attribute _killsReq: number of alien kills required to increase
+    # point per alien
+    # Invariant: _killsReq is an integer greater than or equal to zero
+    #
+    # Attribute _aPIAK: the number of points by which value of one alien kill
+    # is increased
+    # Invariant: _aPIAK is an integer greater than 0
+    #
+    # Attribute _kills: number of aliens killed so far
+    # Invariant: _kills is an integer greater than or equal to zero
+    #
+    # Attribute _alienpoints: the number of points for the next alien kill
+    # Invariant: _alienpoints is an integer greater than zero
+    #
+    # Attribute _score: score of the player
+    # Invariant: _score is an integer (can be negative)
+    #
+    # Attribute _mov: the direction of movement of aliens
+    # Invariant: _mov is either 1 (aliens move right) or -1 (aliens move left)
+    #
+    # Attribute _events: the events of the last update
+    # Invariant: _events is a list of Event objects, in the order they
+    # happened
+    #
+    # Attribute _profiler: the profiler that times the phases of an update
+    # Invariant: _profiler is a Profiler (see profiler.py) or None
+    #
+    # Attribute _seed: the seed of the random number generator
+    # Invariant: _seed is an int >= 0
+    #
+    # Attribute _rng: the random number generator of this wave
+    # Invariant: _rng is a random.Random object
+    #
+    # Attribute _ownsRng: whether _rng belongs to this wave only
+    # Invariant: _ownsRng is a boolean; if False, _rng may be shared with
+    # forks and must not be used until it is copied (see _random)
+    #
+    # Attribute _maxBoltRate: the most alien steps between alien bolts
+    # Invariant: _maxBoltRate is an int > 0
+    #
+    # Attribute _shipBursts: the points lost when the ship is hit
+    # Invariant: _shipBursts is an int >= 0
+
+    # GETTERS AND SETTERS
+    def getPlayerWin(self):
+        """
+        Returns self._playerWins
+        """
+        return self._playerWins
+
+
+    def setPlayerWin(self, value):
+        """
+        Sets self._playerWins to value.
+
+        Parameter value: whether player has won or not
+        Precondition: value is a boolean
+        """
+        self._playerWins = value
+
+
+    def getShipDies(self):
+        """
+        Returns self._shipDies
+        """
+        return self._shipDies
+
+
+    def setShipDies(self, value):
+        """
+        Sets self._shipDies to value
+
+        Parameter value: whether ship is dead or not
+        Precondition: value is a boolean
+        """
+        self._shipDies = value
+
+
+    def getScore(self):
+        """
+        Returns self._score
+        """
+        return self._score
+
+
+    def getShip(self):
+        """
+        Returns the player ship (a SimShip), or None if it was destroyed
+        """
+        return self._ship
+
+
+    def getFormation(self):
+        """
+        Returns the formation of aliens
+
+        The formation should not be modified.
+        """
+        return self._formation
+
+
+    def getBolts(self):
+        """
+        Returns the pool of bolts on screen
+
+        This pool should not be modified.
+        """
+        return self._bolts
+
+
+    def getDying(self):
+        """
+        Returns the time since the ship was hit, or None if it is not dying
+        """
+        return self._dying
+
+
+    def getEvents(self):
+        """
+        Returns the events of the last update, in the order they happened
+
+        Before the first update, these are the events of making (or
+        restoring) the wave: a LineBreached if the aliens start at the line.
+        """
+        return self._events
+
+
+    def setProfiler(self, profiler):
+        """
+        Sets the profiler that times the phases of every update
+
+        Parameter profiler: the profiler, or None to stop profiling
+        Precondition: profiler is a Profiler (see profiler.py) or None
+        """
+        self._profiler = profiler
+
+
+    def getWidth(self):
+        """
+        Returns the width of the simulated display
+        """
+        return self._width
+
+
+    def getHeight(self):
+        """
+        Returns the height of the simulated display
+        """
+        return self._height
+
+
+    def getSeed(self):
+        """
+        Returns the seed of the random number generator of this wave
+        """
+        return self._seed
+
+
+    def getSpeed(self):
+        """
+        Returns the number of seconds between alien steps
+        """
+        return self._speed
+
+
+    def getRules(self):
+        """
+        Returns the rules of this wave that getState does not have
+
+        The dictionary has the keys 'boltRate' and 'shipBursts' (see RULES).
+        The other rules only set the starting values of counters that are
+        part of the state.
+        """
+        return {'boltRate': self._maxBoltRate, 'shipBursts': self._shipBursts}
+
+
+    def getState(self):
+        """
+        Returns a dictionary of the state of this wave that can change
+
+        The dictionary has the counters, flags and timers of the wave, the
+        state of its random number generator ('rng'), the ship ('ship', a
+        tuple (x, px, y) or None) and the live bolts ('bolts', a list of
+        (up, x, y, py) tuples in pool order). The formation is not included;
+        it can be read with getFormation. This is what snapshot.py saves.
+        """
+        ship = self._ship
+        return {'time': self._elapsed(), 'speed': self._speed,
+            'dying': self._dying, 'boltRate': self._boltRate,
+            'step': self._step, 'shipDies': self._shipDies,
+            'playerWins': self._playerWins, 'killsReq': self._killsReq,
+            'aPIAK': self._aPIAK, 'kills': self._kills,
+            'alienpoints': self._alienpoints, 'score': self._score,
+            'mov': self._mov, 'rng': self._rng.getstate(),
+            'ship': None if ship is None else (ship.x, ship.px, ship.y),
+            'bolts': [(bolt.isPlayerBolt(), bolt.x, bolt.y, bolt.py)
+                for bolt in self._bolts]}
+
+
+    def setState(self, state):
+        """
+        Sets the state of this wave that can change from a dictionary
+
+        The formation must be restored first, since the events are reset to
+        those of a new wave (see getEvents).
+
+        Parameter state: the state to restore
+        Precondition: state is a dictionary like the one getState returns
+        """
+        self._time = state['time']
+        self._stepped = None
+        self._speed = state['speed']
+        self._dying = state['dying']
+        self._boltRate = state['boltRate']
+        self._step = state['step']
+        self._shipDies = state['shipDies']
+        self._playerWins = state['playerWins']
+        self._killsReq = state['killsReq']
+        self._aPIAK = state['aPIAK']
+        self._kills = state['kills']
+        self._alienpoints = state['alienpoints']
+        self._score = state['score']
+        self._mov = state['mov']
+        self._rng = random.Random()
+        self._rng.setstate(state['rng'])
+        self._ownsRng = True
+        self._ship = None
+        if state['ship'] is not None:
+            x, px, y = state['ship']
+            self._ship = SimShip(x, y)
+            self._ship.px = px
+        self._bolts.clear()
+        self._grid = SpatialHash()
+        for up, x, y, py in state['bolts']:
+            self._bolts.fire(up, x, y).py = py
+        self._events = [LineBreached()] if self.alienLine() else []
+        if self._dt is not None:
+            self._retime(self._dt)
+
+
+    # INITIALIZER
+    def __init__(self, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW, speed=ALIEN_SPEED,
+            width=None, height=None, seed=None, rules=None):
+        """
+        Initializes a new wave with a ship and a full formation of aliens
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens per row
+        Precondition: cols is an int > 0
+
+        Parameter speed: the number of seconds between alien steps
+        Precondition: speed is a float > 0
+
+        Parameter width: the width of the display (GAME_WIDTH if None)
+        Precondition: width is an int > 0 or None
+
+        Parameter height: the height of the display (GAME_HEIGHT if None)
+        Precondition: height is an int > 0 or None
+
+        Parameter seed: the seed of the random number generator (random if None)
+        Precondition: seed is an int >= 0 or None
+
+        Parameter rules: the tuning values to change from RULES
+        Precondition: rules is a dictionary with some of the keys of RULES,
+        or None
+        """
+        rules = RULES if rules is None else dict(RULES, **rules)
+        if seed is None:
+            seed = random.randrange(2**63)
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._ownsRng = True
+        if width is None or height is None:
+            size = getDisplaySize()
+            width = size[0] if width is None else width
+            height = size[1] if height is None else height
+        self._width = width
+        self._height = height
+        self._rows = rows
+        self._cols = cols
+        self._ship = None
+        self._grid = SpatialHash()
+        self.spawnShip()
+        self._formation = Formation(rows, cols, self._height)
+        self._bolts = BoltPool()
+        self._scheduler = Scheduler()
+        self._time = 0
+        self._dt = None
+        self._zero = [0]
+        self._sums = self._zero
+        self._stepped = None
+        self._stepTimer = None
+        self._boltTimer = None
+        self._speed = speed
+        self._dying = None
+        # alien firings
+        self._maxBoltRate = rules['boltRate']
+        self._shipBursts = rules['shipBursts']
+        self._boltRate = self._rng.randint(1, self._maxBoltRate)
+        self._step = 0
+        # win-lose
+        self._shipDies = False
+        self._playerWins = False
+        # player's score
+        self._killsReq = rows*cols//rules['killsDivisor']
+        self._aPIAK = rules['pointsIncrease']
+        self._kills = 0
+        self._score = 0
+        self._alienpoints = rules['alienPoints']
+        # helper
+        self._mov = 1
+        self._events = [LineBreached()] if self.alienLine() else []
+        self._profiler = None
+
+
+    def addBolt(self, up, x, y):
+        """
+        Adds a bolt centered at (x, y), as if it had just been fired
+
+        This is for benchmarks and tests that need many bolts on screen.
+
+        Parameter up: whether the bolt moves up (was fired by the ship)
+        Precondition: up is a boolean
+
+        Parameter x: the x-coordinate of the center of the bolt
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the bolt
+        Precondition: y is an int or float
+        """
+        self._bolts.fire(up, x, y)
+
+
+    def spawnShip(self):
+        """
+        Creates a new ship at the bottom center of the screen
+        """
+        if self._ship is not None:
+            self._grid.remove(self._ship)
+        self._ship = SimShip(self._width/2, SHIP_BOTTOM+SHIP_HEIGHT/2)
+
+
+    # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
+    def update(self, dt, left=False, right=False, fire=False):
+        """
+        Advances the wave by one tick of dt seconds.
+
+        Parameter dt: The time in seconds since the last update
+        Precondition: dt is a number (int or float)
+
+        Parameter left: whether the left key is held down
+        Precondition: left is a boolean
+
+        Parameter right: whether the right key is held down
+        Precondition: right is a boolean
+
+        Parameter fire: whether the fire key (spacebar) is held down
+        Precondition: fire is a boolean
+        """
+        self._events = []
+        if self._dying is None:
+            if self._profiler is None:
+                self._shipMove(left, right, dt)
+                self._aliensMoveShoot(dt)
+                self._fireBolt(fire)
+                self._updateBolts(dt)
+            else:
+                self._profiledTick(dt, left, right, fire)
+            if self._events:
+                self._scoreEvents()
+            if self.aliensCount() == 0 and not self._playerWins:
+                self._playerWins = True
+                self._events.append(WaveCleared(self._score))
+        else:
+            self._dying += dt
+            if self._dying > DEATH_SPEED:
+                self._dying = None
+                self._ship = None
+                self._shipDies = True
+                self._bolts.clear()
+                self._grid.clear()
+                self._events.append(ShipDestroyed())
+
+
+    def fork(self):
+        """
+        Returns a copy of this wave that plays on independently
+
+        The copy takes a few microseconds. The formation is forked (see
+        Formation.fork), the live bolts and the ship are copied, and the
+        random number generator is shared until one of the two waves needs
+        a random number, which copies it. The fork gets its own scheduler,
+        with the timers of this one. The fork starts with an empty
+        collision grid, which its ship and bolts join on its next update. A
+        fork has no profiler.
+        """
+        clone = WaveSim.__new__(WaveSim)
+        clone.__dict__.update(self.__dict__)
+        clone._formation = self._formation.fork()
+        clone._bolts = self._bolts.fork()
+        clone._grid = SpatialHash()
+        clone._scheduler = Scheduler(tick=self._scheduler.getTick())
+        if self._stepTimer is not None:
+            clone._stepTimer = clone._scheduler.at(self._stepTimer.due,
+                clone._alienStep)
+            clone._boltTimer = clone._scheduler.at(self._boltTimer.due,
+                clone._alienShoot)
+        if self._ship is not None:
+            ship = SimShip(self._ship.x, self._ship.y)
+            ship.px = self._ship.px
+            clone._ship = ship
+        clone._events = []
+        clone._profiler = None
+        clone._ownsRng = False
+        self._ownsRng = False
+        return clone
+
+
+    # HELPER METHODS
+    def _random(self):
+        """
+        Returns the random number generator, copying it first if it is shared
+        """
+        if not self._ownsRng:
+            rng = random.Random()
+            rng.setstate(self._rng.getstate())
+            self._rng = rng
+            self._ownsRng = True
+        return self._rng
+
+
+    def _profiledTick(self, dt, left, right, fire):
+        """
+        Runs the phases of a tick like update, timing each one
+
+        Parameter dt: The time in seconds since the last update
+        Precondition: dt is a number (int or float)
+
+        Parameter left, right, fire: the keys held down
+        Precondition: left, right, fire are booleans
+        """
+        profiler = self._profiler
+        clock = time.perf_counter
+        start = clock()
+        self._shipMove(left, right, dt)
+        ship = clock()
+        self._aliensMoveShoot(dt)
+        aliens = clock()
+        self._fireBolt(fire)
+        fired = clock()
+        self._updateBolts(dt)
+        bolts = clock()
+        profiler.time('shipMove', ship - start)
+        profiler.time('aliensMoveShoot', aliens - ship)
+        profiler.time('fireBolt', fired - aliens)
+        profiler.time('updateBolts', bolts - fired)
+        profiler.time('tick', bolts - start)
+        profiler.count('aliens', self._formation.count())
+        profiler.count('bolts', len(self._bolts))
+
+
+    def alienLine(self):
+        """
+        Determines if any alien touched the Defence line.
+
+        Return True if alien reached the Defence line, false otherwise.
+        """
+        return self._formation.belowLine(DEFENSE_LINE)
+
+
+    def crossedBolts(self):
+        """
+        Returns the (player bolt, alien bolt) pairs whose boxes overlap
+
+        Bolts do not collide with each other in Invaders, so update never
+        calls this. It is the bolt against bolt test of the broad phase: the
+        candidate pairs of the spatial hash, tested exactly. The bolts are
+        where the last update left them.
+        """
+        crossed = []
+        for a, b in self._grid.pairs():
+            if type(a) is not SimBolt or type(b) is not SimBolt:
+                continue
+            if a.isPlayerBolt() == b.isPlayerBolt():
+                continue
+            if abs(a.x - b.x) < BOLT_WIDTH and abs(a.y - b.y) < BOLT_HEIGHT:
+                crossed.append((a, b) if a.isPlayerBolt() else (b, a))
+        return crossed
+
+
+    def aliensCount(self):
+        """
+        Returns count of aliens still alive
+        """
+        return self._formation.count()
+
+
+    def isOver(self):
+        """
+        Returns True if the ship died, the player won or the line was breached
+        """
+        return self._shipDies or self._playerWins or self.alienLine()
+
+
+    def _shipMove(self, left, right, dt):
+        """
+        Moves the ship based on user's inputs
+
+        Parameter left: whether the left key is held down
+        Precondition: left is a boolean
+
+        Parameter right: whether the right key is held down
+        Precondition: right is a boolean
+
+        Parameter dt: The length of the tick in seconds
+        Precondition: dt is a number (int or float)
+        """
+        if self._ship is None:
+            return
+        self._ship.px = self._ship.x
+        if left:
+            if self._ship.x - SHIP_WIDTH/2 > 0:
+                self._ship.move(False, dt)
+        elif right:
+            if self._ship.x + SHIP_WIDTH/2 < self._width:
+                self._ship.move(True, dt)
+
+
+    def _aliensMoveShoot(self, dt):
+        """
+        Moves the timers of the aliens on by one tick, which moves the aliens
+        and makes one shoot when they are due
+
+        The time since the last step is counted in ticks of dt again if dt
+        is not the length of the last tick.
+
+        Parameter dt: The time in seconds since the last update
+        Precondition: dt is a number (int or float)
+        """
+        if dt != self._dt:
+            self._retime(dt)
+        self._scheduler.advance()
+
+
+    def _alienStep(self):
+        """
+        Moves the aliens one step, and schedules the next step
+
+        This is the timer of the alien steps. If the aliens shoot at this
+        step, the bolt timer runs next, in the same tick.
+        """
+        self._aliensMove()
+        self._step+=1
+        self._stepped = self._scheduler.getTick()
+        self._sums = self._zero
+        bolt = self._boltTimer
+        self._scheduleStep(bolt is None or bolt.due != self._stepped)
+
+
+    def _alienShoot(self):
+        """
+        Makes an alien shoot, and schedules the next bolt
+
+        This is the timer of the alien bolts, due at the step that makes
+        _step reach _boltRate (see _scheduleBolt).
+        """
+        self._shootBolts()
+        self._step = 0
+        self._scheduleBolt()
+
+
+    def _elapsed(self):
+        """
+        Returns the time since the last alien step, as an accumulator of dt
+        would hold it
+        """
+        if self._stepped is None:
+            return self._time
+        return _sumAt(self._sums, self._dt,
+            self._scheduler.getTick() - self._stepped)
+
+
+    def _retime(self, dt):
+        """
+        Counts the time since the last alien step in ticks of dt from now
+        on, and schedules the aliens again
+
+        Parameter dt: the length of a tick in seconds
+        Precondition: dt is a number (int or float)
+        """
+        time = self._elapsed()
+        self._dt = dt
+        self._zero = [0]
+        self._sums = self._zero if time == 0 else [time]
+        self._stepped = self._scheduler.getTick()
+        self._scheduleStep()
+
+
+    def _scheduleStep(self, bolt=True):
+        """
+        Schedules the next alien step, and (if bolt is True) the next bolt
+
+        The aliens step at the first tick where the time since the last
+        step is more than _speed. The step is placed first, and the bolt
+        right after it, so that when both are due at the same tick the
+        aliens step before they shoot. Nothing is scheduled before the
+        length of a tick is known.
+
+        Parameter bolt: whether to schedule the bolt again too
+        Precondition: bolt is a boolean
+        """
+        scheduler = self._scheduler
+        if self._stepTimer is not None:
+            scheduler.cancel(self._stepTimer)
+            self._stepTimer = None
+        if bolt and self._boltTimer is not None:
+            scheduler.cancel(self._boltTimer)
+            self._boltTimer = None
+        if self._stepped is None:
+            return
+        ticks = scheduler.getTick() - self._stepped
+        if self._dt > 0:
+            ticks = max(ticks+1, _stepTicks(self._sums, self._dt, self._speed))
+        elif _sumAt(self._sums, self._dt, ticks+1) > self._speed:
+            ticks += 1
+        else:
+            return
+        self._stepTimer = scheduler.at(self._stepped + ticks, self._alienStep)
+        if bolt:
+            self._scheduleBolt()
+
+
+    def _scheduleBolt(self):
+        """
+        Schedules the next alien bolt at the step that makes _step reach
+        _boltRate, if the speed does not change before then
+        """
+        self._boltTimer = None
+        if self._stepTimer is None:
+            return
+        steps = max(self._boltRate - self._step, 1)
+        due = self._stepTimer.due
+        if steps > 1:
+            if not self._dt > 0:
+                return
+            due += (steps-1)*_stepTicks(self._zero, self._dt, self._speed)
+        self._boltTimer = self._scheduler.at(due, self._alienShoot)
+
+
+    def _shootBolts(self):
+        """
+        Makes the bottom alien of a random non-empty column shoot a bolt
+        """
+        if self.aliensCount() == 0:
+            return
+        rng = self._random()
+        x, y = self._formation.position(*self._formation.shooter(rng))
+        self._bolts.fire(False, x, y-ALIEN_HEIGHT/2)
+        self._events.append(BoltFired(False, x, y-ALIEN_HEIGHT/2))
+        self._boltRate = rng.randint(1, self._maxBoltRate)
+
+
+    def _aliensMove(self):
+        """
+        Moves the aliens one step sideways, or down and back at an edge
+        """
+        if self.aliensCount() == 0:
+            return
+        left, right = self._formation.extrema()
+        left -= ALIEN_WIDTH/2
+        right += ALIEN_WIDTH/2
+        if self._mov == 1 and right <= self._width - ALIEN_H_SEP:
+            dx, dy = ALIEN_H_WALK, 0
+        elif self._mov == 1:
+            dx, dy = -ALIEN_H_WALK, -ALIEN_V_WALK
+            self._mov = -1
+        elif left >= ALIEN_H_SEP:
+            dx, dy = -ALIEN_H_WALK, 0
+        else:
+            dx, dy = ALIEN_H_WALK, -ALIEN_V_WALK
+            self._mov = 1
+        self._formation.march(dx, dy)
+        if dy and self.alienLine():
+            self._events.append(LineBreached())
+
+
+    def _fireBolt(self, fire):
+        """
+        Fires a bolt from the ship if fire is held and no player bolt is up
+
+        Parameter fire: whether the fire key (spacebar) is held down
+        Precondition: fire is a boolean
+        """
+        if not fire or self._ship is None or self._bolts.hasPlayerBolt():
+            return
+        x, y = self._ship.x, self._ship.y+ALIEN_HEIGHT/2
+        self._bolts.fire(True, x, y)
+        self._events.append(BoltFired(True, x, y))
+
+
+    def _updateBolts(self, dt):
+        """
+        Moves the bolts and checks for collisions of aliens, ship and bolts
+
+        Player bolts are tested against the formation directly (see
+        Formation.hit). The bolts that are left and the ship are moved in
+        the spatial hash, and only the bolts near the ship are given to
+        SimShip.collides. The ship is hit after every bolt has moved.
+
+        Parameter dt: The length of the tick in seconds
+        Precondition: dt is a number (int or float)
+        """
+        bolts = self._bolts
+        grid = self._grid
+        move = grid.move
+        i = 0
+        while i < len(bolts):
+            bolt = bolts.get(i)
+            bolt.py = bolt.y
+            bolt.y+=bolt.velocity*BASE_RATE*dt
+            if bolt.isPlayerBolt():
+                if bolt.y - BOLT_WIDTH/2 >= self._height or \
+                        self._alienColision(bolt):
+                    bolts.remove(i)
+                    grid.remove(bolt)
+                    continue
+            elif bolt.y + BOLT_HEIGHT/2 <= 0:
+                bolts.remove(i)
+                grid.remove(bolt)
+                continue
+            move(bolt, bolt.x, bolt.y, BOLT_WIDTH, BOLT_HEIGHT)
+            i += 1
+        ship = self._ship
+        if ship is None:
+            return
+        move(ship, ship.x, ship.y, SHIP_WIDTH, SHIP_HEIGHT)
+        for bolt in grid.query(ship.x, ship.y, SHIP_WIDTH, SHIP_HEIGHT):
+            if bolt is not ship and ship.collides(bolt):
+                self._shipCollides()
+                return
+
+
+    def _alienColision(self, bolt):
+        """
+        Returns True if the bolt hit (and killed) an alien, False otherwise
+
+        Parameter bolt: the bolt to check
+        Precondition: bolt is a SimBolt
+        """
+        if not bolt.isPlayerBolt():
+            return False
+        slot = self._formation.hit([(bolt.x + BOLT_WIDTH/2,
+            bolt.y + BOLT_HEIGHT/2), (bolt.x - BOLT_WIDTH/2,
+            bolt.y - BOLT_HEIGHT/2)])
+        if slot is None:
+            return False
+        self._formation.kill(*slot)
+        self._events.append(AlienKilled(*slot))
+        return True
+
+
+    def _scoreEvents(self):
+        """
+        Updates the score from the events of the update
+
+        Every alien killed scores self._alienpoints, which goes up by
+        self._aPIAK once more than self._killsReq aliens were killed, and
+        speeds the aliens up. A ship hit costs self._shipBursts points. The
+        speed is only read before the bolts move, so scoring at the end of
+        the update plays exactly like scoring at every collision. If the
+        speed changed, the aliens are scheduled again.
+        """
+        speed = self._speed
+        for event in self._events:
+            if type(event) is AlienKilled:
+                self._kills +=1
+                if self._kills > self._killsReq:
+                    self._alienpoints+=self._aPIAK
+                self._score+=self._alienpoints
+                self._speed = self._speed*0.97
+            elif type(event) is ShipHit:
+                self._score-=self._shipBursts
+        if self._speed != speed:
+            self._scheduleStep()
+
+
+    def _shipCollides(self):
+        """
+        Starts the ship death animation (the penalty is in _scoreEvents)
+
+        All the bolts on screen are removed.
+        """
+        self._dying = 0
+        self._events.append(ShipHit(self._ship.x))
+        self._bolts.clear()
+        self._grid.clear()
+
+
+# HELPER FUNCTIONS
+def _sumAt(sums, dt, ticks):
+    """
+    Returns the time after ticks ticks of dt from sums[0], extending sums
+
+    Parameter sums: the times after 0, 1, ... ticks, added up one by one
+    Precondition: sums is a non-empty list of numbers
+
+    Parameter dt: the length of a tick
+    Precondition: dt is a number
+
+    Parameter ticks: the number of ticks
+    Precondition: ticks is an int >= 0
+    """
+    while len(sums) <= ticks:
+        sums.append(sums[-1]+dt)
+    return sums[ticks]
+
+
+def _stepTicks(sums, dt, speed):
+    """
+    Returns the first number of ticks after which the time in sums is more
+    than speed, extending sums
+
+    Parameter sums: the times after 0, 1, ... ticks, added up one by one
+    Precondition: sums is a non-empty list of numbers
+
+    Parameter dt: the length of a tick
+    Precondition: dt is a number > 0
+
+    Parameter speed: the time to pass
+    Precondition: speed is a number
+    """
+    while not sums[-1] > speed:
+        sums.append(sums[-1]+dt)
+    return bisect.bisect_right(sums, speed)
+
+
+def _contains(cx, cy, width, height, px, py):
+    """
+    Returns True if the point (px, py) is inside the given box
+
+    This is the same test as GObject.contains for an unrotated object.
+
+    Parameter cx, cy: the center of the box
+    Precondition: cx, cy are numbers
+
+    Parameter width, height: the size of the box
+    Precondition: width, height are numbers > 0
+
+    Parameter px, py: the point to test
+    Precondition: px, py are numbers
+    """
+    return abs(px-cx) < width/2 and abs(py-cy) < height/2
@@ -0,0 +1,351 @@
+"""
+Simulation thread module for Alien Invaders
+
+This module runs a WaveSim on its own thread, at a fixed tick, so that the
+Kivy main thread only has to read input and draw. It is turned on by
+setting the environment variable INVADERS_THREADED to 1.
+
+The two threads share no mutable state:
+
+    input       the main thread puts the keys held down (and commands, like
+                respawning the ship) on a queue; the simulation thread
+                takes everything off the queue before every tick
+    frames      after every tick, the simulation thread builds a new
+                Frame, an immutable copy of what there is to draw, while
+                the main thread is still drawing the last one; publishing
+                it is a single reference swap, so draw never takes a lock
+    events      the events of every tick (see events.py) are appended to
+                a log; a frame has the length of the log, and the main
+                thread handles the entries it has not seen yet, so no
+                event is lost if it skips a frame; the simulation thread
+                drops the entries the main thread has handled
+
+The simulation is still Python, so it shares the interpreter lock with the
+main thread. What the split buys is timing: a slow tick delays the next
+frame to draw, not the drawing of the current one, and input is read on
+time. Once the wave is over, no more frames are published until a command
+(like respawning the ship) changes it.
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+import os
+import queue
+import threading
+import time
+
+# PRIMARY RULE: This module may only access consts.py and (through the
+# WaveSim it is given) sim.py. It must never import game2d or kivy.
+
+
+class Frame(object):
+    """
+    A class representing what there is to draw after a simulation tick.
+
+    A frame never changes after it is made.
+
+    Attribute tick: the number of ticks simulated
+    Invariant: tick is an int >= 0
+
+    Attribute clock: the time.perf_counter() when the frame was published
+    Invariant: clock is a float
+
+    Attribute origin: the center (x, y) of the bottom left alien slot
+    Invariant: origin is a tuple of two floats
+
+    Attribute ship: the ship as (x, px, y), or None if there is no ship
+    Invariant: ship is a tuple of three numbers or None
+
+    Attribute bolts: the bolts as (key, x, y, py) tuples
+    Invariant: bolts is a tuple of tuples
+
+    Attribute events: the number of events logged when the frame was made
+    Invariant: events is an int >= 0
+
+    Attribute score: the score
+    Invariant: score is an int
+
+    Attribute aliens: the number of aliens alive
+    Invariant: aliens is an int >= 0
+
+    Attribute dying: the time since the ship was hit, or None
+    Invariant: dying is a float >= 0 or None
+
+    Attribute shipDies, playerWins, alienLine: the end of wave flags
+    Invariant: shipDies, playerWins, alienLine are booleans
+
+    Attribute acked: the number of the last command carried out
+    Invariant: acked is an int >= 0
+    """
+    __slots__ = ('tick', 'clock', 'origin', 'ship', 'bolts', 'events',
+        'score', 'aliens', 'dying', 'shipDies', 'playerWins', 'alienLine',
+        'acked')
+
+    def __init__(self, sim, tick, events, acked):
+        """
+        Initializes a frame from the state of sim
+
+        Parameter sim: the wave, just after a tick
+        Precondition: sim is a WaveSim object
+
+        Parameter tick: the number of ticks simulated
+        Precondition: tick is an int >= 0
+
+        Parameter events: the number of events logged
+        Precondition: events is an int >= 0
+
+        Parameter acked: the number of the last command carried out
+        Precondition: acked is an int >= 0
+        """
+        ship = sim.getShip()
+        self.tick = tick
+        self.origin = sim.getFormation().getOrigin()
+        self.ship = None if ship is None else (ship.x, ship.px, ship.y)
+        self.bolts = tuple((bolt.key, bolt.x, bolt.y, bolt.py)
+            for bolt in sim.getBolts())
+        self.events = events
+        self.score = sim.getScore()
+        self.aliens = sim.aliensCount()
+        self.dying = sim.getDying()
+        self.shipDies = sim.getShipDies()
+        self.playerWins = sim.getPlayerWin()
+        self.alienLine = sim.alienLine()
+        self.acked = acked
+        self.clock = time.perf_counter()
+
+
+class SimThread(object):
+    """
+    A class representing a WaveSim run on its own thread.
+
+    The main thread calls setInput and call, and reads getFrame and
+    getEvents. Nothing else of the wave may be touched while the thread
+    runs, except through fork.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _sim: the wave
+    # Invariant: _sim is a WaveSim object, used only by the thread
+    #
+    # Attribute _tick: the length of a tick in seconds
+    # Invariant: _tick is a float > 0
+    #
+    # Attribute _queue: the input and commands from the main thread
+    # Invariant: _queue is a queue.SimpleQueue of tuples
+    #
+    # Attribute _log: the event log, as (base, events), where events are the
+    # entries from number base on (the ones before were handled)
+    # Invariant: _log is a tuple of an int >= 0 and a list of Event objects;
+    # the list is only ever appended to, and trimming swaps in a new tuple
+    #
+    # Attribute _handled: the number of entries the main thread has handled
+    # Invariant: _handled is an int >= 0
+    #
+    # Attribute _frame: the latest frame
+    # Invariant: _frame is a Frame object
+    #
+    # Attribute _lock: held by the thread while it changes the wave
+    # Invariant: _lock is a threading.Lock
+    #
+    # Attribute _commands: the number of commands sent
+    # Invariant: _commands is an int >= 0
+    #
+    # Attribute _recording: the recording of the input of every tick
+    # Invariant: _recording is a Recording object (see replay.py) or None
+    #
+    # Attribute _running: whether the thread should keep running
+    # Invariant: _running is a boolean
+    #
+    # Attribute _thread: the thread
+    # Invariant: _thread is a threading.Thread
+
+    def __init__(self, sim, rate=SIM_TICK_RATE, recording=None):
+        """
+        Initializes and starts a thread that runs sim at rate ticks a second
+
+        Parameter sim: the wave to run
+        Precondition: sim is a WaveSim object
+
+        Parameter rate: the number of ticks per second
+        Precondition: rate is an int > 0
+
+        Parameter recording: the recording of the input of every tick
+        Precondition: recording is a Recording object (begun) or None
+        """
+        self._sim = sim
+        self._tick = 1/rate
+        self._queue = queue.SimpleQueue()
+        self._log = (0, list(sim.getEvents()))
+        self._handled = 0
+        self._frame = Frame(sim, 0, len(self._log[1]), 0)
+        self._lock = threading.Lock()
+        self._commands = 0
+        self._recording = recording
+        self._running = True
+        self._thread = threading.Thread(target=self._run,
+            name='invaders-sim', daemon=True)
+        self._thread.start()
+
+
+    def getFrame(self):
+        """
+        Returns the latest frame
+        """
+        return self._frame
+
+
+    def getEvents(self, start, stop):
+        """
+        Returns the entries start to stop of the event log
+
+        The entries before stop are handled: the simulation thread drops
+        them, and they may not be asked for again.
+
+        Parameter start, stop: the part of the log
+        Precondition: start, stop are ints with start <= stop <= the events
+        of a published frame, and start >= the stop of the last call
+        """
+        base, events = self._log
+        self._handled = stop
+        return events[start-base:stop-base]
+
+
+    def setInput(self, left, right, fire):
+        """
+        Sets the keys held down from the next tick on
+
+        Parameter left, right, fire: the keys held down
+        Precondition: left, right, fire are booleans
+        """
+        self._queue.put(('input', left, right, fire))
+
+
+    def call(self, method, *args):
+        """
+        Calls a method of the wave before the next tick, and returns the
+        command number
+
+        The command has been carried out once a frame has an acked of at
+        least the number returned. Calling spawnShip marks the next tick of
+        the recording as continued.
+
+        Parameter method: the name of a WaveSim method, like 'spawnShip'
+        Precondition: method is a string
+
+        Parameter args: the arguments of the method
+        Precondition: args are valid arguments of the method
+        """
+        self._commands += 1
+        self._queue.put(('call', self._commands, method, args))
+        return self._commands
+
+
+    def getCommands(self):
+        """
+        Returns the number of commands sent with call
+        """
+        return self._commands
+
+
+    def fork(self):
+        """
+        Returns a fork of the wave (see WaveSim.fork), taken between ticks
+        """
+        with self._lock:
+            return self._sim.fork()
+
+
+    def stop(self):
+        """
+        Stops the thread and waits for it to finish
+        """
+        self._running = False
+        self._queue.put(('stop',))
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+
+    def _run(self):
+        """
+        Runs ticks on time until stopped (the body of the thread)
+
+        If the thread falls more than SIM_MAX_TICKS ticks behind, the time
+        it is behind by is dropped, as Wave does.
+        """
+        sim = self._sim
+        tick = self._tick
+        left = right = fire = False
+        continued = False
+        changed = False
+        acked = 0
+        ticks = 0
+        due = time.perf_counter()
+        while self._running:
+            timeout = due - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else \
+                    self._queue.get_nowait()
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item[0] == 'input':
+                    left, right, fire = item[1:]
+                elif item[0] == 'call':
+                    with self._lock:
+                        getattr(sim, item[2])(*item[3])
+                    continued = continued or item[2] == 'spawnShip'
+                    changed = True
+                    acked = item[1]
+                elif item[0] == 'stop':
+                    return
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            now = time.perf_counter()
+            if now < due:
+                continue
+            if not sim.isOver():
+                if self._recording is not None:
+                    self._recording.record(left, right, fire, continued)
+                continued = False
+                with self._lock:
+                    sim.update(tick, left, right, fire)
+                ticks += 1
+                changed = True
+                self._logEvents(sim.getEvents())
+            if changed:
+                base, events = self._log
+                self._frame = Frame(sim, ticks, base + len(events), acked)
+                changed = False
+            due += tick
+            if now - due > SIM_MAX_TICKS*tick:
+                due = now
+
+
+    def _logEvents(self, new):
+        """
+        Appends the events of a tick to the log, first dropping the entries
+        the main thread has handled
+
+        A trimmed log is a new list, so a main thread still slicing the old
+        one sees every entry it asked for.
+
+        Parameter new: the events of the tick
+        Precondition: new is a list of Event objects
+        """
+        base, events = self._log
+        handled = self._handled - base
+        if handled > 0:
+            events = events[handled:]
+            base += handled
+            self._log = (base, events)
+        events.extend(new)
+
+
+def threadedFromEnvironment():
+    """
+    Returns True if INVADERS_THREADED is set to 1 (or another true value)
+    """
+    value = os.environ.get('INVADERS_THREADED', '').strip().lower()
+    return value not in ('', '0', 'false', 'no')
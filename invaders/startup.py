@@ -0,0 +1,93 @@
+"""
+Startup time check for Alien Invaders
+
+This script measures how long it takes a fresh Python process to import the
+game, and compares it to the budgets in consts.py. It measures two imports:
+
+    app     everything "python invaders" imports before the window opens
+            (budget STARTUP_BUDGET)
+    sim     the headless simulation, as used by tests and batch jobs
+            (budget HEADLESS_STARTUP_BUDGET)
+
+Each import is timed in its own process (the best of a few runs, so the
+disk cache is warm), with the display size fixed so that the screen is not
+queried. Run it from the folder that contains the invaders folder with
+
+    python invaders/startup.py
+
+The script exits with status 1 if an import is over its budget, and with
+status 2 if an import fails, so it can be used in CI. To see which modules
+are slow, run (in the invaders folder)
+
+    python -X importtime -c "import app"
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import os
+import subprocess
+import sys
+import time
+
+from consts import *
+
+# the number of times each import is measured
+RUNS = 5
+
+# the module imported by each check, and its budget in seconds
+CHECKS = (('app', STARTUP_BUDGET), ('sim', HEADLESS_STARTUP_BUDGET))
+
+
+def measure(module, runs=RUNS):
+    """
+    Returns the best time in seconds to start Python and import module
+
+    The time of starting a bare Python process is subtracted, so this is the
+    cost of the import alone. If the import fails, this returns None.
+
+    Parameter module: the name of a module in the invaders folder
+    Precondition: module is a string
+
+    Parameter runs: the number of processes to time
+    Precondition: runs is an int > 0
+    """
+    folder = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, INVADERS_DISPLAY='headless')
+    def best(code):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, '-c', code], cwd=folder,
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode != 0:
+                return None
+            times.append(time.perf_counter() - start)
+        return min(times)
+    base = best('pass')
+    took = best('import ' + module)
+    if took is None:
+        return None
+    return max(took - base, 0.0)
+
+
+def main():
+    """
+    Measures every check, prints a report and returns the exit status
+    """
+    status = 0
+    for module, budget in CHECKS:
+        took = measure(module)
+        if took is None:
+            print(f'{module:>5}: import failed (missing dependency?)')
+            status = 2
+            continue
+        verdict = 'ok' if took <= budget else 'OVER BUDGET'
+        if took > budget:
+            status = max(status, 1)
+        print(f'{module:>5}: {took*1000:7.1f} ms  (budget {budget*1000:.0f} ms)'
+            f'  {verdict}')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+Parameter sweep script for Alien Invaders
+
+This script plays many headless games (see WaveSim) with a bot, over a grid
+of parameters, to see how the tuning of the game changes how it plays. The
+parameters that can be swept are
+
+    rows, cols      the size of the wave (ALIEN_ROWS, ALIENS_IN_ROW)
+    speed           the seconds between alien steps (ALIEN_SPEED)
+    lives           the lives of the player (SHIP_LIVES)
+    boltRate, shipBursts, alienPoints, pointsIncrease, killsDivisor
+                    the rules of the wave (see RULES in sim.py)
+
+Every combination of the values given is played with every seed, and the
+games are spread over a pool of processes, one per core. The result of
+every game (win, score, length in ticks and in seconds of game time, lives
+and aliens left) is written to the output file as soon as it is ready. With
+a file ending in .parquet, and pyarrow installed, the results are written
+as Parquet row groups; otherwise they are written as CSV. A summary per
+combination (win rate, mean score, mean length) is printed at the end. Run
+it from the folder that contains the invaders folder, for example
+
+    python invaders/sweep.py --grid speed=0.05,0.1 boltRate=3,6 --seeds 20
+        --policy hunter --out results.csv
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from consts import *
+from sim import WaveSim, RULES
+from driver import Game
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# the parameters of a game that are not rules, and their defaults
+GAME = {'rows': ALIEN_ROWS, 'cols': ALIENS_IN_ROW, 'speed': ALIEN_SPEED,
+    'lives': SHIP_LIVES}
+
+# the longest game in ticks (ten minutes of game time)
+MAX_TICKS = 10*60*SIM_TICK_RATE
+
+# the results written to the Parquet file at a time
+ROW_GROUP = 256
+
+# the columns of a result, after the parameters
+COLUMNS = ('policy', 'seed', 'won', 'score', 'ticks', 'seconds', 'lives',
+    'aliens', 'wall_ms')
+
+
+def sweeper(sim, tick):
+    """
+    Returns the input (left, right, fire) of a bot that sweeps and fires
+
+    The ship goes across the screen and back every four seconds and fires
+    whenever it can.
+
+    Parameter sim: the wave being played
+    Precondition: sim is a WaveSim object
+
+    Parameter tick: the number of ticks played so far
+    Precondition: tick is an int >= 0
+    """
+    left = tick % (4*SIM_TICK_RATE) < 2*SIM_TICK_RATE
+    return (left, not left, True)
+
+
+def hunter(sim, tick):
+    """
+    Returns the input (left, right, fire) of a bot that hunts the aliens
+
+    The ship moves under the leftmost non-empty column and fires whenever
+    it can.
+
+    Parameter sim: the wave being played
+    Precondition: sim is a WaveSim object
+
+    Parameter tick: the number of ticks played so far
+    Precondition: tick is an int >= 0
+    """
+    ship = sim.getShip()
+    formation = sim.getFormation()
+    if ship is None or formation.count() == 0:
+        return (False, False, True)
+    x = formation.extrema()[0]
+    return (x < ship.x - SHIP_MOVEMENT, x > ship.x + SHIP_MOVEMENT, True)
+
+
+# the bots that can play a sweep, by name
+POLICIES = {'sweeper': sweeper, 'hunter': hunter}
+
+
+def playGame(task):
+    """
+    Plays one game and returns its result as a dictionary
+
+    A game follows the rules of Invaders (see Game in driver.py): a lost
+    ship costs a life and is respawned at once, and the game is over when
+    the wave is won, the line is breached, the last life is lost, or
+    MAX_TICKS ticks have passed.
+
+    Parameter task: the parameters of the game (keys of GAME and RULES, plus
+    'policy' and 'seed')
+    Precondition: task is a dictionary
+    """
+    start = time.perf_counter()
+    policy = POLICIES[task['policy']]
+    params = dict(GAME, **{key: task[key] for key in GAME if key in task})
+    rules = {key: task[key] for key in RULES if key in task}
+    sim = WaveSim(rows=params['rows'], cols=params['cols'],
+        speed=params['speed'], width=HEADLESS_WIDTH, height=HEADLESS_HEIGHT,
+        seed=task['seed'], rules=rules)
+    game = Game(sim, params['lives'])
+    tick = 1/SIM_TICK_RATE
+    while not game.isOver() and game.getTicks() < MAX_TICKS:
+        game.update(tick, *policy(sim, game.getTicks()))
+    ticks = game.getTicks()
+    result = dict(task)
+    result.update({'won': game.isWon(), 'score': sim.getScore(),
+        'ticks': ticks, 'seconds': ticks*tick, 'lives': game.getLives(),
+        'aliens': sim.aliensCount(),
+        'wall_ms': (time.perf_counter() - start)*1000})
+    return result
+
+
+class ResultWriter(object):
+    """
+    A class representing a results file that is written as results come in.
+
+    The file is Parquet (in row groups of ROW_GROUP results) if its name
+    ends in .parquet and pyarrow is installed, and CSV otherwise.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _columns: the names of the columns
+    # Invariant: _columns is a list of strings
+    #
+    # Attribute _path: the name of the file
+    # Invariant: _path is a string
+    #
+    # Attribute _file: the open CSV file
+    # Invariant: _file is a file object, or None if writing Parquet
+    #
+    # Attribute _csv: the CSV writer of _file
+    # Invariant: _csv is a csv.writer, or None if writing Parquet
+    #
+    # Attribute _parquet: the Parquet writer
+    # Invariant: _parquet is a pyarrow.parquet.ParquetWriter, or None if
+    # writing CSV
+    #
+    # Attribute _pending: the results not yet written to the Parquet file
+    # Invariant: _pending is a list of dictionaries
+
+    def __init__(self, path, columns):
+        """
+        Initializes a writer of the given columns to the file path
+
+        Parameter path: the name of the file
+        Precondition: path is a string
+
+        Parameter columns: the names of the columns
+        Precondition: columns is a list of strings
+        """
+        self._columns = list(columns)
+        self._pending = []
+        self._file = None
+        self._csv = None
+        self._parquet = None
+        self._path = path
+        if not (path.lower().endswith('.parquet') and pyarrow is not None):
+            if path.lower().endswith('.parquet'):
+                print('pyarrow is not installed; writing CSV instead',
+                    file=sys.stderr)
+            self._file = open(path, 'w', newline='')
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self._columns)
+
+
+    def write(self, result):
+        """
+        Writes (or queues, for Parquet) one result
+
+        Parameter result: the result of a game
+        Precondition: result is a dictionary with a key for every column
+        """
+        if self._csv is not None:
+            self._csv.writerow([result[key] for key in self._columns])
+            self._file.flush()
+        else:
+            self._pending.append(result)
+            if len(self._pending) >= ROW_GROUP:
+                self._flush()
+
+
+    def close(self):
+        """
+        Writes what is left and closes the file
+        """
+        if self._csv is not None:
+            self._file.close()
+        else:
+            self._flush()
+            if self._parquet is not None:
+                self._parquet.close()
+
+
+    def _flush(self):
+        """
+        Writes the queued results to the Parquet file as one row group
+        """
+        if not self._pending:
+            return
+        table = pyarrow.table({key: [result[key] for result in self._pending]
+            for key in self._columns})
+        if self._parquet is None:
+            self._parquet = pyarrow.parquet.ParquetWriter(self._path,
+                table.schema)
+        self._parquet.write_table(table)
+        self._pending = []
+
+
+def parseGrid(specs):
+    """
+    Returns the grid of parameters as a dictionary of lists of values
+
+    Parameter specs: the parameters, each as 'name=value,value,...'
+    Precondition: specs is a list of strings; every name is a key of GAME or
+    RULES
+    """
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in GAME and name not in RULES:
+            raise ValueError(f'unknown parameter {name!r}')
+        kind = float if name == 'speed' else int
+        grid[name] = [kind(value) for value in values.split(',')]
+    return grid
+
+
+def makeTasks(grid, seeds, policy):
+    """
+    Returns the list of games to play: every combination, with every seed
+
+    Parameter grid: the values of every swept parameter
+    Precondition: grid is a dictionary of lists (see parseGrid)
+
+    Parameter seeds: the number of seeds per combination
+    Precondition: seeds is an int > 0
+
+    Parameter policy: the name of the bot
+    Precondition: policy is a key of POLICIES
+    """
+    names = list(grid)
+    tasks = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in range(seeds):
+            task = dict(zip(names, values))
+            task.update({'policy': policy, 'seed': seed})
+            tasks.append(task)
+    return tasks
+
+
+def summarize(results, names):
+    """
+    Prints the win rate, mean score and mean length of every combination
+
+    Parameter results: the results of the games
+    Precondition: results is a list of dictionaries
+
+    Parameter names: the swept parameters
+    Precondition: names is a list of strings
+    """
+    groups = {}
+    for result in results:
+        key = tuple(result[name] for name in names)
+        groups.setdefault(key, []).append(result)
+    print(' '.join(f'{name:>12}' for name in names) +
+        f"{'games':>8}{'win rate':>10}{'score':>10}{'seconds':>10}")
+    for key in sorted(groups):
+        games = groups[key]
+        n = len(games)
+        print(' '.join(f'{value:>12}' for value in key) + f'{n:>8}' +
+            f"{sum(g['won'] for g in games)/n:>10.2f}" +
+            f"{sum(g['score'] for g in games)/n:>10.1f}" +
+            f"{sum(g['seconds'] for g in games)/n:>10.1f}")
+
+
+def main(argv=None):
+    """
+    Runs the sweep from the command line arguments argv
+
+    Parameter argv: the command line arguments (sys.argv[1:] if None)
+    Precondition: argv is a list of strings or None
+    """
+    parser = argparse.ArgumentParser(description='Sweep game parameters.')
+    parser.add_argument('--grid', nargs='*', default=[],
+        help='parameters to sweep, as name=value,value,...')
+    parser.add_argument('--seeds', type=int, default=10,
+        help='games per combination')
+    parser.add_argument('--policy', choices=sorted(POLICIES),
+        default='hunter')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+        help='processes to use (default: one per core)')
+    parser.add_argument('--out', default='sweep.csv',
+        help='the results file (.csv or .parquet)')
+    args = parser.parse_args(argv)
+    grid = parseGrid(args.grid)
+    tasks = makeTasks(grid, args.seeds, args.policy)
+    writer = ResultWriter(args.out, list(grid) + list(COLUMNS))
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for future in as_completed([pool.submit(playGame, task)
+                for task in tasks]):
+            result = future.result()
+            writer.write(result)
+            results.append(result)
+    writer.close()
+    took = time.perf_counter() - start
+    summarize(results, list(grid))
+    print(f'{len(results)} games in {took:.1f} s, results in {args.out}')
+
+
+if __name__ == '__main__':
+    main()
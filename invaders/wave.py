@@ -18,8 +18,14 @@ answer.
 """
 from game2d import *
 from consts import *
+from consts import GAME_WIDTH
 from models import *
-import random
+from sim import *
+from render import *
+from simthread import SimThread
+from events import *
+from scheduler import Scheduler
+import time
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not
@@ -37,6 +43,27 @@ class Wave(object):
     loses). When the wave is complete, you  should create a NEW instance of
     Wave (in Invaders) if you want to make a new wave of aliens.
 
+    The rules of the wave are in the headless simulation WaveSim (sim.py).
+    This class is a view adapter: it feeds the player input to the
+    simulation, and mirrors the simulation onto the game2d objects that are
+    drawn on screen. The events of every tick (see events.py) are posted on
+    an EventBus and dispatched at the end of the tick, to the views, the
+    audio, the profiler and anyone who subscribed with subscribe.
+
+    The simulation runs at a fixed tick rate, no matter how often update is
+    called. The time passed to update is added to an accumulator, and as
+    many whole ticks as fit in it are run. When drawing, the ship and the
+    bolts are placed between their positions at the last two ticks, based
+    on how far the accumulator is into the next tick. The aliens are not
+    interpolated, since they jump from step to step.
+
+    With threaded set, the simulation runs on its own thread instead (see
+    simthread.py). Then update only sends the input, and handles the kills
+    events of the ticks run since the last update, and draw reads the
+    latest frame the thread published. Commands from Invaders (respawning
+    the ship, clearing the flags) are sent to the thread, and until it has
+    carried them out the wave reads as not over.
+
     If you want to pause the game, tell this controller to draw, but do not
     update.  See subcontrollers.py from Lecture 24 for an example.  This
     class will be similar to than one in how it interacts with the main class
@@ -51,159 +78,216 @@ class Wave(object):
 
     """
     # HIDDEN ATTRIBUTES:
-    # Attribute _ship: the player ship to control
+    # Attribute _sim: the simulation of this wave
+    # Invariant: _sim is a WaveSim object
+    #
+    # Attribute _ship: the view of the player ship
     # Invariant: _ship is a Ship object or None
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects 
-    # or None
+    # Attribute _shipView: the ship view reused by every respawn
+    # Invariant: _shipView is a Ship object (the sprite strip is loaded once)
+    #
+    # Attribute _aliens: the retained drawing of the alien formation
+    # Invariant: _aliens is a FormationBatch of the formation of _sim
     #
-    # Attribute _bolts: the laser bolts currently on screen
-    # Invariant: _bolts is a list of Bolt objects, possibly empty
+    # Attribute _bolts: the reusable views of the laser bolts
+    # Invariant: _bolts is a list of Bolt objects (or None); _bolts[k] is the
+    # view of the bolt record of _sim with key k
     #
     # Attribute _dline: the defensive line being protected
     # Invariant : _dline is a GPath object
     #
-    # Attribute _lives: the number of lives left
-    # Invariant: _lives is an int >= 0
-    #
-    # Attribute _time: the amount of time since the last Alien "step"
-    # Invariant: _time is a float >= 0s
-    #
-    # You may change any attribute above, as long as you update the invariant
-    # You may also add any new attributes as long as you document them.
-    # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _scheduler: the timers of the views, one tick per simulation
+    # tick
+    # Invariant: _scheduler is a Scheduler object
     #
-    # Attribute _animator: A coroutine for performing an animation
-    # Invariant: _animator is a generator-based coroutine (or None)
+    # Attribute _animator: the task of the ship blowing up (Ship.animate)
+    # Invariant: _animator is a Timer of _scheduler (or None)
     #
-    # Attribute _boltRate: the number of ALIEN STEPS (not frames) between bolts
-    # Invariant: _boltRate is an integer greater than 0
+    # Attribute _tick: the length of a simulation tick in seconds
+    # Invariant: _tick is a float > 0
     #
-    # Attribute _step: number of steps taken by aliens
-    # Invariant: _step is an integer greater than or equal to zero
+    # Attribute _accum: the time not yet simulated
+    # Invariant: _accum is a float with 0 <= _accum < _tick
     #
-    # Attribute _shipDies: A boolean to determine if alien died by collision
-    # Invariant: _shipDies is True (ship died), False (ship hasn't died yet)
+    # Attribute _profiler: the profiler for updates and drawing
+    # Invariant: _profiler is a Profiler object or None
     #
-    # Attribute _playerWins: A boolean to determine if the player won 
-    # by killing all aliens
-    # Invariant: _playerWins is True (player won/ all aliens killed) or False
+    # Attribute _thread: the thread running the simulation
+    # Invariant: _thread is a SimThread object, or None if the simulation
+    # runs in update
     #
-    # Attribute _playerlose: music to play when a ship dies
-    # Invariant: _playerlose is an object of sound class or None
+    # Attribute _input: the last input sent to _thread
+    # Invariant: _input is a (left, right, fire) tuple of booleans or None
     #
-    # Attribute _alienblast: music to play when an alien bursts
-    # Invariant: _alienblast is an object of sound class or None
+    # Attribute _seen: the entries of the event log of _thread handled
+    # Invariant: _seen is an int >= 0
     #
-    # Attribute _shipshoot: music to play when the ship shoots
-    # Invariant: _shipshoot is an object of Sound class or None
+    # Attribute _ticks: the ticks of _thread that _scheduler has run
+    # Invariant: _ticks is an int >= 0
     #
-    # Attribute _killsReq: number of alien kills required to increase 
-    # point per alien
-    # Invariant: _killsReq is an integer greater than zero
+    # Attribute _recording: the recording of the input of every tick
+    # Invariant: _recording is a Recording object (see replay.py) or None
     #
-    # Attribute _aPIAK: the number of points by which value of one alien kill 
-    # is increased
-    # Invariant: _aPIAK is an integer greater than 0
+    # Attribute _continued: whether the ship was respawned since the last tick
+    # Invariant: _continued is a boolean
     #
-    # Attribute _kills: number of aliens killed so far
-    # Invariant: _kills is an integer greater than or equal to zero
-    #
-    # Attribute _score: score of the player
-    # Invariant: _score is an integer (can be negative)
-    #
-    # Attribute _mov: the direction of movement of aliens
-    # Invariant: _mov is either 1 (aliens move right) or -1 (aliens move left)
+    # Attribute _bus: the bus the events of every tick are dispatched on
+    # Invariant: _bus is an EventBus object
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     def getPlayerWin(self):
         """
-        Returns self._playerWins
+        Returns True if the player won (all aliens were killed)
         """
-        return self._playerWins
+        if self._thread is not None:
+            return self._settled() and self._thread.getFrame().playerWins
+        return self._sim.getPlayerWin()
 
 
     def getShipDies(self):
         """
-        Returns self._shipDies
+        Returns True if the ship was destroyed
         """
-        return self._shipDies
+        if self._thread is not None:
+            return self._settled() and self._thread.getFrame().shipDies
+        return self._sim.getShipDies()
 
 
     def setShip(self, ship):
         """
-        Sets self._ship to ship
+        Sets self._ship to ship and respawns the ship in the simulation
 
         Parameter ship: A ship object
         Precondition: ship is a an instance of GObject
         """
         self._ship = ship
+        if self._thread is not None:
+            self._thread.call('spawnShip')
+        else:
+            self._sim.spawnShip()
+
+
+    def respawnShip(self):
+        """
+        Respawns the ship, reusing its view instead of making a new Ship
+
+        The view is moved back to the middle of the screen and set back to
+        its first frame, so the ship strip is not loaded again.
+        """
+        self._shipView.x = GAME_WIDTH/2
+        self._shipView.frame = 0
+        self.setShip(self._shipView)
+        self._continued = True
 
 
     def getScore(self):
         """
-        Returns self._score
+        Returns the score of the player
+        """
+        if self._thread is not None:
+            return self._thread.getFrame().score
+        return self._sim.getScore()
+
+
+    def subscribe(self, kind, handler):
+        """
+        Calls handler(events) with the events of kind of every tick
+
+        Parameter kind: the kind of event
+        Precondition: kind is one of EVENTS (see events.py)
+
+        Parameter handler: the subscriber
+        Precondition: handler is a function of one list of events
         """
-        return self._score
+        self._bus.subscribe(kind, handler)
 
 
-    def getPlayerlose(self):
-        return self._playerlose
+    def getSim(self):
+        """
+        Returns the simulation of this wave
+
+        If the simulation runs on its own thread, this is a fork of it taken
+        between two ticks, since the simulation itself belongs to the thread.
+        """
+        if self._thread is not None:
+            return self._thread.fork()
+        return self._sim
 
 
     def setShipDies(self, value):
         """
-        Sets self._shipDies to value
+        Sets whether the ship is dead to value
 
         Parameter value: A boolean value representing 
         whether ship is dead or not
         Precondition: value is a boolean
         """
-        self._shipDies = value
+        if self._thread is not None:
+            self._thread.call('setShipDies', value)
+        else:
+            self._sim.setShipDies(value)
 
 
     def setPlayerWin(self, value):
         """
-        Sets self._playerWins to value.
+        Sets whether the player has won to value.
 
         Parameter value: A boolean value representing 
         whether player has won or not
         Precondition: value is a boolean
         """
-        self._playerWins = value
+        if self._thread is not None:
+            self._thread.call('setPlayerWin', value)
+        else:
+            self._sim.setPlayerWin(value)
 
 
     # INITIALIZER (standard form) TO CREAT SHIP AND ALIENS
-    def __init__(self, playerlose, alienblast, shipshoot):
+    def __init__(self, audio, rate=SIM_TICK_RATE,
+            profiler=None, recording=None, sim=None, threaded=False):
         # required
-        self._ship = Ship(GAME_WIDTH/2,SHIP_BOTTOM+SHIP_HEIGHT/2)
-        self._aliens = self._createAliens()
+        if sim is None:
+            seed = None if recording is None else recording.getSeed()
+            sim = WaveSim(seed=seed)
+        self._sim = sim
+        self._shipView = Ship(GAME_WIDTH/2,SHIP_BOTTOM+SHIP_HEIGHT/2)
+        self._ship = self._shipView if sim.getShip() is not None else None
+        self._aliens = FormationBatch(self._sim.getFormation())
         self._bolts = []
         self._dline = GPath(points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE],\
             linewidth=2, linecolor='blue')
-        self._lives = SHIP_LIVES
-        self._time = 0
+        # fixed timestep
+        self._tick = 1/rate
+        self._accum = 0
         # animation
+        self._scheduler = Scheduler(self._tick)
         self._animator = None
-        # alien firings
-        self._boltRate = random.randint(1, BOLT_RATE)
-        self._step=0
-        # win-lose
-        self._shipDies = False
-        self._playerWins = False
-        # sounds
-        self._playerlose = playerlose
-        self._alienblast = alienblast
-        self._shipshoot = shipshoot
-        # player's score
-        self._killsReq = ALIEN_ROWS*ALIENS_IN_ROW//5
-        self._aPIAK = 2
-        self._kills = 0
-        self._score = 0
-        self._alienpoints = 30
-        # helper
-        self._mov = 1
+        # profiling
+        self._profiler = profiler
+        self._sim.setProfiler(profiler)
+        # recording
+        self._recording = recording
+        self._continued = False
+        if recording is not None:
+            recording.begin(self._sim, rate)
+        # events
+        self._bus = EventBus()
+        self._bus.subscribe(AlienKilled, self._killAliens)
+        if not threaded:
+            self._bus.postAll(self._sim.getEvents())
+        if audio is not None:
+            audio.subscribe(self._bus)
+        if profiler is not None:
+            for kind in EVENTS:
+                self._bus.subscribe(kind, self._countEvents)
+        # simulation thread (started last, once the views are made)
+        self._input = None
+        self._seen = 0
+        self._ticks = 0
+        self._thread = None
+        if threaded:
+            self._thread = SimThread(self._sim, rate, recording)
 
 
     # UPDAT METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
@@ -211,29 +295,48 @@ class Wave(object):
         """
         Animates a single wave in the game.
 
+        This runs every simulation tick that is due, with the input held
+        at the time of the call. At most SIM_MAX_TICKS ticks are run, and
+        any time left beyond that is dropped, so that a very slow frame
+        cannot make the next one even slower. No more ticks are run once
+        the wave is over, so that Invaders sees the state that ended it.
+        The events of making the wave (see WaveSim.getEvents) are dispatched
+        by the first update, so a wave that starts at the defense line still
+        ends the game.
+
         Parameter dt: The time in seconds since last Invader's update
         Precondition: dt is a number (int or float)
 
         Parameter input: user input, used to control the ship or shoot bolts
         Invariant: input is an instance of GInput (inherited from GameApp)
         """
-        if self._animator is None:
-            self._shipMove(input,dt)
-            self._aliensMoveShoot(dt)
-            self._fireBolt(input)
-            self._updateBolts(dt)
-            if self.aliensCount() == 0:
-                self._playerWins = True
-            if self.alienLine() == True:
-                self._playerlose = True
-        else:
-            try:
-                self._animator.send(dt)
-            except:
-                self._animator = None
-                self._ship = None
-                self._shipDies = True
-                self._bolts = []
+        left = input.is_key_down('left')
+        right = input.is_key_down('right')
+        fire = input.is_key_down('spacebar')
+        if self._thread is not None:
+            self._updateThreaded(left, right, fire)
+            return
+        # the events posted when the wave was made, if not dispatched yet
+        self._bus.dispatch()
+        self._accum += dt
+        ticks = 0
+        while self._accum >= self._tick and ticks < SIM_MAX_TICKS:
+            if self._sim.isOver():
+                self._accum = 0
+                break
+            if self._recording is not None:
+                self._recording.record(left, right, fire, self._continued)
+            self._continued = False
+            self._sim.update(self._tick, left, right, fire)
+            self._bus.postAll(self._sim.getEvents())
+            self._bus.dispatch()
+            self._scheduler.advance()
+            self._animateShip(self._sim.getDying(),
+                self._sim.getShip() is not None)
+            self._accum -= self._tick
+            ticks += 1
+        if self._accum >= self._tick:
+            self._accum = 0
 
 
     # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
@@ -241,326 +344,193 @@ class Wave(object):
         """
         Draw method to draw objects of a wave
 
+        The views are moved to the positions in the simulation just before
+        they are drawn. The ship and bolts are interpolated between the last
+        two ticks. The aliens are drawn as one retained batch.
+
         Parameter view: the game view, used in drawing (from Invaders)
         Precondition: view is an instance of GView (inherited from GameApp)
         """
-        # IMPLEMENT ME
-        if self._ship is not None:
-            self._ship.draw(view)
-        self._dline.draw(view)
-        for row in self._aliens:
-            for alien in row:
-                if alien is not None:
-                    alien.draw(view)
-        for bolt in self._bolts:
-            if not (not bolt):
-                bolt.draw(view)
-
-
-    # HELPER METHODS FOR COLLISION DETECTION
-    def _createAliens(self):
-        """
-        Creates and returns a 2-D list of aliens
-        """
-        aliens = []
-        images = self._getImages()
-        for i in range(1, ALIEN_ROWS+1):
-            alien = []
-            for j in range(1, ALIENS_IN_ROW+1):
-                alien.append(Alien(\
-                    x=(j)*ALIEN_H_SEP+(j-1)*(ALIEN_WIDTH)+ALIEN_WIDTH/2,\
-                    y=GAME_HEIGHT - ALIEN_CEILING - \
-                        (ALIEN_ROWS-i)*\
-                    (ALIEN_HEIGHT + ALIEN_V_SEP) - ALIEN_HEIGHT/2, \
-                        width = ALIEN_WIDTH, \
-                        height = ALIEN_HEIGHT, source= images[i]))
-            aliens.append(alien)
-        return aliens
-
-
-    def _getImages(self):
-        """
-        Determines the images each row of alien would have, 
-        and then returns a dictionary
-        whose keys are aliens rows (bottom-to-top) and values are images
-        """
-        images = {}
-        image = ALIEN_IMAGES[0]
-        for row in range(1, ALIEN_ROWS+1,2):
-            images[row] = ALIEN_IMAGES[ALIEN_IMAGES.index(image)]
-            images[row+1] = ALIEN_IMAGES[ALIEN_IMAGES.index(image)]
-            if ALIEN_IMAGES.index(image) != len(ALIEN_IMAGES)-1:
-                image = ALIEN_IMAGES[ALIEN_IMAGES.index(image)+1]
-            else:
-                image = ALIEN_IMAGES[0]
-        if len(images) > ALIEN_ROWS:
-            del images[len(images)]
-        return images
+        draw = self._draw if self._thread is None else self._drawThreaded
+        if self._profiler is None:
+            draw(view)
+        else:
+            start = time.perf_counter()
+            draw(view)
+            self._profiler.time('draw', time.perf_counter() - start)
 
 
-    def alienLine(self):
+    # HELPER METHODS
+    def _draw(self, view):
         """
-        Determines if any alien touched the Defence line.
+        Draws the objects of the wave (see draw)
 
-        Return True if alien reached the Defence line, false otherwise.
+        Parameter view: the game view, used in drawing (from Invaders)
+        Precondition: view is an instance of GView (inherited from GameApp)
         """
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                if self._aliens[row][col] is not None:
-                    if self._aliens[row][col].y - ALIEN_WIDTH/2 <= DEFENSE_LINE:
-                        return True
-        return False
+        alpha = self._accum/self._tick
+        ship = self._sim.getShip()
+        if self._ship is not None and ship is not None:
+            self._ship.x = ship.px + (ship.x - ship.px)*alpha
+            self._ship.draw(view)
+        self._dline.draw(view)
+        self._aliens.sync(self._sim.getFormation())
+        self._aliens.draw(view)
+        for simbolt in self._sim.getBolts():
+            bolt = self._boltView(simbolt.key)
+            bolt.x = simbolt.x
+            bolt.y = simbolt.py + (simbolt.y - simbolt.py)*alpha
+            bolt.draw(view)
 
 
-    def _null(self, col):
+    def _drawThreaded(self, view):
         """
-        Takes column index as a parameter and return whether
-        the column contains aliens or all the aliens in that 
-        column are dead (set to None)
+        Draws the latest frame of the simulation thread (see draw)
+
+        The ship and bolts are placed between their positions at the last
+        two ticks, based on how long ago the frame was published.
 
-        Parameter col: The column index in self._aliens
-        Precondition: col is a valid column index (0<=col<ALIENS_IN_ROW)
+        Parameter view: the game view, used in drawing (from Invaders)
+        Precondition: view is an instance of GView (inherited from GameApp)
         """
-        for row in range(ALIEN_ROWS):
-            if self._aliens[row][col] is not None:
-                return False
-        return True
+        frame = self._thread.getFrame()
+        alpha = min((time.perf_counter() - frame.clock)/self._tick, 1.0)
+        if self._ship is not None and frame.ship is not None:
+            x, px, y = frame.ship
+            self._ship.x = px + (x - px)*alpha
+            self._ship.draw(view)
+        self._dline.draw(view)
+        self._aliens.moveTo(frame.origin)
+        self._aliens.draw(view)
+        for key, x, y, py in frame.bolts:
+            bolt = self._boltView(key)
+            bolt.x = x
+            bolt.y = py + (y - py)*alpha
+            bolt.draw(view)
 
 
-    def _alienCollides(self, bolt):
+    def _updateThreaded(self, left, right, fire):
         """
-        Takes an index of a bolt that collided with an alien 
-        as a parameter and updates the self._score (increases by self.),
-        self._alienpoints(increase by self._aPIAK if valid), 
-        and self._kills(+1) accordingly.
+        Sends the input to the simulation thread and handles its new events
 
-        It also increases alien_speed
-        It also plays alienblast sound.
+        The view timers are moved on by the ticks the thread ran since the
+        last update.
 
-        Parameter bolt: index of a valid bolt that collided with an alien
-        Invariant: bolt is a valid bolt index in self._bolts
+        Parameter left, right, fire: the keys held down
+        Precondition: left, right, fire are booleans
         """
-        self._alienblast.play()
-        self._kills +=1
-        if self._kills > self._killsReq:
-            self._alienpoints+=self._aPIAK
-        del self._bolts[bolt]
-        self._score+=self._alienpoints
-        global ALIEN_SPEED
-        ALIEN_SPEED = ALIEN_SPEED*0.97
+        if self._input != (left, right, fire):
+            self._input = (left, right, fire)
+            self._thread.setInput(left, right, fire)
+        frame = self._thread.getFrame()
+        self._bus.postAll(self._thread.getEvents(self._seen, frame.events))
+        self._seen = frame.events
+        self._bus.dispatch()
+        for _ in range(frame.tick - self._ticks):
+            self._scheduler.advance()
+        self._ticks = frame.tick
+        if self._settled():
+            self._animateShip(frame.dying, frame.ship is not None)
 
 
-    def _shipCollides(self, bolt):
+    def _settled(self):
+        """
+        Returns True if the simulation thread carried out every command sent
         """
-        Takes an index of a bolt that collided with the ship as 
-        a parameter and updates the self._score (decrease by SHIP_BURSTS, 
-        a penalty)
+        return self._thread.getFrame().acked >= self._thread.getCommands()
 
-        It also initalizes animation.
-        It also plays playerlose sound.
 
-        Parameter bolt: index of a valid bolt that collided with the ship
-        Invariant: bolt is a valid bolt index in self._bolts
+    def close(self):
         """
-        self._score-=SHIP_BURSTS
-        self._animator = self._ship.animate()
-        next(self._animator)
-        self._playerlose.play()
-        del self._bolts[bolt]
-        self._bolts = []
+        Stops the simulation thread, if there is one
 
-
-    def _alienColision(self, bolt):
+        Invaders calls this when it is done with the wave.
         """
-        Takes a bolt as a parameter and
-        checks if the bolt has collided with any alien so far.
+        if self._thread is not None:
+            self._thread.stop()
 
-        Returns True if a collsion occured, false otherwise.
 
-        Parameter bolt: index of a valid bolt that collided with the ship
-        Parameter: bolt is a valid bolt index in self._bolts
+    def alienLine(self):
         """
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                if self._aliens[row][col] is not None:
-                    if self._aliens[row][col].collides(bolt):
-                        self._alienblast.play()
-                        self._aliens[row][col] = None
-                        return True
-        return False
+        Determines if any alien touched the Defence line.
+
+        Return True if alien reached the Defence line, false otherwise.
+        """
+        if self._thread is not None:
+            return self._thread.getFrame().alienLine
+        return self._sim.alienLine()
 
 
     def aliensCount(self):
         """
-        Counts number of aliens in each row
-        Returns count of aliens
+        Returns count of aliens still alive
         """
-        count = 0
-        for row in self._aliens:
-            for alien in row:
-                if not not alien:
-                    count+=1
-        return count
+        if self._thread is not None:
+            return self._thread.getFrame().aliens
+        return self._sim.aliensCount()
 
 
-    def _shipMove(self, input, dt):
+    def _killAliens(self, events):
         """
-        Moves the ship based on user's inputs
-
-        Parameter input: user input, used to control the ship or shoot bolts
-        Invariant: input is an instance of GInput (inherited from GameApp)
-
-        Parameter dt: The time in seconds since last Invader's update
-        Precondition: dt is a number (int or float)
+        Removes the aliens that were killed from the formation drawing
 
+        Parameter events: the aliens killed in a tick
+        Precondition: events is a list of AlienKilled events
         """
-        if self._animator is None:
-            if input.is_key_down('left'):
-                if  self._ship is not None and self._ship.x-self._ship.width/2>0:
-                    self._ship.move(False)
-            elif  self._ship is not None and input.is_key_down('right'):
-                if self._ship.x + self._ship.width/2 < GAME_WIDTH:
-                    self._ship.move()
-        else:
-            try:
-                self._animator.send(dt)
-            except:
-                self._shipDies = True
-                self._animator = None
-                self._ship = None
-                self._bolts = []
+        for event in events:
+            self._aliens.kill(event.row, event.col)
 
 
-    def _aliensMoveShoot(self, dt):
+    def _countEvents(self, events):
         """
-        Moves the aliens based on alien's speed and direction
-        Selects random alien to shoot and creates a bolt.
-        Increments aliens steps and time
+        Records the number of events of one kind in a tick in the profiler
 
-        Parameter dt: The time in seconds since last Invader's update
-        Precondition: dt is a number (int or float)
+        Parameter events: the events of one kind
+        Precondition: events is a non-empty list of events of the same kind
         """
-        self._time+=dt
-        if self._time > ALIEN_SPEED:
-            self._aliensMove()
-            self._step+=1
-            if self._step >= self._boltRate:
-                self._shootBolts()
-                self._step = 0
-            self._time = 0
-
-
-    def _shootBolts(self):
-        """
-        Allows aliens to shoot bolts at the ship
-        """
-
-        col = random.randint(0, ALIENS_IN_ROW-1)
-        while self._null(col):
-            col = random.randint(0, ALIENS_IN_ROW-1)
-        for row in range(ALIEN_ROWS-1,-1,-1):
-            if self._aliens[row][col] is not None:
-                alien=self._aliens[row][col]
-        self._bolts.append(Bolt(up=False, x=alien.x,y=alien.y-ALIEN_HEIGHT/2,\
-        width=BOLT_WIDTH,height=BOLT_HEIGHT,fillcolor='red'))
-        self._boltRate = random.randint(1, BOLT_RATE)
-
-
-    def _aliensMove(self):
-        """
-        Allows alien movement to the right, to the left, upwards or downwards
-        """
-        max = self._extrema()[0]
-        min = self._extrema()[1]
-        left = min[2] - ALIEN_WIDTH/2
-        right = max[2] + ALIEN_WIDTH/2
-        if right <= GAME_WIDTH - ALIEN_H_SEP and self._mov == 1:
-            for row in self._aliens:
-                for alien in row:
-                    if not (not alien):
-                        alien.x+=ALIEN_H_WALK
-        elif right > GAME_WIDTH - ALIEN_H_SEP and self._mov == 1:
-            for row in self._aliens:
-                for alien in row:
-                    if not (not alien):
-                        alien.y-=ALIEN_V_WALK
-                        alien.x-=ALIEN_H_WALK
-            self._mov=-1
-        elif left >= ALIEN_H_SEP and self._mov == -1:
-            for row in self._aliens:
-                for alien in row:
-                    if not (not alien):
-                        alien.x-=ALIEN_H_WALK
-        elif left < ALIEN_H_SEP and self._mov == -1:
-            for row in self._aliens:
-                for alien in row:
-                    if not (not alien):
-                        alien.y-=ALIEN_V_WALK
-                        alien.x+=ALIEN_H_WALK
-            self._mov = 1
-
-
-    def _extrema(self):
-        """
-        Finds the x-coordinate of aliens at exteme positions
-        Returns a list: [max, min] where
-        max, min are lists of the form [row, alien, value of x]
-        """
-        max = [0,0,0] # row, alien, max
-        for i, row in enumerate(self._aliens):
-            for j, alien in enumerate(row):
-                if not not alien:
-                    if alien.x>max[2]:
-                        max[0] = i
-                        max[1] = j
-                        max[2] = alien.x
-        min = [0,0,2*GAME_WIDTH] # row, alien, min
-        for i, row in enumerate(self._aliens):
-            for j, alien in enumerate(row):
-                if not not alien:
-                    if alien.x<min[2]:
-                        min[0] = i
-                        min[1] = j
-                        min[2] = alien.x
-        return [max, min]
-
-
-    def _fireBolt(self, input):
-        """
-        Allows the ship to firebolts based on user's inputs
-
-        Parameter input: user input, used to shoot bolts in this method
-        Invariant: input is an instance of GInput (inherited from GameApp)
+        self._profiler.count('events ' + type(events[0]).__name__,
+            len(events))
+
+
+    def _animateShip(self, dying, alive):
         """
+        Animates the ship blowing up while the simulation says it is dying
 
-        fire=True
-        for bolt in self._bolts:
-            if bolt.isPlayerBolt():
-                fire=False
-        if input.is_key_down('spacebar') and fire:
-            self._shipshoot.play()
-            self._bolts.append(Bolt(up=True, x=self._ship.x,\
-                y=self._ship.y+ALIEN_HEIGHT/2,width=BOLT_WIDTH,\
-                    height=BOLT_HEIGHT,fillcolor='red'))
+        The animation (Ship.animate) is a task of the scheduler, sent the
+        length of a tick on every tick after the one it started in.
 
+        Parameter dying: the time since the ship was hit in the simulation
+        Precondition: dying is a float >= 0 or None
 
-    def _updateBolts(self, dt):
+        Parameter alive: whether the simulation has a ship
+        Precondition: alive is a boolean
         """
-        Checks for collisions of aliens, ship and bolts
-        Parameter dt: The time in seconds since last Invader's update
-        Precondition: dt is a number (int or float)
+        if dying is not None:
+            if self._animator is None:
+                self._animator = self._scheduler.spawn(self._ship.animate())
+        else:
+            if self._animator is not None:
+                self._scheduler.cancel(self._animator)
+                self._animator = None
+            if not alive:
+                self._ship = None
+
+
+    def _boltView(self, key):
         """
-        for i, bolt in enumerate(self._bolts):
-            if bolt.velocity>0:
-                bolt.y+=BOLT_SPEED
-                if bolt.y - bolt.width/2 >= GAME_HEIGHT:
-                    del self._bolts[i]
-                if self._alienColision(bolt):
-                    self._alienCollides(i)
-            else:
-                bolt.y-=BOLT_SPEED
-                if bolt.y + bolt.height/2 <= 0:
-                    del self._bolts[i]
-                if self._ship is not None and self._ship.collides(bolt):
-                    self._shipCollides(i)
+        Returns the Bolt view for the bolt record with the given key
 
+        Views are made the first time a record is drawn, and reused after
+        that, so drawing a new bolt does not allocate once the pool is warm.
+
+        Parameter key: the key of a bolt record
+        Precondition: key is an int >= 0
+        """
+        if key >= len(self._bolts):
+            self._bolts.extend([None]*(key+1-len(self._bolts)))
+        bolt = self._bolts[key]
+        if bolt is None:
+            bolt = Bolt(up=True, x=0, y=0, width=BOLT_WIDTH,\
+                height=BOLT_HEIGHT, fillcolor='red')
+            self._bolts[key] = bolt
+        return bolt
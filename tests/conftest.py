@@ -0,0 +1,19 @@
+"""
+Test configuration for Alien Invaders
+
+The game modules import each other by their bare names (like "from consts
+import *"), as they do when the game is run with "python invaders". This
+puts the invaders folder on the path so the tests can do the same. Only the
+headless modules are tested, so game2d and Kivy are not needed. Run the
+tests from the folder that contains the invaders folder with
+
+    python -m pytest tests
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'invaders'))
@@ -0,0 +1,76 @@
+"""
+Tests of the bolt pool (bolts.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import random
+from bolts import BoltPool
+
+
+def walk(pool, doomed):
+    """
+    Walks over pool by position the way WaveSim does, removing the bolts
+    whose x is in doomed, and returns the x of every bolt looked at
+
+    Parameter pool: the pool to walk over
+    Precondition: pool is a BoltPool object
+
+    Parameter doomed: the x-coordinates of the bolts to remove
+    Precondition: doomed is a set of numbers
+    """
+    seen = []
+    i = 0
+    while i < len(pool):
+        bolt = pool.get(i)
+        seen.append(bolt.x)
+        if bolt.x in doomed:
+            pool.remove(i)
+        else:
+            i += 1
+    return seen
+
+
+def test_remove_never_skips_a_bolt():
+    """
+    Removing bolts while walking over the pool looks at every bolt exactly
+    once, and keeps exactly the bolts that were not removed
+    """
+    rng = random.Random(1110)
+    pool = BoltPool(4)
+    live = []
+    x = 0
+    for _ in range(300):
+        for _ in range(rng.randrange(6)):
+            up = rng.random() < 0.3
+            pool.fire(up, x, 0)
+            live.append((x, up))
+            x += 1
+        doomed = {bx for bx, up in live if rng.random() < 0.3}
+        seen = walk(pool, doomed)
+        assert sorted(seen) == sorted(bx for bx, up in live)
+        live = [(bx, up) for bx, up in live if bx not in doomed]
+        assert sorted(bolt.x for bolt in pool) == sorted(bx for bx, up in live)
+        assert pool.hasPlayerBolt() == any(up for bx, up in live)
+        keys = [bolt.key for bolt in pool]
+        assert len(keys) == len(set(keys))
+
+
+def test_fork_is_independent():
+    """
+    A fork has the same live bolts, and firing or removing in it does not
+    change the pool it came from
+    """
+    pool = BoltPool(2)
+    for x in range(5):
+        pool.fire(x == 2, x, 10)
+    fork = pool.fork()
+    assert [(b.x, b.y, b.key) for b in fork] == \
+        [(b.x, b.y, b.key) for b in pool]
+    walk(fork, {2})
+    fork.fire(False, 9, 10)
+    assert not fork.hasPlayerBolt() and pool.hasPlayerBolt()
+    assert [b.x for b in pool] == [0, 1, 2, 3, 4]
+    assert sorted(b.x for b in fork) == [0, 1, 3, 4, 9]
+    keys = [b.key for b in fork]
+    assert len(keys) == len(set(keys))
@@ -0,0 +1,84 @@
+"""
+Tests of the broad phase spatial hash (broadphase.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import random
+from consts import *
+from broadphase import SpatialHash
+from sim import WaveSim
+
+
+def overlaps(a, b):
+    """
+    Returns True if the boxes a and b overlap
+
+    Parameter a, b: the boxes, as (x, y, width, height) with (x, y) the center
+    Precondition: a, b are tuples of four numbers
+    """
+    return abs(a[0] - b[0]) < (a[2] + b[2])/2 and \
+        abs(a[1] - b[1]) < (a[3] + b[3])/2
+
+
+def test_hash_finds_every_overlap():
+    """
+    query and pairs return every overlapping box (and no repeats), bucketed
+    or not, as objects are moved, added and removed
+    """
+    rng = random.Random(1110)
+    for scan in (0, 8, 1000):
+        grid = SpatialHash(scan=scan)
+        boxes = {}
+        for step in range(2000):
+            key = rng.randrange(40)
+            if rng.random() < 0.2:
+                grid.remove(key)
+                boxes.pop(key, None)
+            else:
+                boxes[key] = (rng.uniform(0, 800), rng.uniform(0, 600),
+                    rng.uniform(0, 60), rng.uniform(0, 60))
+                grid.move(key, *boxes[key])
+            assert len(grid) == len(boxes)
+            box = (rng.uniform(0, 800), rng.uniform(0, 600), 44, 44)
+            found = grid.query(*box)
+            assert len(found) == len(set(found))
+            assert {k for k in boxes if overlaps(boxes[k], box)} <= set(found)
+            if step % 50 == 0:
+                pairs = grid.pairs()
+                assert len(pairs) == len(set(pairs))
+                found = set(pairs) | {(b, a) for a, b in pairs}
+                for a in boxes:
+                    for b in boxes:
+                        if a != b and overlaps(boxes[a], boxes[b]):
+                            assert (a, b) in found
+
+
+def test_hash_keeps_registration_order():
+    """
+    query returns objects in the order they were first moved
+    """
+    grid = SpatialHash(scan=0)
+    for key in 'cab':
+        grid.move(key, 10, 10, 4, 4)
+    grid.move('c', 12, 12, 4, 4)
+    assert grid.query(10, 10, 20, 20) == ['c', 'a', 'b']
+    grid.clear()
+    assert len(grid) == 0 and grid.query(10, 10, 20, 20) == []
+
+
+def test_crossed_bolts():
+    """
+    A player bolt and an alien bolt that pass each other are a crossed pair
+    """
+    sim = WaveSim(rows=5, cols=12, speed=0.1, width=HEADLESS_WIDTH,
+        height=HEADLESS_HEIGHT, seed=1)
+    sim.addBolt(True, 100, 100)
+    sim.addBolt(False, 101, 130)
+    sim.addBolt(False, 400, 300)
+    sim.update(1/SIM_TICK_RATE)
+    crossed = sim.crossedBolts()
+    assert len(crossed) == 1
+    up, down = crossed[0]
+    assert up.isPlayerBolt() and not down.isPlayerBolt()
+    assert down.x == 101
@@ -0,0 +1,88 @@
+"""
+Tests of the game driver (driver.py) and the bot environments (env.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import numpy as np
+from consts import *
+from driver import Game
+from env import ACTION_FIRE, ACTION_LEFT, VectorWaveEnv, WaveEnv
+from sim import WaveSim
+
+
+def makeGame(seed, rows=5, lives=SHIP_LIVES):
+    """
+    Returns a game of a wave of rows rows on a headless screen
+
+    Parameter seed: the seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter rows: the rows of aliens
+    Precondition: rows is an int > 0
+
+    Parameter lives: the lives of the player
+    Precondition: lives is an int > 0
+    """
+    return Game(WaveSim(rows=rows, cols=12, speed=0.1, width=HEADLESS_WIDTH,
+        height=HEADLESS_HEIGHT, seed=seed), lives)
+
+
+def test_game_loses_lives_then_ends():
+    """
+    A player that never moves loses a life per ship, and the game is over
+    (and lost) with the last one
+    """
+    game = makeGame(2, lives=2)
+    lives = [game.getLives()]
+    while not game.isOver():
+        game.update(1/SIM_TICK_RATE)
+        if game.getLives() != lives[-1]:
+            lives.append(game.getLives())
+    assert lives == [2, 1]
+    assert not game.isWon()
+    assert game.getSim().getShipDies() or game.getSim().alienLine()
+
+
+def test_game_over_at_start():
+    """
+    A wave that starts at the defense line is a game that is already over
+    """
+    game = makeGame(0, rows=40)
+    assert game.isOver() and not game.isWon() and game.getTicks() == 0
+
+
+def test_vector_env_plays_like_single_envs():
+    """
+    Game k of a VectorWaveEnv plays like a WaveEnv with seed k, including
+    the rewards and the observations
+    """
+    vector = VectorWaveEnv(3, rows=3, cols=6, maxTicks=500)
+    singles = [WaveEnv(rows=3, cols=6, maxTicks=500) for _ in range(3)]
+    vector.reset(0)
+    for k, env in enumerate(singles):
+        env.reset(k)
+    for tick in range(200):
+        actions = [ACTION_FIRE | (ACTION_LEFT*(tick % 50 < 25 + k))
+            for k in range(3)]
+        obs, rewards, dones = vector.step(actions)
+        for k, env in enumerate(singles):
+            single, reward, done, info = env.step(actions[k])
+            assert rewards[k] == reward and dones[k] == done
+            assert not done
+            for key in single:
+                assert np.array_equal(obs[key][k], single[key])
+
+
+def test_vector_env_skips_games_over_at_reset():
+    """
+    Games that are over as soon as they are reset are not played: they are
+    done with no reward at every step
+    """
+    vector = VectorWaveEnv(4, rows=40, cols=5)
+    vector.reset(0)
+    for _ in range(3):
+        obs, rewards, dones = vector.step([ACTION_FIRE]*4)
+        assert list(rewards) == [0]*4
+        assert list(dones) == [True]*4
+    assert vector.getEnv(0).getInfo()['ticks'] == 0
@@ -0,0 +1,87 @@
+"""
+Tests of the events of a wave and their bus (events.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+from driver import Game
+from events import (EVENTS, AlienKilled, BoltFired, EventBus, LineBreached,
+    ShipHit, WaveCleared)
+from sim import WaveSim
+
+
+def test_dispatch_batches_by_kind():
+    """
+    Every subscriber gets one batch per dispatch, in the order of EVENTS,
+    with the events of its kind in the order they were posted
+    """
+    bus = EventBus()
+    calls = []
+    for kind in (WaveCleared, BoltFired, AlienKilled):
+        for name in ('a', 'b'):
+            bus.subscribe(kind, lambda events, kind=kind, name=name:
+                calls.append((kind, name, events)))
+    fired = [BoltFired(True, 1, 2), BoltFired(False, 3, 4)]
+    killed = [AlienKilled(0, 1), AlienKilled(2, 3)]
+    bus.post(killed[0])
+    bus.postAll([fired[0], ShipHit(5), killed[1]])
+    bus.post(fired[1])
+    bus.dispatch()
+    order = sorted((BoltFired, AlienKilled), key=EVENTS.index)
+    batches = {BoltFired: fired, AlienKilled: killed}
+    assert calls == [(kind, name, batches[kind]) for kind in order
+        for name in ('a', 'b')]
+    calls.clear()
+    bus.dispatch()
+    assert calls == []
+
+
+def test_events_posted_in_dispatch_wait():
+    """
+    Events posted by a subscriber are handed out by the next dispatch, and
+    an unsubscribed handler is not called
+    """
+    bus = EventBus()
+    seen = []
+    def relay(events):
+        seen.append(events)
+        bus.post(WaveCleared(len(events)))
+    def cleared(events):
+        seen.append(events)
+    bus.subscribe(AlienKilled, relay)
+    bus.subscribe(WaveCleared, cleared)
+    bus.post(AlienKilled(0, 0))
+    bus.dispatch()
+    assert len(seen) == 1
+    bus.unsubscribe(AlienKilled, relay)
+    bus.post(AlienKilled(0, 1))
+    bus.dispatch()
+    assert len(seen) == 2 and isinstance(seen[1][0], WaveCleared)
+
+
+def test_breached_at_start():
+    """
+    A wave that starts at the defense line is over, with a LineBreached
+    """
+    sim = WaveSim(rows=10, cols=15, speed=0.1, width=1280, height=664,
+        seed=0)
+    assert sim.isOver()
+    assert [type(event) for event in sim.getEvents()] == [LineBreached]
+    sim = WaveSim(rows=5, cols=12, speed=0.1, width=HEADLESS_WIDTH,
+        height=HEADLESS_HEIGHT, seed=0)
+    assert sim.getEvents() == []
+
+
+def test_win_beats_breach():
+    """
+    The game driver gives the win if the wave is won as the line is breached
+    """
+    sim = WaveSim(rows=1, cols=2, speed=0.1, width=HEADLESS_WIDTH,
+        height=HEADLESS_HEIGHT, seed=0)
+    game = Game(sim)
+    sim.getFormation().march(0, -HEADLESS_HEIGHT)
+    sim.setPlayerWin(True)
+    game.update(1/SIM_TICK_RATE)
+    assert sim.alienLine()
+    assert game.isOver() and game.isWon()
@@ -0,0 +1,144 @@
+"""
+Tests of the formation of aliens (formation.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import random
+from consts import *
+from formation import Formation
+
+
+def liveCenters(formation):
+    """
+    Returns the centers of the live aliens, found from the alive mask
+
+    Parameter formation: the formation to look at
+    Precondition: formation is a Formation object
+    """
+    alive = formation.getAlive()
+    return [formation.position(row, col)
+        for row in range(formation.getRows())
+        for col in range(formation.getCols()) if alive[row][col]]
+
+
+def checkBox(formation):
+    """
+    Checks the bounding box of formation against a scan of every live alien
+
+    Parameter formation: the formation to check
+    Precondition: formation is a Formation object with a live alien
+    """
+    centers = liveCenters(formation)
+    xs = [x for x, y in centers]
+    bottom = min(y for x, y in centers) - ALIEN_WIDTH/2
+    assert formation.extrema() == (min(xs), max(xs))
+    assert formation.count() == len(centers)
+    assert formation.belowLine(bottom)
+    assert not formation.belowLine(bottom - 1)
+
+
+def slowHit(formation, points):
+    """
+    Returns the slot Formation.hit should return, found the way Wave used
+    to: every live alien is tested in turn, as Alien.collides did
+
+    Parameter formation: the formation to test
+    Precondition: formation is a Formation object
+
+    Parameter points: the points to test
+    Precondition: points is a list of (x, y) tuples
+    """
+    alive = formation.getAlive()
+    for row in range(formation.getRows()):
+        for col in range(formation.getCols()):
+            if not alive[row][col]:
+                continue
+            x, y = formation.position(row, col)
+            for px, py in points:
+                if abs(px - x) < ALIEN_WIDTH/2 and abs(py - y) < ALIEN_HEIGHT/2:
+                    return (row, col)
+    return None
+
+
+def boltPoints(x, y):
+    """
+    Returns the points of a player bolt centered at (x, y) that are tested
+
+    Parameter x, y: the center of the bolt
+    Precondition: x, y are numbers
+    """
+    return [(x + BOLT_WIDTH/2, y + BOLT_HEIGHT/2),
+        (x - BOLT_WIDTH/2, y - BOLT_HEIGHT/2)]
+
+
+def test_box_after_column_kills():
+    """
+    The extrema and the bottom move in when the edge columns and the bottom
+    row are killed, one alien at a time
+    """
+    formation = Formation(5, 12, 800)
+    formation.march(3*ALIEN_H_WALK, -2*ALIEN_V_WALK)
+    checkBox(formation)
+    for col in (0, 11, 1, 10):
+        for row in range(5):
+            formation.kill(row, col)
+            checkBox(formation)
+    for col in range(2, 10):
+        formation.kill(0, col)
+    checkBox(formation)
+    assert set(formation.getColumns()) == set(range(2, 10))
+
+
+def test_box_after_random_kills():
+    """
+    The bounding box matches a full scan after every kill, down to the last
+    alien, and the formation is empty at the end
+    """
+    rng = random.Random(1110)
+    for rows, cols in ((1, 1), (5, 12), (7, 3), (10, 15)):
+        formation = Formation(rows, cols, 800)
+        slots = [(row, col) for row in range(rows) for col in range(cols)]
+        rng.shuffle(slots)
+        for row, col in slots[:-1]:
+            formation.kill(row, col)
+            formation.march(rng.choice((-1, 1))*ALIEN_H_WALK, 0)
+            checkBox(formation)
+        formation.kill(*slots[-1])
+        assert formation.count() == 0
+        assert formation.getColumns() == []
+        assert not formation.belowLine(10**6)
+
+
+def test_hit_matches_per_alien_check():
+    """
+    Formation.hit finds the same alien as testing every alien
+    """
+    rng = random.Random(1110)
+    for rows, cols in ((1, 1), (5, 12), (7, 3), (10, 15)):
+        formation = Formation(rows, cols, 800)
+        for _ in range(rows*cols):
+            if rng.random() < 0.3:
+                formation.kill(rng.randrange(rows), rng.randrange(cols))
+            formation.march(rng.choice((-1, 1))*ALIEN_H_WALK,
+                -ALIEN_V_WALK*(rng.random() < 0.1))
+            left, bottom = formation.position(0, 0)
+            right, top = formation.position(rows-1, cols-1)
+            for _ in range(50):
+                x = rng.uniform(left - ALIEN_WIDTH, right + ALIEN_WIDTH)
+                y = rng.uniform(bottom - ALIEN_HEIGHT, top + ALIEN_HEIGHT)
+                points = boltPoints(x, y)
+                assert formation.hit(points) == slowHit(formation, points)
+
+
+def test_hit_alien_centers():
+    """
+    A bolt at the center of a live alien hits it, and misses a dead one
+    """
+    formation = Formation(5, 12, 800)
+    formation.kill(2, 4)
+    for row in range(5):
+        for col in range(12):
+            points = boltPoints(*formation.position(row, col))
+            expected = None if (row, col) == (2, 4) else (row, col)
+            assert formation.hit(points) == expected
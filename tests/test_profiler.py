@@ -0,0 +1,73 @@
+"""
+Tests of the frame profiler (profiler.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import random
+from profiler import Profiler, RingBuffer
+
+
+def reference(samples, size):
+    """
+    Returns the summary a RingBuffer of the given size should report after
+    the given samples, found from a sorted copy of the last size samples
+
+    Parameter samples: every sample added, oldest first
+    Precondition: samples is a non-empty list of numbers
+
+    Parameter size: the size of the buffer
+    Precondition: size is an int > 0
+    """
+    window = sorted(samples[-size:])
+    n = len(window)
+    return {'samples': len(samples), 'mean': sum(window)/n,
+        'p50': window[min(n-1, n*50//100)],
+        'p90': window[min(n-1, n*90//100)],
+        'p99': window[min(n-1, n*99//100)], 'max': window[-1]}
+
+
+def test_percentiles_of_the_last_window():
+    """
+    The summary only covers the latest samples, before and after the
+    buffer wraps around (several times)
+    """
+    rng = random.Random(1110)
+    for size in (1, 7, 100):
+        buffer = RingBuffer(size)
+        samples = []
+        for _ in range(5*size + 3):
+            samples.append(rng.randrange(1000))
+            buffer.add(samples[-1])
+            assert len(buffer) == min(len(samples), size)
+            assert buffer.total() == len(samples)
+            assert buffer.summary() == reference(samples, size)
+
+
+def test_known_percentiles():
+    """
+    The percentiles of 1 to 100 (added in any order) are the nearest ranks
+    """
+    buffer = RingBuffer(100)
+    values = list(range(1, 101))
+    random.Random(5).shuffle(values)
+    for value in [0]*50 + values:
+        buffer.add(value)
+    summary = buffer.summary()
+    assert (summary['p50'], summary['p90'], summary['p99']) == (51, 91, 100)
+    assert summary['mean'] == 50.5 and summary['samples'] == 150
+
+
+def test_profiler_units():
+    """
+    Timers are reported in milliseconds and counters as they are
+    """
+    profiler = Profiler(window=4)
+    for value in (1, 2, 3, 4, 5):
+        profiler.time('frame', value/1000)
+        profiler.count('aliens', value)
+    aliens, frame = sorted(profiler.summary(), key=lambda row: row['metric'])
+    assert (aliens['metric'], aliens['unit']) == ('aliens', 'count')
+    assert (aliens['mean'], aliens['max'], aliens['samples']) == (3.5, 5, 5)
+    assert (frame['metric'], frame['unit']) == ('frame', 'ms')
+    assert abs(frame['max'] - 5) < 1e-9 and frame['samples'] == 5
@@ -0,0 +1,80 @@
+"""
+Tests of recording and replaying games (replay.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import pytest
+from consts import *
+from driver import Game
+from replay import Recording, readRecording, replay, verify
+from sim import WaveSim
+
+
+def record(seed, lives=SHIP_LIVES):
+    """
+    Plays a game with a scripted player and returns its finished Recording
+
+    The player continues (presses enter) on the tick after a ship is lost,
+    as a player of Invaders does.
+
+    Parameter seed: the seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter lives: the lives of the player
+    Precondition: lives is an int > 0
+    """
+    sim = WaveSim(rows=5, cols=12, speed=0.1, width=HEADLESS_WIDTH,
+        height=HEADLESS_HEIGHT, seed=seed)
+    recording = Recording(lives, seed)
+    recording.begin(sim, SIM_TICK_RATE)
+    game = Game(sim, lives, respawn=False)
+    enter = False
+    while not game.isOver():
+        tick = game.getTicks()
+        left = tick % 240 < 120
+        keys = (left, not left, tick % 7 != 0)
+        recording.record(*keys, enter)
+        if enter:
+            game.respawn()
+        game.update(1/SIM_TICK_RATE, *keys)
+        enter = sim.getShipDies() and not game.isOver()
+    recording.finish(sim.getScore(), game.isWon(), game.getLives())
+    return recording
+
+
+def test_replay_matches_recording():
+    """
+    A saved and loaded recording replays to the outcome it recorded
+    """
+    for seed in range(3):
+        recording = record(seed)
+        loaded = readRecording(recording.toBytes())
+        assert loaded.getInputs() == recording.getInputs()
+        assert verify(loaded) == recording.getOutcome()
+
+
+def test_verify_detects_changed_input():
+    """
+    verify fails if the input no longer leads to the recorded outcome
+    """
+    recording = record(1)
+    outcome = recording.getOutcome()
+    changed = Recording(SHIP_LIVES, 1)
+    changed.begin(recording.makeSim(), SIM_TICK_RATE)
+    for _ in range(outcome['ticks']):
+        changed.record(False, False, False)
+    changed.finish(outcome['score'], outcome['won'], outcome['lives'])
+    with pytest.raises(AssertionError):
+        verify(changed)
+
+
+def test_empty_recording():
+    """
+    A recording with no ticks replays to nothing
+    """
+    recording = Recording(SHIP_LIVES, 4)
+    recording.begin(WaveSim(rows=5, cols=12, speed=0.1,
+        width=HEADLESS_WIDTH, height=HEADLESS_HEIGHT, seed=4), SIM_TICK_RATE)
+    outcome = replay(recording)
+    assert outcome['ticks'] == 0 and outcome['lives'] == SHIP_LIVES
@@ -0,0 +1,173 @@
+"""
+Tests of the timer wheel (scheduler.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+import random
+from consts import *
+from scheduler import Scheduler
+
+
+class Reference(object):
+    """
+    A class representing a naive scheduler: a dictionary from every tick
+    to the timers due at it, run in the order they were added.
+
+    Attribute due: the timers due at every tick, as lists [order, period]
+    Invariant: due is a dictionary from ints to lists of lists
+
+    Attribute active: the orders of the timers that will still run
+    Invariant: active is a set of ints
+    """
+
+    def __init__(self):
+        """
+        Initializes a scheduler with no timers
+        """
+        self.due = {}
+        self.active = set()
+
+
+    def add(self, due, period, order):
+        """
+        Adds a timer due at the given tick and returns its order
+
+        Parameter due: the tick it runs at
+        Precondition: due is an int
+
+        Parameter period: the ticks between two runs, or None to run once
+        Precondition: period is an int > 0 or None
+
+        Parameter order: the number of the timer (recorded when it runs)
+        Precondition: order is an int, one more than the last order added
+        """
+        self.due.setdefault(due, []).append([order, period])
+        self.active.add(order)
+        return order
+
+
+    def cancel(self, order):
+        """
+        Stops the timer with the given order from running again
+
+        Parameter order: the order of the timer
+        Precondition: order is an int returned by add
+        """
+        self.active.discard(order)
+
+
+    def run(self, tick):
+        """
+        Returns the orders of the timers due at tick, and moves them on
+
+        Parameter tick: the tick to run
+        Precondition: tick is an int
+        """
+        orders = []
+        for timer in sorted(self.due.pop(tick, [])):
+            if timer[0] not in self.active:
+                continue
+            orders.append(timer[0])
+            if timer[1] is None:
+                self.active.discard(timer[0])
+            else:
+                self.due.setdefault(tick + timer[1], []).append(timer)
+        return orders
+
+
+def ticksAway(rng, least, most):
+    """
+    Returns a random number of ticks from 1 to most: half of the time from
+    least to most, and else spread evenly over the levels of the wheel
+
+    Parameter rng: the random number generator
+    Precondition: rng is a random.Random object
+
+    Parameter least: the fewest ticks, half of the time
+    Precondition: least is an int with 0 < least <= most
+
+    Parameter most: the most ticks
+    Precondition: most is an int > 1
+    """
+    if rng.random() < 0.5:
+        return rng.randint(least, most)
+    return min(most, int(most**rng.random()) + rng.randrange(3))
+
+
+def check(start, ticks, least, most, adds):
+    """
+    Adds, cancels and runs random timers on a Scheduler and a Reference
+    from tick start, and checks that they run the same timers in the same
+    order at every tick
+
+    Parameter start: the first tick
+    Precondition: start is an int >= 0
+
+    Parameter ticks: the ticks to run
+    Precondition: ticks is an int > 0
+
+    Parameter least: the fewest ticks away half of the timers are added
+    Precondition: least is an int with 0 < least <= most
+
+    Parameter most: the most ticks away a timer is added
+    Precondition: most is an int > 1
+
+    Parameter adds: the chance of adding a timer in a tick
+    Precondition: adds is a float with 0 < adds <= 1
+    """
+    rng = random.Random(start)
+    wheel = Scheduler(tick=start)
+    naive = Reference()
+    fired = []
+    pairs = []
+    for tick in range(start+1, start+ticks+1):
+        while rng.random() < adds:
+            name = len(pairs)
+            away = ticksAway(rng, least, most)
+            if rng.random() < 0.3:
+                timer = wheel.every(away, fired.append, name)
+                pairs.append((timer, naive.add(tick-1 + away, away, name)))
+            else:
+                timer = wheel.after(away, fired.append, name)
+                pairs.append((timer, naive.add(tick-1 + away, None, name)))
+        if pairs and rng.random() < adds/4:
+            timer, twin = rng.choice(pairs)
+            wheel.cancel(timer)
+            naive.cancel(twin)
+        wheel.advance()
+        assert fired == naive.run(tick)
+        assert len(wheel) == len(naive.active)
+        fired.clear()
+
+
+def test_wheel_matches_reference():
+    """
+    The wheel runs the same timers as a naive scan, across every level and
+    the cascades between them
+    """
+    slots = SCHEDULER_SLOTS
+    check(0, 20000, 1, slots**2, 0.2)
+    check(slots**3 - 3000, 10000, slots, slots**3, 0.05)
+    check(slots**3 - 100, 300000, slots**3 - 1000, slots**3 + 5000, 0.002)
+
+
+def test_wheel_runs_overflow():
+    """
+    Timers further away than the top level wait in the overflow, and still
+    run at their tick, in the order they were added
+    """
+    top = SCHEDULER_SLOTS**SCHEDULER_LEVELS
+    wheel = Scheduler(tick=top - 5)
+    fired = []
+    def record(name):
+        fired.append((wheel.getTick(), name))
+    wheel.at(2*top + 7, record, 'far')
+    wheel.at(top + 100, record, 'late')
+    wheel.every(top + 1, record, 'every')
+    wheel.at(2*top + 7, record, 'far again')
+    wheel.at(top - 4, record, 'near')
+    for _ in range(top + 12):
+        wheel.advance()
+    assert fired == [(top - 4, 'near'), (top + 100, 'late'),
+        (2*top - 4, 'every'), (2*top + 7, 'far'), (2*top + 7, 'far again')]
@@ -0,0 +1,112 @@
+"""
+Tests of the headless wave (sim.py)
+
+# Pratyush Sudhakar (ps2245) and Yuvan Chugh (yc698)
+# December 9, 2021
+"""
+from consts import *
+from sim import WaveSim
+from snapshot import makeSnapshot, restoreSnapshot
+
+# the length of a tick in seconds
+TICK = 1/SIM_TICK_RATE
+
+
+def makeWave(seed, rules=None):
+    """
+    Returns a default sized wave on a headless screen
+
+    Parameter seed: the seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter rules: the tuning values to change (see RULES in sim.py)
+    Precondition: rules is a dictionary or None
+    """
+    return WaveSim(rows=5, cols=12, speed=0.1, width=HEADLESS_WIDTH,
+        height=HEADLESS_HEIGHT, seed=seed, rules=rules)
+
+
+def inputs(tick):
+    """
+    Returns the keys (left, right, fire) held down at tick
+
+    The ship sweeps left and right, and does not fire every seventh tick.
+
+    Parameter tick: the number of the tick
+    Precondition: tick is an int >= 0
+    """
+    left = tick % 240 < 120
+    return (left, not left, tick % 7 != 0)
+
+
+def play(sim, start, ticks):
+    """
+    Plays ticks ticks of sim from tick start and returns the state after
+    each one, respawning the ship whenever it is lost
+
+    Parameter sim: the wave to play
+    Precondition: sim is a WaveSim object
+
+    Parameter start: the number of the first tick (for inputs)
+    Precondition: start is an int >= 0
+
+    Parameter ticks: the number of ticks to play
+    Precondition: ticks is an int >= 0
+    """
+    states = []
+    for tick in range(start, start+ticks):
+        if sim.getShipDies():
+            sim.spawnShip()
+            sim.setShipDies(False)
+        sim.update(TICK, *inputs(tick))
+        states.append((sim.getState(), sim.getFormation().getAlive().tolist()))
+    return states
+
+
+def test_same_seed_plays_the_same():
+    """
+    Two waves with the same seed and input play exactly the same
+    """
+    assert play(makeWave(5), 0, 1500) == play(makeWave(5), 0, 1500)
+
+
+def test_fork_plays_like_the_wave():
+    """
+    A fork plays on exactly like the wave it came from, and playing it does
+    not change that wave
+    """
+    sim = makeWave(7)
+    play(sim, 0, 400)
+    before = sim.getState()
+    fork = sim.fork()
+    forked = play(fork, 400, 1200)
+    assert sim.getState() == before
+    assert play(sim, 400, 1200) == forked
+
+
+def test_snapshot_round_trip():
+    """
+    A wave restored from a snapshot plays on exactly like the one saved
+    """
+    for seed in range(3):
+        sim = makeWave(seed)
+        play(sim, 0, 300 + 200*seed)
+        restored, game = restoreSnapshot(makeSnapshot(sim))
+        assert game is None
+        assert restored.getState() == sim.getState()
+        assert play(restored, 1000, 1200) == play(sim, 1000, 1200)
+
+
+def test_snapshot_keeps_rules():
+    """
+    A snapshot restores the rules of the wave, not the default RULES
+    """
+    rules = {'boltRate': 1, 'shipBursts': 500}
+    sim = makeWave(3, rules)
+    play(sim, 0, 200)
+    data = makeSnapshot(sim, {'state': STATE_ACTIVE, 'lives': 2,
+        'win': False})
+    restored, game = restoreSnapshot(data)
+    assert restored.getRules() == rules
+    assert game == {'state': STATE_ACTIVE, 'lives': 2, 'win': False}
+    assert play(restored, 200, 1500) == play(sim, 200, 1500)